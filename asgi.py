@@ -0,0 +1,5 @@
+from run import app as flask_app
+from src.app.asgi import create_asgi_app
+
+# uvicorn asgi:app --host 0.0.0.0 --port 8080
+app = create_asgi_app(flask_app=flask_app)
@@ -0,0 +1,86 @@
+"""
+Compare the SQL path and the in-memory catalog index (CATALOG_INDEX_ENABLED)
+for filter + sort + page queries on GET /books.
+
+    python benchmarks/dataset.py --books 100000
+    python benchmarks/catalog_index.py --repeat 200
+
+Both paths are driven in-process through the Flask test client against the
+same database, so serialization cost is identical and the difference is the
+query itself. The index is built once before timing (its build time is
+reported separately); keyword queries are not listed because they always use
+SQL.
+"""
+import argparse
+import os
+import statistics
+import sys
+from time import perf_counter
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+os.environ.setdefault("RATE_LIMIT_REQUESTS", "0")  # 설정 클래스가 import 시점에 읽는다
+
+from src.app import create_app  # noqa: E402
+from src.app.catalog_index import get_catalog_index  # noqa: E402
+from src.app.extensions import db  # noqa: E402
+from src.app.models import Author, Category  # noqa: E402
+from load_test import percentile  # noqa: E402
+
+
+def query_shapes(category_id: int, author_id: int) -> dict[str, dict]:
+    return {
+        "newest": {"size": 20},
+        "price_asc": {"sort": "price,ASC", "size": 20},
+        "price_range": {"min_price": 10000, "max_price": 30000, "sort": "price,DESC", "size": 20},
+        "category": {"category_id": category_id, "sort": "published_at,DESC", "size": 20},
+        "author": {"author_id": author_id, "sort": "stock_cnt,DESC", "size": 20},
+        "deep_page": {"status": "ACTIVE", "sort": "updated_at,ASC", "page": 200, "size": 50},
+    }
+
+
+def measure(client, params: dict, repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        started = perf_counter()
+        resp = client.get("/books", query_string=params)
+        latencies.append((perf_counter() - started) * 1000)
+        if resp.status_code != 200:
+            raise SystemExit(f"[!] GET /books {params} -> {resp.status_code}")
+    return sorted(latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GET /books: SQL vs in-memory catalog index.")
+    parser.add_argument("--repeat", type=int, default=100, help="requests per query shape and path")
+    parser.add_argument("--config", default="dev", help="app config name (dev|prod)")
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    client = app.test_client()
+    with app.app_context():
+        category_id = db.session.query(Category.id).order_by(Category.id).limit(1).scalar()
+        author_id = db.session.query(Author.id).order_by(Author.id).limit(1).scalar()
+        if category_id is None or author_id is None:
+            raise SystemExit("[!] empty catalog: run benchmarks/dataset.py first")
+
+        app.config["CATALOG_INDEX_ENABLED"] = True
+        started = perf_counter()
+        get_catalog_index().ensure_fresh(db.engine)
+        print(f"[*] index built in {(perf_counter() - started) * 1000:.0f} ms")
+
+    print(f"{'query':<14}{'sql p50':>10}{'sql p95':>10}{'idx p50':>10}{'idx p95':>10}{'speedup':>9}")
+    for name, params in query_shapes(category_id, author_id).items():
+        app.config["CATALOG_INDEX_ENABLED"] = False
+        sql = measure(client, params, args.repeat)
+        app.config["CATALOG_INDEX_ENABLED"] = True
+        indexed = measure(client, params, args.repeat)
+        speedup = statistics.median(sql) / statistics.median(indexed)
+        print(f"{name:<14}{percentile(sql, 50):>10.2f}{percentile(sql, 95):>10.2f}"
+              f"{percentile(indexed, 50):>10.2f}{percentile(indexed, 95):>10.2f}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
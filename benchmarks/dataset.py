@@ -0,0 +1,56 @@
+"""
+Synthetic dataset generator for benchmarks.
+
+Thin wrapper around the high-volume mode of scripts/seed_data.py that creates
+the accounts load_test.py logs in with (bench-admin@example.com, bench<N>@...).
+
+    python benchmarks/dataset.py --books 1000000 --reviews 10000000 --workers 4
+"""
+import argparse
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.app import create_app  # noqa: E402
+from scripts.seed_data import bulk_seed  # noqa: E402
+
+BENCH_PASSWORD = "Bench123!"
+ADMIN_EMAIL = "bench-admin@example.com"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a synthetic benchmark dataset.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--reviews", type=int, default=500000)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--config", default="dev", help="app config name (dev|prod)")
+    args = parser.parse_args(argv)
+
+    app = create_app(args.config)
+    with app.app_context():
+        bulk_seed(
+            users=args.users,
+            categories=args.categories,
+            authors=args.authors,
+            books=args.books,
+            reviews=args.reviews,
+            orders=args.orders,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            password=BENCH_PASSWORD,
+            email_prefix="bench",
+            admin_email=ADMIN_EMAIL,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Scenario-based load generator for a running API server.
+
+    RATE_LIMIT_REQUESTS=0 flask --app run.py run --port 8080   # 다른 터미널
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8080 --concurrency 16 --duration 20
+
+Each scenario runs for `--duration` seconds with `--concurrency` worker threads
+(one keep-alive connection per thread). Results are printed and saved as JSON
+under benchmarks/results/ so two commits can be compared with `--compare`.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import urlencode, urlsplit
+
+CURRENT_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = CURRENT_DIR / "results"
+
+ADMIN_EMAIL = "bench-admin@example.com"
+BENCH_PASSWORD = "Bench123!"
+SEARCH_WORDS = ["python", "data", "design", "history", "travel", "cloud", "guide", "modern"]
+
+
+class HttpClient:
+    """Thin keep-alive JSON client; one instance per worker thread."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.conn = None
+
+    def _connect(self):
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body=None, token: str | None = None):
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        for attempt in range(2):
+            if self.conn is None:
+                self._connect()
+            try:
+                self.conn.request(method, self.prefix + path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                raw = resp.read()
+                return resp.status, raw
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt == 1:
+                    raise
+        return 0, b""
+
+
+class Context:
+    """Shared, read-only state prepared once before the scenarios run."""
+
+    def __init__(self, client: HttpClient, users: int, books: int):
+        self.users = users
+        self.books = books
+        self.admin_token = self._login(client, ADMIN_EMAIL)
+        self.user_tokens = {}
+        for user_id in range(2, min(users, 20) + 2):
+            token = self._login(client, f"bench{user_id - 1}@example.com")
+            if token:
+                self.user_tokens[user_id] = token
+        if not self.admin_token or not self.user_tokens:
+            raise SystemExit("[!] Login failed. Seed the dataset first: python benchmarks/dataset.py")
+
+    @staticmethod
+    def _login(client: HttpClient, email: str):
+        status, raw = client.request("POST", "/auth/login", {"email": email, "password": BENCH_PASSWORD})
+        if status != 200:
+            return None
+        return json.loads(raw)["access_token"]
+
+    def random_user(self):
+        user_id = random.choice(list(self.user_tokens))
+        return user_id, self.user_tokens[user_id]
+
+
+# ---- scenarios -------------------------------------------------------------
+def scenario_browse(client, ctx):
+    page = random.randint(1, max(1, min(ctx.books // 20, 500)))
+    return client.request("GET", "/books?" + urlencode({"page": page, "size": 20}))
+
+
+def scenario_search(client, ctx):
+    return client.request("GET", "/books?" + urlencode({"keyword": random.choice(SEARCH_WORDS), "size": 20}))
+
+
+def scenario_book_detail(client, ctx):
+    return client.request("GET", f"/books/{random.randint(1, ctx.books)}")
+
+
+def scenario_reviews(client, ctx):
+    query = {"book_id": random.randint(1, ctx.books), "size": 20}
+    return client.request("GET", "/reviews?" + urlencode(query))
+
+
+def scenario_login(client, ctx):
+    user_index = random.randint(1, ctx.users)
+    return client.request("POST", "/auth/login",
+                          {"email": f"bench{user_index}@example.com", "password": BENCH_PASSWORD})
+
+
+def scenario_cart_add(client, ctx):
+    _, token = ctx.random_user()
+    body = {"book_id": random.randint(1, ctx.books), "quantity": 1}
+    return client.request("POST", "/cart", body, token=token)
+
+
+def scenario_checkout(client, ctx):
+    user_id, token = ctx.random_user()
+    items = [{"book_id": random.randint(1, ctx.books), "quantity": 1} for _ in range(random.randint(1, 3))]
+    return client.request("POST", "/orders", {"user_id": user_id, "items": items}, token=token)
+
+
+def scenario_admin_orders(client, ctx):
+    query = {"user_id": random.randint(2, ctx.users + 1), "page": 1, "size": 50}
+    return client.request("GET", "/orders?" + urlencode(query), token=ctx.admin_token)
+
+
+SCENARIOS = {
+    "browse": scenario_browse,
+    "search": scenario_search,
+    "book_detail": scenario_book_detail,
+    "reviews": scenario_reviews,
+    "login": scenario_login,
+    "cart_add": scenario_cart_add,
+    "checkout": scenario_checkout,
+    "admin_orders": scenario_admin_orders,
+}
+
+
+# ---- runner ----------------------------------------------------------------
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_scenario(name, base_url, ctx, concurrency: int, duration: float) -> dict:
+    func = SCENARIOS[name]
+    deadline = perf_counter() + duration
+    lock = threading.Lock()
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+
+    def worker():
+        client = HttpClient(base_url)
+        local_latencies = []
+        local_statuses: dict[str, int] = {}
+        while perf_counter() < deadline:
+            started = perf_counter()
+            try:
+                status, _ = func(client, ctx)
+            except (http.client.HTTPException, OSError):
+                status = 0
+            local_latencies.append((perf_counter() - started) * 1000)
+            local_statuses[str(status)] = local_statuses.get(str(status), 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for key, count in local_statuses.items():
+                statuses[key] = statuses.get(key, 0) + count
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / total, 3) if total else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "status_counts": statuses,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=CURRENT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(result: dict, baseline: dict | None = None):
+    header = f"{'scenario':<14}{'req':>9}{'err':>7}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}"
+    if baseline:
+        header += f"{'Δrps':>9}{'Δp95':>9}"
+    print(header)
+    for name, stats in result["scenarios"].items():
+        line = (
+            f"{name:<14}{stats['requests']:>9}{stats['errors']:>7}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        if base:
+            line += f"{_delta(stats['throughput_rps'], base['throughput_rps']):>9}"
+            line += f"{_delta(stats['p95_ms'], base['p95_ms']):>9}"
+        print(line)
+        if stats["status_counts"].get("429"):
+            print(f"    [!] {name}: 429 응답 발생 - 서버를 RATE_LIMIT_REQUESTS=0 으로 실행하세요.")
+
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return "-"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run load-test scenarios against a local API server.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    parser.add_argument("--users", type=int, default=1000, help="number of seeded bench users")
+    parser.add_argument("--books", type=int, default=100000, help="number of seeded books")
+    parser.add_argument("--label", default="", help="free-form tag stored with the result")
+    parser.add_argument("--output", help="result file path (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="previous result JSON to diff against")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    ctx = Context(HttpClient(args.base_url), users=args.users, books=args.books)
+
+    result = {
+        "git_commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "label": args.label,
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "scenarios": {},
+    }
+    for name in names:
+        print(f"[*] running {name} ({args.concurrency} threads, {args.duration:.0f}s)...", flush=True)
+        result["scenarios"][name] = run_scenario(name, args.base_url, ctx, args.concurrency, args.duration)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"[*] comparing against {args.compare} ({baseline.get('git_commit')})")
+    print_report(result, baseline)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.utcnow():%Y%m%d-%H%M%S}-{result['git_commit']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"[*] saved {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    main()
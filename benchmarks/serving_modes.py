@@ -0,0 +1,107 @@
+"""
+Compare the WSGI (threaded Flask) and ASGI (uvicorn + async catalog routes)
+serving modes on the read-heavy scenarios of load_test.py.
+
+    SQLALCHEMY_DATABASE_URI=sqlite:///bench.db python benchmarks/serving_modes.py --concurrency 64
+
+Each mode is started as a subprocess on its own port with rate limiting off,
+the same scenarios are run against both, and the ASGI result is printed as a
+delta against the WSGI baseline. Both results are saved under
+benchmarks/results/ like a normal load_test run.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from load_test import RESULTS_DIR, SCENARIOS, Context, HttpClient, _git_commit, print_report, run_scenario
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+READ_SCENARIOS = ["browse", "search", "book_detail", "reviews"]
+
+
+def server_command(mode: str, port: int) -> list[str]:
+    if mode == "wsgi":
+        return [sys.executable, "-m", "flask", "--app", "run.py", "run", "--with-threads",
+                "--no-reload", "--no-debugger", "--port", str(port)]
+    return [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port),
+            "--no-access-log", "--log-level", "warning"]
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urlopen(base_url + "/health", timeout=2):
+                return
+        except (URLError, OSError):
+            time.sleep(0.5)
+    raise SystemExit(f"[!] server at {base_url} did not become ready")
+
+
+def run_mode(mode: str, port: int, args, names: list[str]) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, RATE_LIMIT_REQUESTS="0", LOGIN_THROTTLE_ENABLED="false")
+    server = subprocess.Popen(server_command(mode, port), cwd=ROOT_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(base_url)
+        ctx = Context(HttpClient(base_url), users=args.users, books=args.books)
+        result = {
+            "git_commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "label": f"serving-mode:{mode}",
+            "base_url": base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "scenarios": {},
+        }
+        for name in names:
+            print(f"[*] {mode}: running {name} ({args.concurrency} clients, {args.duration:.0f}s)...", flush=True)
+            result["scenarios"][name] = run_scenario(name, base_url, ctx, args.concurrency, args.duration)
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark WSGI vs ASGI serving modes.")
+    parser.add_argument("--scenarios", default=",".join(READ_SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--wsgi-port", type=int, default=8081)
+    parser.add_argument("--asgi-port", type=int, default=8082)
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    wsgi = run_mode("wsgi", args.wsgi_port, args, names)
+    asgi = run_mode("asgi", args.asgi_port, args, names)
+
+    print("\n[WSGI] flask threaded server")
+    print_report(wsgi)
+    print("\n[ASGI] uvicorn + async catalog routes (Δ vs WSGI)")
+    print_report(asgi, wsgi)
+
+    stamp = f"{datetime.utcnow():%Y%m%d-%H%M%S}-{wsgi['git_commit']}"
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    for mode, result in (("wsgi", wsgi), ("asgi", asgi)):
+        output = RESULTS_DIR / f"{stamp}-{mode}.json"
+        output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"[*] saved {os.path.relpath(output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of the request validation layer (schemas.py).
+
+    python benchmarks/validation.py --iterations 20000
+
+Each schema instance is built once at import, like in the app, so the
+numbers are the per-request cost of `Schema.load` on representative
+payloads (a valid call and a rejected one). No database or server needed.
+"""
+import argparse
+import os
+import sys
+from time import perf_counter
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from marshmallow import ValidationError  # noqa: E402
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+from src.app import schemas  # noqa: E402
+from load_test import percentile  # noqa: E402
+
+CASES = {
+    "book_create": (schemas.BOOK_CREATE, {
+        "title": "Fluent Python", "description": "x" * 500, "price": "42000.00", "isbn13": "9781492056355",
+        "published_at": "2022-04-01", "stock_cnt": 10, "category_id": 3, "author_id": 7, "category_ids": [4, 5],
+    }),
+    "book_query": (schemas.BOOK_LIST_QUERY, MultiDict({
+        "keyword": "python", "min_price": "10000", "max_price": "50000", "category_id": "3", "page": "2",
+    })),
+    "order_create": (schemas.ORDER_CREATE, {
+        "user_id": 1, "items": [{"book_id": i, "quantity": 2} for i in range(1, 11)],
+    }),
+    "cart_add": (schemas.CART_ADD, {"book_id": 2, "quantity": "3"}),
+    "review_invalid": (schemas.REVIEW_CREATE, {"book_id": 1, "rating": "abc"}),
+}
+
+
+def measure(schema, payload, iterations: int) -> list[float]:
+    latencies = []
+    for _ in range(iterations):
+        started = perf_counter()
+        try:
+            schema.load(payload)
+        except ValidationError:
+            pass
+        latencies.append((perf_counter() - started) * 1_000_000)
+    return sorted(latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-request validation overhead.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<16}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}")
+    for name, (schema, payload) in CASES.items():
+        measure(schema, payload, min(1000, args.iterations))  # 워밍업
+        latencies = measure(schema, payload, args.iterations)
+        print(f"{name:<16}{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}"
+              f"{percentile(latencies, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
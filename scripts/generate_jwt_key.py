@@ -0,0 +1,43 @@
+"""
+Generate a signing key for JWT_ALGORITHM=RS256/EdDSA.
+
+    python scripts/generate_jwt_key.py --alg RS256 --kid 2026-10
+
+Writes <keys-dir>/<kid>.pem (private). Rotation:
+  1) generate the next key and deploy it -> it is published in /.well-known/jwks.json
+  2) after edge caches refreshed (JWKS_MAX_AGE_SECONDS), set JWT_ACTIVE_KID to the new kid
+  3) once the old key's last tokens expired (JWT_REFRESH_EXPIRES_DAYS), delete the old .pem
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from src.app.jwt_keys import generate_private_key_pem  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key.")
+    parser.add_argument("--alg", choices=["RS256", "EdDSA"], default="RS256")
+    parser.add_argument("--kid", required=True, help="key id (file name), e.g. 2026-10")
+    parser.add_argument("--keys-dir", default=os.path.join(PROJECT_ROOT, "keys"))
+    args = parser.parse_args(argv)
+
+    keys_dir = Path(args.keys_dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    target = keys_dir / f"{args.kid}.pem"
+    if target.exists():
+        raise SystemExit(f"[!] {target} already exists.")
+
+    target.write_bytes(generate_private_key_pem(args.alg))
+    os.chmod(target, 0o600)
+    print(f"[*] wrote {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
+import argparse
 import os
 import sys
 import random
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 from datetime import datetime, timedelta
+from time import perf_counter
 
-from werkzeug.security import generate_password_hash
+import bcrypt
+from sqlalchemy import create_engine, insert, text
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
@@ -13,6 +17,9 @@ if PROJECT_ROOT not in sys.path:
 
 from src.app import create_app  # noqa: E402
 from src.app.extensions import db  # noqa: E402
+from src.app.category_tree import rebuild_closure  # noqa: E402
+from src.app.order_summary import rebuild_order_summaries  # noqa: E402
+from src.app.rankings import rebuild_rankings  # noqa: E402
 from src.app.models import (  # noqa: E402
     User,
     Author,
@@ -89,6 +96,11 @@ REVIEW_TEMPLATES = [
 ]
 
 
+def hash_password(raw_password: str) -> str:
+    # 앱(User.set_password)과 동일하게 bcrypt 사용
+    return bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
 def clear_and_create_tables():
     print("[*] Dropping all tables...")
     db.drop_all()
@@ -105,7 +117,7 @@ def seed_users():
         email="admin@example.com",
         name="Admin",
         role="ADMIN",
-        password_hash=generate_password_hash("Admin123!"),
+        password_hash=hash_password("Admin123!"),
     )
     users.append(admin)
 
@@ -114,7 +126,7 @@ def seed_users():
             email=f"user{i}@example.com",
             name=f"User{i}",
             role="USER",
-            password_hash=generate_password_hash(f"User{i}123!"),
+            password_hash=hash_password(f"User{i}123!"),
         )
         users.append(user)
 
@@ -258,10 +270,303 @@ def seed_orders_and_reviews(users, books):
     return orders, order_items, reviews
 
 
-def main():
+# ---------------------------------------------------------------------------
+# High-volume mode
+#
+# Rows are generated column-wise per chunk (one random.choices() call per
+# column instead of per-row randint loops) and written with Core insert() +
+# executemany. Each table is loaded by a worker that owns its own engine, so
+# independent tables can be loaded in parallel with --workers.
+# ---------------------------------------------------------------------------
+BULK_TABLE_STAGES = [
+    ("users", "categories", "authors"),
+    ("books",),
+    ("reviews", "orders"),
+    ("order_items",),
+]
+BULK_ITEMS_PER_ORDER = 2
+BULK_ORDER_STATUSES = ["PENDING", "PAID", "SHIPPED", "COMPLETED"]
+ISBN_MULTIPLIER = 387_420_489  # 3^18, 10^9 과 서로소 -> (a*i + b) mod 10^9 는 중복 없는 순열
+
+
+def isbn13_for(index: int) -> str:
+    body = "978" + f"{(ISBN_MULTIPLIER * index + 12_345_678) % 1_000_000_000:09d}"
+    total = sum(int(d) * (1 if pos % 2 == 0 else 3) for pos, d in enumerate(body))
+    return body + str((10 - total % 10) % 10)
+
+
+def bulk_book_price(book_id: int) -> int:
+    return ((book_id * 7919) % 28 + 8) * 1000
+
+
+def bulk_order_lines(order_id: int, books: int):
+    # 주문 합계를 order_items 와 따로 계산할 수 있도록 결정적으로 생성
+    for j in range(BULK_ITEMS_PER_ORDER):
+        book_id = (order_id * 104_729 + j * 7_919) % books + 1
+        quantity = (order_id + j) % 3 + 1
+        yield book_id, quantity
+
+
+def _bulk_rows(table: str, start: int, end: int, sizes: dict, rng: random.Random, now: datetime) -> list[dict]:
+    n = end - start
+    ids = range(start + 1, end + 1)
+
+    if table == "users":
+        prefix = sizes["email_prefix"]
+        return [
+            {
+                "id": i,
+                "email": sizes["admin_email"] if i == 1 else f"{prefix}{i - 1}@example.com",
+                "name": "Admin" if i == 1 else f"{prefix.title()} {i - 1}",
+                "role": "ADMIN" if i == 1 else "USER",
+                "password_hash": sizes["password_hash"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in ids
+        ]
+
+    if table == "categories":
+        return [
+            {"id": i, "name": f"Category {i}", "slug": f"category-{i}", "created_at": now, "updated_at": now}
+            for i in ids
+        ]
+
+    if table == "authors":
+        first = rng.choices(AUTHOR_FIRST_NAMES, k=n)
+        last = rng.choices(AUTHOR_LAST_NAMES, k=n)
+        return [
+            {"id": i, "name": f"{f} {la} {i}", "bio": None, "created_at": now, "updated_at": now}
+            for i, f, la in zip(ids, first, last)
+        ]
+
+    if table == "books":
+        titles = rng.choices(BOOK_TITLES, k=n)
+        publishers = rng.choices(PUBLISHERS, k=n)
+        stocks = rng.choices(range(0, 1000), k=n)
+        authors = rng.choices(range(1, sizes["authors"] + 1), k=n)
+        categories = rng.choices(range(1, sizes["categories"] + 1), k=n)
+        days = rng.choices(range(0, 365 * 10), k=n)
+        today = now.date()
+        return [
+            {
+                "id": i,
+                "title": f"{t} #{i}",
+                "description": f"{t} is part of the autogenerated catalog.",
+                "price": bulk_book_price(i),
+                "isbn13": isbn13_for(i),
+                "publisher": p,
+                "published_at": today - timedelta(days=d),
+                "stock_cnt": st,
+                "status": "ACTIVE",
+                "author_id": a,
+                "category_id": c,
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now,
+            }
+            for i, t, p, st, a, c, d in zip(ids, titles, publishers, stocks, authors, categories, days)
+        ]
+
+    if table == "reviews":
+        books = rng.choices(range(1, sizes["books"] + 1), k=n)
+        users = rng.choices(range(2, sizes["users"] + 2), k=n)
+        ratings = rng.choices(range(1, 6), k=n)
+        contents = rng.choices(REVIEW_TEMPLATES, k=n)
+        return [
+            {
+                "id": i, "book_id": b, "user_id": u, "rating": r, "title": None, "content": c,
+                "created_at": now - timedelta(seconds=i), "updated_at": now,
+            }
+            for i, b, u, r, c in zip(ids, books, users, ratings, contents)
+        ]
+
+    if table == "orders":
+        users = rng.choices(range(2, sizes["users"] + 2), k=n)
+        statuses = rng.choices(BULK_ORDER_STATUSES, k=n)
+        rows = []
+        for i, u, st in zip(ids, users, statuses):
+            total = sum(bulk_book_price(b) * q for b, q in bulk_order_lines(i, sizes["books"]))
+            created = now - timedelta(minutes=i)
+            rows.append({
+                "id": i, "user_id": u, "status": st, "total_amount": total,
+                "paid_at": created if st != "PENDING" else None,
+                "created_at": created, "updated_at": now,
+            })
+        return rows
+
+    if table == "order_items":
+        rows = []
+        for order_id in ids:
+            for j, (book_id, quantity) in enumerate(bulk_order_lines(order_id, sizes["books"])):
+                rows.append({
+                    "id": (order_id - 1) * BULK_ITEMS_PER_ORDER + j + 1,
+                    "order_id": order_id, "book_id": book_id, "quantity": quantity,
+                    "unit_price": bulk_book_price(book_id), "created_at": now,
+                })
+        return rows
+
+    raise ValueError(f"unknown table: {table}")
+
+
+def _bulk_row_count(table: str, sizes: dict) -> int:
+    if table == "users":
+        return sizes["users"] + 1  # + admin
+    if table == "order_items":
+        return sizes["orders"]  # order 단위로 생성 (주문당 BULK_ITEMS_PER_ORDER 행)
+    return sizes[table]
+
+
+def _bulk_load_table(uri: str, table_name: str, sizes: dict, chunk_size: int, seed: int) -> tuple[str, int, float]:
+    """Worker entry point: loads one table with its own engine/connection."""
+    table = db.metadata.tables[table_name]
+    connect_args = {"timeout": 60} if uri.startswith("sqlite") else {}
+    engine = create_engine(uri, connect_args=connect_args)
+    rng = random.Random(f"{seed}:{table_name}")
+    now = datetime.utcnow()
+    total = _bulk_row_count(table_name, sizes)
+    inserted = 0
+    started = perf_counter()
+
+    with engine.connect() as conn:
+        mysql = engine.dialect.name == "mysql"
+        if mysql:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
+            conn.execute(text("SET UNIQUE_CHECKS=0"))
+        for start in range(0, total, chunk_size):
+            rows = _bulk_rows(table_name, start, min(start + chunk_size, total), sizes, rng, now)
+            conn.execute(insert(table), rows)
+            conn.commit()
+            inserted += len(rows)
+        if mysql:
+            conn.execute(text("SET UNIQUE_CHECKS=1"))
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
+            conn.commit()
+
+    engine.dispose()
+    return table_name, inserted, perf_counter() - started
+
+
+def _backs_foreign_key(index) -> bool:
+    # InnoDB 는 FK 컬럼으로 시작하는 인덱스를 요구한다 (FOREIGN_KEY_CHECKS=0 이어도 DROP 시 1553)
+    columns = [column.name for column in index.columns]
+    return any(
+        columns[: len(fk.columns)] == [column.name for column in fk.columns]
+        for fk in index.table.foreign_key_constraints
+    )
+
+
+def _secondary_indexes(table_names):
+    """Indexes that can be dropped for the load: those backing a FK stay."""
+    return [
+        idx for name in table_names for idx in db.metadata.tables[name].indexes
+        if not _backs_foreign_key(idx)
+    ]
+
+
+def bulk_seed(
+    users: int = 10_000,
+    categories: int = 50,
+    authors: int = 20_000,
+    books: int = 1_000_000,
+    reviews: int = 1_000_000,
+    orders: int = 200_000,
+    chunk_size: int = 10_000,
+    workers: int = 1,
+    seed: int = 42,
+    password: str = "User123!",
+    email_prefix: str = "user",
+    admin_email: str = "admin@example.com",
+):
+    """
+    Recreate the schema and load a synthetic data set of the given size.
+    Must be called inside an app context; every bulk user shares `password`
+    (hashed once with bcrypt), the admin account is `admin_email`.
+    """
+    uri = db.engine.url.render_as_string(hide_password=False)
+    sizes = {
+        "users": users, "categories": categories, "authors": authors, "books": books,
+        "reviews": reviews, "orders": orders,
+        "password_hash": hash_password(password),
+        "email_prefix": email_prefix, "admin_email": admin_email,
+    }
+
+    clear_and_create_tables()
+    db.session.remove()
+    db.engine.dispose()
+
+    mysql = db.engine.dialect.name == "mysql"
+    all_tables = [name for stage in BULK_TABLE_STAGES for name in stage]
+    dropped = []
+    if mysql:
+        # InnoDB 는 DISABLE KEYS 를 무시하므로 보조 인덱스를 지웠다가 적재 후 다시 만든다.
+        print("[*] Dropping secondary indexes for the load...")
+        with db.engine.begin() as conn:
+            for index in _secondary_indexes(all_tables):
+                index.drop(conn)
+                dropped.append(index)
+
+    started = perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for stage in BULK_TABLE_STAGES:
+            if pool is None:
+                results = [_bulk_load_table(uri, name, sizes, chunk_size, seed) for name in stage]
+            else:
+                futures = [pool.submit(_bulk_load_table, uri, name, sizes, chunk_size, seed) for name in stage]
+                results = [f.result() for f in futures]
+            for name, count, elapsed in results:
+                rate = count / elapsed if elapsed > 0 else 0
+                print(f"[*] {name}: {count} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if dropped:
+        print("[*] Rebuilding secondary indexes...")
+        with db.engine.begin() as conn:
+            for index in dropped:
+                index.create(conn)
+
+    # Core insert 는 매퍼 이벤트/아웃박스를 거치지 않으므로 파생 테이블을 한 번에 채운다.
+    print("[*] Rebuilding derived tables (category closure, rankings, order summaries)...")
+    rebuild_closure()
+    rebuild_rankings()
+    rebuild_order_summaries()
+
+    print(f"[*] Bulk seed finished in {perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the bookstore database.")
+    parser.add_argument("--bulk", action="store_true", help="high-volume mode (Core bulk inserts)")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--authors", type=int, default=20_000)
+    parser.add_argument("--books", type=int, default=1_000_000)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=1, help="parallel processes (one table per process)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
     app = create_app("dev")
 
     with app.app_context():
+        if args.bulk:
+            bulk_seed(
+                users=args.users,
+                categories=args.categories,
+                authors=args.authors,
+                books=args.books,
+                reviews=args.reviews,
+                orders=args.orders,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                seed=args.seed,
+            )
+            return
+
         clear_and_create_tables()
 
         users = seed_users()
@@ -5,9 +5,21 @@ from dotenv import load_dotenv
 
 from .config import get_config
 from .extensions import db
-from .error_handlers import register_error_handlers, ApiError
-from .error_codes import ErrorCodes
+from .db_utils import enable_sqlite_foreign_keys
+from .error_handlers import register_error_handlers
+from .compression import register_compression
 from .swagger import register_swagger
+from .query_profiler import register_query_profiler, get_query_stats, format_query_stats
+from .metrics import register_metrics
+from .rate_limit import register_rate_limit
+from .login_throttle import register_login_throttle
+from .token_store import register_token_store
+from .rankings import register_rankings
+from .recommendations import register_recommendations
+from .order_summary import register_order_summary
+from .outbox import register_outbox
+from .archival import register_archival
+from .category_tree import register_category_tree
 
 
 def create_app(config_name="dev"):
@@ -21,14 +33,26 @@ def create_app(config_name="dev"):
 
     register_blueprints(app)
     register_error_handlers(app)
+    register_compression(app)
     register_swagger(app)
+    register_query_profiler(app)
     register_request_logging(app)
+    register_metrics(app)
     register_rate_limit(app)
+    register_login_throttle(app)
+    register_token_store(app)
+    register_rankings(app)
+    register_recommendations(app)
+    register_order_summary(app)
+    register_outbox(app)
+    register_archival(app)
+    register_category_tree(app)
 
     # 개발 단계: 자동 테이블 생성
     with app.app_context():
         from .models import User, Book  # noqa: F401
 
+        enable_sqlite_foreign_keys(db.engine)
         db.create_all()
 
     return app
@@ -46,38 +70,16 @@ def register_request_logging(app):
         if start_time is not None:
             duration_ms = (perf_counter() - start_time) * 1000
 
-        app.logger.info(
-            "%s %s -> %s (%.2f ms)",
-            request.method,
-            request.path,
-            response.status_code,
-            duration_ms,
-        )
-        return response
-
-
-def register_rate_limit(app):
-    limit = app.config.get("RATE_LIMIT_REQUESTS", 0)
-    window = app.config.get("RATE_LIMIT_WINDOW_SECONDS", 60)
-    if not limit or limit <= 0 or window <= 0:
-        return
+        message = "%s %s -> %s (%.2f ms)"
+        args = [request.method, request.path, response.status_code, duration_ms]
 
-    buckets: dict[str, list[float]] = {}
+        stats = get_query_stats()
+        if stats is not None:
+            message += " %s"
+            args.append(format_query_stats(stats))
 
-    @app.before_request
-    def _enforce_rate_limit():
-        key = request.remote_addr or "anonymous"
-        now = perf_counter()
-        bucket = buckets.setdefault(key, [])
-        cutoff = now - window
-        bucket[:] = [ts for ts in bucket if ts >= cutoff]
-        if len(bucket) >= limit:
-            raise ApiError(
-                status_code=429,
-                code=ErrorCodes.TOO_MANY_REQUESTS,
-                message="Too many requests. Please try again later.",
-            )
-        bucket.append(now)
+        app.logger.info(message, *args)
+        return response
 
 
 def register_blueprints(app):
@@ -93,6 +95,8 @@ def register_blueprints(app):
     from .routes.cart import bp as cart_bp
     from .routes.orders import bp as orders_bp
     from .routes.auth import bp as auth_bp
+    from .routes.metrics import bp as metrics_bp
+    from .routes.jwks import bp as jwks_bp
 
     app.register_blueprint(health_bp, url_prefix="/health")
     app.register_blueprint(users_bp, url_prefix="/users")
@@ -106,3 +110,5 @@ def register_blueprints(app):
     app.register_blueprint(cart_bp, url_prefix="/cart")
     app.register_blueprint(orders_bp, url_prefix="/orders")
     app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(metrics_bp, url_prefix="/metrics")
+    app.register_blueprint(jwks_bp, url_prefix="/.well-known")
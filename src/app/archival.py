@@ -0,0 +1,184 @@
+import threading
+from datetime import datetime, timedelta
+from time import perf_counter, sleep
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.orm import aliased
+
+from .extensions import db
+from .models import (
+    Cart, Comment, Order, OrderItem, Review, ReviewLike, Wishlist,
+    comments_archive, order_items_archive, orders_archive, reviews_archive,
+)
+
+
+class SoftDeletePolicy:
+    """
+    How soft-deleted rows of one table leave the hot table.
+
+    `archive`: archive table to copy rows into (None → purge only).
+    `children`: (child table, FK column, archive table or None) moved with each parent batch.
+    `where`: extra condition for rows that may not be moved yet.
+    """
+
+    def __init__(self, model, archive=None, children=(), where=None):
+        self.model = model
+        self.archive = archive
+        self.children = children
+        self.where = where
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+
+def _comment_is_leaf():
+    # 살아 있는 답글이 달린 삭제 댓글은 스레드 표시를 위해 남겨 둔다 (답글이 정리된 뒤 이동).
+    child = aliased(Comment)
+    return ~exists().where(child.parent_id == Comment.id)
+
+
+POLICIES = {
+    "cart": SoftDeletePolicy(Cart),
+    "wishlists": SoftDeletePolicy(Wishlist),
+    "reviews": SoftDeletePolicy(
+        Review,
+        archive=reviews_archive,
+        children=(
+            (Comment.__table__, Comment.review_id, comments_archive),
+            (ReviewLike.__table__, ReviewLike.review_id, None),
+        ),
+    ),
+    "comments": SoftDeletePolicy(Comment, archive=comments_archive, where=_comment_is_leaf),
+    "orders": SoftDeletePolicy(
+        Order,
+        archive=orders_archive,
+        children=((OrderItem.__table__, OrderItem.order_id, order_items_archive),),
+    ),
+}
+
+
+def _copy_rows(source, archive, condition, archived_at: datetime):
+    names = [column.name for column in source.columns]
+    rows = select(*source.columns, literal(archived_at, db.DateTime)).where(condition)
+    db.session.execute(insert(archive).from_select(names + ["archived_at"], rows))
+
+
+def _move(source, archive, condition, archived_at: datetime) -> int:
+    if archive is not None:
+        _copy_rows(source, archive, condition, archived_at)
+    if source is Comment.__table__:
+        # 자기 참조 FK: 같은 배치 안의 답글 관계를 먼저 끊는다 (보관본에는 parent_id 유지).
+        db.session.execute(source.update().where(condition).values(parent_id=None))
+    return db.session.execute(source.delete().where(condition)).rowcount
+
+
+def archive_batch(policy: SoftDeletePolicy, ids: list[int], archived_at: datetime) -> int:
+    """Move one batch of parents (and their children) in a single short transaction."""
+    for child, fk_column, child_archive in policy.children:
+        _move(child, child_archive, fk_column.in_(ids), archived_at)
+    moved = _move(policy.model.__table__, policy.archive, policy.model.id.in_(ids), archived_at)
+    db.session.commit()
+    return moved
+
+
+def archive_soft_deleted(policy: SoftDeletePolicy, retention_days: int, batch_size: int = 500,
+                         pause_seconds: float = 0.0, dry_run: bool = False, progress=None) -> int:
+    """
+    Archive (or purge) rows soft-deleted more than `retention_days` ago.
+    Batches are keyset-ordered by id and each commits on its own, so locks
+    are held for one batch only; `pause_seconds` throttles between batches.
+    `progress(table, moved_so_far, batch_ms)` is called after every batch.
+    """
+    model = policy.model
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    conditions = [model.deleted_at.isnot(None), model.deleted_at < cutoff]
+    if policy.where is not None:
+        conditions.append(policy.where())
+
+    if dry_run:
+        return db.session.query(model.id).filter(*conditions).count()
+
+    moved, last_id = 0, 0
+    while True:
+        ids = [
+            row_id for (row_id,) in db.session.query(model.id)
+            .filter(model.id > last_id, *conditions)
+            .order_by(model.id.asc())
+            .limit(batch_size)
+        ]
+        if not ids:
+            db.session.rollback()
+            return moved
+
+        started = perf_counter()
+        moved += archive_batch(policy, ids, datetime.utcnow())
+        last_id = ids[-1]
+        if progress is not None:
+            progress(policy.name, moved, (perf_counter() - started) * 1000)
+        if pause_seconds > 0:
+            sleep(pause_seconds)
+
+
+def run_archival(tables=None, retention_days: int | None = None, batch_size: int | None = None,
+                 pause_seconds: float | None = None, dry_run: bool = False, progress=None) -> dict:
+    config = current_app.config
+    retention_days = int(config.get("SOFT_DELETE_RETENTION_DAYS", 30)) if retention_days is None else retention_days
+    batch_size = batch_size or int(config.get("ARCHIVE_BATCH_SIZE", 500))
+    if pause_seconds is None:
+        pause_seconds = float(config.get("ARCHIVE_BATCH_PAUSE_SECONDS", 0.05))
+
+    return {
+        name: archive_soft_deleted(POLICIES[name], retention_days, batch_size, pause_seconds, dry_run, progress)
+        for name in (tables or POLICIES)
+    }
+
+
+maintenance_cli = AppGroup("maintenance", help="Database maintenance jobs.")
+
+
+@maintenance_cli.command("archive-deleted")
+@click.option("--table", "tables", multiple=True, type=click.Choice(sorted(POLICIES)),
+              help="Limit to these tables (repeatable). Default: all.")
+@click.option("--retention-days", type=int, default=None, help="SOFT_DELETE_RETENTION_DAYS")
+@click.option("--batch-size", type=int, default=None, help="ARCHIVE_BATCH_SIZE")
+@click.option("--pause", "pause_seconds", type=float, default=None, help="Seconds to sleep between batches.")
+@click.option("--dry-run", is_flag=True, help="Only count rows that would be moved.")
+def archive_deleted_command(tables, retention_days, batch_size, pause_seconds, dry_run):
+    """Move soft-deleted rows past the retention window to *_archive tables (cart/wishlists are purged)."""
+    def report(table, moved, batch_ms):
+        click.echo(f"  {table}: {moved} rows ({batch_ms:.1f} ms last batch)")
+
+    totals = run_archival(tables or None, retention_days, batch_size, pause_seconds, dry_run, progress=report)
+    verb = "would move" if dry_run else "moved"
+    for table, count in totals.items():
+        click.echo(f"{table}: {verb} {count} rows")
+
+
+def _start_archive_thread(app, interval: float):
+    stop = threading.Event()
+
+    def _run():
+        while not stop.wait(interval):
+            try:
+                with app.app_context():
+                    totals = run_archival()
+                    if any(totals.values()):
+                        app.logger.info("archived soft-deleted rows: %s", totals)
+            except Exception:  # noqa: BLE001 - 백그라운드 스레드는 죽지 않도록
+                app.logger.exception("soft-delete archival failed")
+
+    thread = threading.Thread(target=_run, name="soft-delete-archival", daemon=True)
+    thread.start()
+    return stop
+
+
+def register_archival(app):
+    app.cli.add_command(maintenance_cli)
+
+    interval = float(app.config.get("ARCHIVE_INTERVAL_SECONDS", 0) or 0)
+    if interval > 0:
+        app.extensions["archive_stop"] = _start_archive_thread(app, interval)
@@ -0,0 +1,324 @@
+"""
+ASGI serving mode.
+
+The read-heavy catalog endpoints (book list/detail, review list, comment list)
+are served natively on the event loop with an async SQLAlchemy engine
+(aiosqlite / aiomysql), so a request waiting on the database holds a coroutine
+instead of a worker thread. Every other path is handed to the regular Flask app
+through asgiref's WSGI adapter (thread pool).
+
+The native routes go through the same shared pieces as their WSGI twins:
+filter builders and serializers, the catalog index (CATALOG_INDEX_ENABLED),
+read replicas (async engines mirroring SQLALCHEMY_REPLICA_URIS, picked by the
+same ReplicaSet), the SQL profiler with Server-Timing and the access log,
+rate limiting, metrics and compression. They do not run Flask's
+before/after_request hooks, so anything added there later has to be
+mirrored in `_dispatch`.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8080
+"""
+import asyncio
+from time import perf_counter
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+
+from .catalog_index import catalog_page
+from .compression import compress_body
+from .db_routing import get_replica_set
+from .extensions import db
+from .error_handlers import ApiError, error_payload
+from .error_codes import ErrorCodes
+from .facets import book_facets_query, build_facets, price_bands, wants_facets
+from .metrics import get_metrics
+from .models import Book, Review, Comment
+from .pagination import parse_pagination_args, build_page_meta
+from .query_profiler import (
+    begin_query_stats, end_query_stats, format_query_stats, get_query_stats, instrument_engine, server_timing,
+)
+from .rate_limit import get_rate_limiter
+from .routes.books import book_to_dict, build_book_filters
+from .routes.reviews import review_to_dict, build_review_filters
+from .routes.comments import comment_to_dict
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+BOOK_LOAD_OPTIONS = (joinedload(Book.author), joinedload(Book.category))
+
+
+def _with_async_driver(url):
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for '{url.get_backend_name()}'.")
+    return url.set(drivername=driver)
+
+
+def async_database_url(app):
+    """ASYNC_DATABASE_URI 가 없으면 동기 엔진 URL 의 드라이버만 async 드라이버로 교체"""
+    override = app.config.get("ASYNC_DATABASE_URI")
+    if override:
+        return make_url(override)
+
+    with app.app_context():
+        url = db.engine.url
+    return _with_async_driver(url)
+
+
+class AsyncCatalogApp:
+    """ASGI entry point: native async catalog routes + WSGI fallback for the rest."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.url_map = Map([
+            Rule("/books", endpoint="list_books"),
+            Rule("/books/<int:book_id>", endpoint="get_book"),
+            Rule("/reviews", endpoint="list_reviews"),
+            Rule("/reviews/<int:review_id>/comments", endpoint="list_comments"),
+        ]).bind("localhost")
+        self.handlers = {
+            "list_books": self.list_books,
+            "get_book": self.get_book,
+            "list_reviews": self.list_reviews,
+            "list_comments": self.list_comments,
+        }
+
+        with flask_app.app_context():
+            self.metrics = get_metrics()
+        self.rate_limiter = get_rate_limiter(flask_app)
+        self.engine = None
+        self.sessionmaker = None
+        self.replicas = None
+        self.replica_engines = []
+
+    # ---- engine lifecycle -------------------------------------------------
+    def _create_engine(self, url):
+        config = self.flask_app.config
+        options = {}
+        if url.get_backend_name() != "sqlite":
+            options.update(
+                pool_size=int(config.get("ASYNC_DB_POOL_SIZE", 20)),
+                max_overflow=int(config.get("ASYNC_DB_MAX_OVERFLOW", 20)),
+                pool_pre_ping=True,
+            )
+        engine = create_async_engine(url, **options)
+        if config.get("QUERY_PROFILER_ENABLED", True):
+            instrument_engine(self.flask_app, engine.sync_engine)
+        return engine
+
+    def _ensure_engine(self):
+        if self.engine is not None:
+            return
+        self.engine = self._create_engine(async_database_url(self.flask_app))
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        # 동기 복제본과 1:1 로 대응하는 async 엔진; 선택과 장애 표시는 같은 ReplicaSet 이 맡는다.
+        self.replicas = get_replica_set(self.flask_app)
+        for replica in self.replicas.engines:
+            engine = self._create_engine(_with_async_driver(replica.url))
+            event.listen(engine.sync_engine, "handle_error", self._replica_error_handler(replica))
+            self.replica_engines.append(engine)
+
+    def _replica_error_handler(self, replica):
+        def _on_error(exception_context):
+            if exception_context.is_disconnect or exception_context.connection is None:
+                self.replicas.mark_down(replica)
+        return _on_error
+
+    async def _open_session(self):
+        """Native routes are all read-only (@replica_read on the WSGI side): use a replica when one is up."""
+        bind = self.engine
+        if self.replica_engines:
+            # choose() 는 주기적으로 동기 헬스 체크를 하므로 이벤트 루프 밖에서 호출
+            chosen = await asyncio.to_thread(self.replicas.choose)
+            if chosen is not None:
+                bind = self.replica_engines[self.replicas.engines.index(chosen)]
+        return self.sessionmaker(bind=bind)
+
+    async def aclose(self):
+        for engine in self.replica_engines:
+            await engine.dispose()
+        self.replica_engines = []
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+            self.sessionmaker = None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    self._ensure_engine()
+                except Exception as exc:  # noqa: BLE001 - 서버에 실패 사유 전달
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # ---- ASGI -------------------------------------------------------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["method"] == "GET":
+            try:
+                rule, params = self.url_map.match(scope["path"], "GET", return_rule=True)
+            except HTTPException:
+                rule = None
+            if rule is not None:
+                await self._dispatch(rule, params, scope, send)
+                return
+
+        await self.wsgi(scope, receive, send)
+
+    async def _dispatch(self, rule, params, scope, send):
+        started = perf_counter()
+        path = scope["path"]
+        args = MultiDict(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+        stats_token = begin_query_stats(self.flask_app, rule.endpoint, "GET", path)
+        try:
+            await self._respond(rule, params, scope, send, path, args, started)
+        finally:
+            end_query_stats(stats_token)
+
+    async def _respond(self, rule, params, scope, send, path, args, started):
+        try:
+            if self.rate_limiter is not None:
+                client = scope.get("client")
+                self.rate_limiter.hit(client[0] if client else "anonymous")
+            self._ensure_engine()
+            async with await self._open_session() as session:
+                status, body = await self.handlers[rule.endpoint](session, args, **params)
+        except ApiError as err:
+            status = err.status_code
+            body = error_payload(path, err.status_code, err.code, err.message, err.details)
+        except Exception as err:  # noqa: BLE001 - Flask 의 전역 핸들러와 동일하게 500 으로 변환
+            self.flask_app.logger.exception("Unhandled exception occurred: %s", err)
+            status = 500
+            body = error_payload(path, 500, ErrorCodes.INTERNAL_SERVER_ERROR, "서버 내부 오류가 발생했습니다.")
+
+        payload = self.flask_app.json.dumps(body).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"vary", b"Accept-Encoding")]
+        config = self.flask_app.config
+        if config.get("COMPRESSION_ENABLED", True):
+            accept = dict(scope.get("headers", [])).get(b"accept-encoding", b"").decode("latin-1")
+            payload, encoding = compress_body(payload, accept, int(config.get("COMPRESSION_MIN_SIZE", 1024)))
+            if encoding is not None:
+                headers.append((b"content-encoding", encoding.encode("ascii")))
+        headers.append((b"content-length", str(len(payload)).encode("ascii")))
+        stats = get_query_stats()
+        if stats is not None:
+            headers.append((b"server-timing", server_timing(stats).encode("latin-1")))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers,
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+        duration = perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.inc("http_requests_total", (("endpoint", rule.rule), ("method", "GET"),
+                                                     ("status", str(status))))
+            self.metrics.observe("http_request_duration_seconds", (("endpoint", rule.rule), ("method", "GET")),
+                                 duration)
+            self.metrics.maybe_flush()
+        message = "%s %s -> %s (%.2f ms) async"
+        log_args = ["GET", path, status, duration * 1000]
+        if stats is not None:
+            message += " %s"
+            log_args.append(format_query_stats(stats))
+        self.flask_app.logger.info(message, *log_args)
+
+    # ---- handlers (동기 라우트와 같은 필터/직렬화 사용) ---------------------
+    @staticmethod
+    async def _paginate(session, stmt, model, args, options=()):
+        page, size, sort_field, sort_dir = parse_pagination_args(args, model)
+
+        total_elements = await session.scalar(select(func.count()).select_from(stmt.subquery()))
+
+        sort_column = getattr(model, sort_field, None)
+        if sort_column is not None:
+            stmt = stmt.order_by(sort_column.desc() if sort_dir == "DESC" else sort_column.asc())
+        stmt = stmt.options(*options).offset((page - 1) * size).limit(size)
+        items = (await session.scalars(stmt)).unique().all()
+
+        return items, build_page_meta(page, size, total_elements, sort_field, sort_dir)
+
+    def _catalog_page(self, args):
+        # 인덱스 갱신/하위 카테고리 조회는 동기 세션을 쓰므로 스레드에서 app context 와 함께 실행
+        with self.flask_app.app_context():
+            return catalog_page(args)
+
+    async def list_books(self, session, args):
+        filters = build_book_filters(args)
+        indexed = None
+        if self.flask_app.config.get("CATALOG_INDEX_ENABLED", False):
+            indexed = await asyncio.to_thread(self._catalog_page, args)
+        if indexed is not None:
+            ids, meta = indexed
+            rows = (await session.scalars(
+                select(Book).where(Book.id.in_(ids)).options(*BOOK_LOAD_OPTIONS)
+            )).unique().all() if ids else []
+            by_id = {book.id: book for book in rows}
+            books = [by_id[i] for i in ids if i in by_id]
+        else:
+            stmt = select(Book).where(*filters)
+            books, meta = await self._paginate(session, stmt, Book, args, BOOK_LOAD_OPTIONS)
+        body = {"content": [book_to_dict(b) for b in books], **meta}
+        if wants_facets(args):
+            config = self.flask_app.config
+            bands = price_bands(config)
+            rows = await session.execute(book_facets_query(filters, bands))
+            body["facets"] = build_facets(rows, bands, int(config.get("BOOK_FACET_LIMIT", 20)))
+        return 200, body
+
+    async def get_book(self, session, args, book_id):
+        book = await session.get(Book, book_id, options=BOOK_LOAD_OPTIONS)
+        if not book:
+            raise ApiError(
+                status_code=404,
+                code=ErrorCodes.RESOURCE_NOT_FOUND,
+                message="Book could not be found.",
+            )
+        return 200, book_to_dict(book)
+
+    async def list_reviews(self, session, args):
+        stmt = select(Review).where(*build_review_filters(args))
+        reviews, meta = await self._paginate(session, stmt, Review, args)
+        return 200, {"content": [review_to_dict(r) for r in reviews], **meta}
+
+    async def list_comments(self, session, args, review_id):
+        review = await session.get(Review, review_id)
+        if not review or review.deleted_at is not None:
+            return 404, {"message": "리뷰를 찾을 수 없습니다."}
+
+        comments = await session.scalars(
+            select(Comment)
+            .where(Comment.review_id == review_id, Comment.deleted_at.is_(None))
+            .order_by(Comment.created_at.asc())
+        )
+        return 200, [comment_to_dict(c) for c in comments]
+
+
+def create_asgi_app(config_name="dev", flask_app=None):
+    if flask_app is None:
+        from . import create_app
+
+        flask_app = create_app(config_name)
+    return AsyncCatalogApp(flask_app)
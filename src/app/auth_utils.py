@@ -3,6 +3,7 @@ from flask import request, g
 import jwt
 
 from .jwt_utils import decode_token
+from .token_store import get_token_store
 from .models import User
 from .error_handlers import ApiError
 from .error_codes import ErrorCodes
@@ -44,6 +45,13 @@ def jwt_required(role: str | None = None):
                     message="Invalid access token.",
                 )
 
+            if get_token_store().is_revoked(payload.get("fam")):
+                raise ApiError(
+                    status_code=401,
+                    code=ErrorCodes.UNAUTHORIZED,
+                    message="Access token has been revoked. Please login again.",
+                )
+
             user_id_claim = payload.get("sub")
             user_role = payload.get("role")
 
@@ -78,3 +86,13 @@ def jwt_required(role: str | None = None):
         return wrapper
 
     return decorator
+
+
+def require_owner_or_admin(owner_id: int, message: str = "You do not have permission to perform this action."):
+    """Allow the resource owner (g.current_user) or an ADMIN; anyone else gets 403."""
+    if g.current_user.role != "ADMIN" and owner_id != g.current_user.id:
+        raise ApiError(
+            status_code=403,
+            code=ErrorCodes.FORBIDDEN,
+            message=message,
+        )
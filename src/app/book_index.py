@@ -0,0 +1,151 @@
+"""
+Change tracking shared by the in-process indexes built from `books`
+(catalog_index, suggest).
+
+  - ORM writes to books / book_categories / authors in this process are
+    recorded by session events and handed to every live index after the
+    commit, which re-reads just those books;
+  - bulk UPDATE/DELETE statements and writes from other processes are picked
+    up by a delta poll on `books.updated_at` every `refresh_seconds`
+    (a row-count mismatch triggers a rebuild).
+"""
+import threading
+from datetime import datetime
+from time import monotonic
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select
+
+from .db_routing import RoutingSession
+from .models import Author, Book, BookCategory
+
+# app.extensions 키 목록: 커밋된 변경을 전달받는 인덱스
+INDEX_KEYS: list[str] = []
+
+
+def track_book_changes(extension_key: str):
+    if extension_key not in INDEX_KEYS:
+        INDEX_KEYS.append(extension_key)
+
+
+class BookIndex:
+    """
+    Base class handling freshness. Subclasses implement `_load(conn)` (full
+    load), `_reload(conn, book_ids)` (re-read or drop those books) and
+    `book_count()`, and call `_advance(updated_at)` for every row they read.
+    """
+
+    def __init__(self, refresh_seconds: float = 5.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._pending: set[int] = set()
+        self._pending_authors: set[int] = set()
+        self._poll_requested = False
+        self._polled_at = 0.0
+        self._watermark: datetime | None = None
+
+    def _load(self, conn):
+        raise NotImplementedError
+
+    def _reload(self, conn, book_ids: list[int]):
+        raise NotImplementedError
+
+    def book_count(self) -> int:
+        raise NotImplementedError
+
+    def _after_poll(self, conn):
+        """Hook for data refreshed on the poll interval only."""
+
+    def _advance(self, updated_at: datetime | None):
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def rebuild(self, conn):
+        with self._lock:
+            self._watermark = None
+            self._load(conn)
+            self._loaded = True
+            self._polled_at = monotonic()
+
+    def _poll(self, conn):
+        """Delta refresh by updated_at; rebuild when rows were deleted elsewhere."""
+        watermark = self._watermark
+        changed = [] if watermark is None else [
+            book_id for (book_id,) in conn.execute(select(Book.id).where(Book.updated_at >= watermark))
+        ]
+        if changed:
+            self._reload(conn, changed)
+        if conn.scalar(select(func.count()).select_from(Book)) != self.book_count():
+            self.rebuild(conn)
+        self._after_poll(conn)
+        self._polled_at = monotonic()
+
+    def mark_changed(self, book_ids=(), poll: bool = False, author_ids=()):
+        with self._lock:
+            self._pending.update(book_ids)
+            self._pending_authors.update(author_ids)
+            self._poll_requested = self._poll_requested or poll
+
+    def ensure_fresh(self, engine):
+        with self._lock:
+            loaded, pending, authors = self._loaded, set(self._pending), list(self._pending_authors)
+            poll = self._poll_requested or monotonic() - self._polled_at >= self.refresh_seconds
+            self._pending.clear()
+            self._pending_authors.clear()
+            self._poll_requested = False
+        if loaded and not pending and not authors and not poll:
+            return
+        with engine.connect() as conn:
+            if not loaded:
+                self.rebuild(conn)
+                self._after_poll(conn)
+                return
+            if authors:
+                pending.update(book_id for (book_id,) in conn.execute(
+                    select(Book.id).where(Book.author_id.in_(authors))
+                ))
+            if pending:
+                self._reload(conn, sorted(pending))
+            if poll:
+                self._poll(conn)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_book_changes(session, flush_context):
+    changed = session.info.setdefault("book_index_changed", set())
+    authors = session.info.setdefault("book_index_authors", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Book):
+            changed.add(obj.id)
+        elif isinstance(obj, BookCategory):
+            changed.add(obj.book_id)
+        elif isinstance(obj, Author):
+            authors.add(obj.id)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and \
+            orm_execute_state.bind_mapper is not None and \
+            orm_execute_state.bind_mapper.class_ in (Book, BookCategory):
+        orm_execute_state.session.info["book_index_poll"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _publish_book_changes(session):
+    changed = session.info.pop("book_index_changed", None)
+    authors = session.info.pop("book_index_authors", None)
+    poll = session.info.pop("book_index_poll", False)
+    if not (changed or authors or poll) or not has_app_context():
+        return
+    for key in INDEX_KEYS:
+        index = current_app.extensions.get(key)
+        if index is not None:
+            index.mark_changed(changed or (), poll=poll, author_ids=authors or ())
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_book_changes(session):
+    for key in ("book_index_changed", "book_index_authors", "book_index_poll"):
+        session.info.pop(key, None)
@@ -0,0 +1,266 @@
+"""
+In-process columnar index of the catalog for `GET /books`.
+
+Book attributes used for filtering and sorting are kept in NumPy columns
+(prices in cents, timestamps in microseconds), so filter + sort + page is a
+handful of vectorized masks and an argpartition instead of a SQL scan. Only
+the ids of the requested page are then loaded through the ORM. Keyword
+search, facets and non-numeric sorts fall back to SQL.
+
+Freshness is handled by book_index.BookIndex (session events for local
+writes, an updated_at delta poll every CATALOG_INDEX_REFRESH_SECONDS).
+"""
+from datetime import date, datetime, timedelta
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+import numpy as np
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from .book_index import BookIndex, track_book_changes
+from .category_tree import subtree_ids
+from .extensions import db
+from .metrics import record_cache_access
+from .models import Book, BookCategory
+from .pagination import build_page_meta, parse_pagination_args
+
+NULL_KEY = np.iinfo(np.int64).min  # SQL 과 같이 NULL 은 ASC 에서 처음, DESC 에서 마지막
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+INT_COLUMNS = ("id", "price", "stock_cnt", "category_id", "author_id", "created_at", "updated_at", "published_at")
+SORTABLE = set(INT_COLUMNS)
+UNSUPPORTED_ARGS = ("keyword", "facets")
+
+BOOK_COLUMNS = (
+    Book.id, Book.price, Book.stock_cnt, Book.status, Book.category_id, Book.author_id,
+    Book.created_at, Book.updated_at, Book.published_at,
+)
+
+
+def _micros(value: datetime | None) -> int:
+    return NULL_KEY if value is None else (value - EPOCH) // MICROSECOND
+
+
+def _days(value: date | None) -> int:
+    return NULL_KEY if value is None else value.toordinal()
+
+
+def _cents(value) -> int:
+    return NULL_KEY if value is None else int(Decimal(value) * 100)
+
+
+class CatalogIndex(BookIndex):
+    def __init__(self, refresh_seconds: float = 5.0):
+        super().__init__(refresh_seconds)
+        self._reset(0)
+
+    # ---- storage -------------------------------------------------------------
+    def _reset(self, capacity: int):
+        capacity = max(capacity, 1024)
+        self._size = 0
+        self._cols = {name: np.full(capacity, NULL_KEY, dtype=np.int64) for name in INT_COLUMNS}
+        self._status = np.zeros(capacity, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._pos: dict[int, int] = {}
+        self._status_codes: dict[str, int] = {}
+        self._extras: dict[int, frozenset] = {}
+        self._extra_arrays = None
+
+    def _grow(self):
+        capacity = len(self._alive) * 2
+        for name, column in self._cols.items():
+            grown = np.full(capacity, NULL_KEY, dtype=np.int64)
+            grown[:self._size] = column[:self._size]
+            self._cols[name] = grown
+        self._status = np.concatenate([self._status, np.zeros(capacity - len(self._status), dtype=np.int16)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+
+    def _status_code(self, status: str) -> int:
+        return self._status_codes.setdefault(status, len(self._status_codes) + 1)
+
+    def _put(self, row):
+        book_id, price, stock_cnt, status, category_id, author_id, created_at, updated_at, published_at = row
+        position = self._pos.get(book_id)
+        if position is None:
+            if self._size == len(self._alive):
+                self._grow()
+            position = self._pos[book_id] = self._size
+            self._size += 1
+        values = {
+            "id": book_id, "price": _cents(price), "stock_cnt": NULL_KEY if stock_cnt is None else stock_cnt,
+            "category_id": category_id, "author_id": author_id, "created_at": _micros(created_at),
+            "updated_at": _micros(updated_at), "published_at": _days(published_at),
+        }
+        for name, value in values.items():
+            self._cols[name][position] = value
+        self._status[position] = self._status_code(status)
+        self._alive[position] = True
+        self._advance(updated_at)
+
+    def _remove(self, book_id: int):
+        position = self._pos.get(book_id)
+        if position is not None:
+            self._alive[position] = False
+        if self._extras.pop(book_id, None) is not None:
+            self._extra_arrays = None
+
+    def _set_extras(self, book_ids, pairs):
+        for book_id in book_ids:
+            self._extras.pop(book_id, None)
+        grouped: dict[int, set] = {}
+        for book_id, category_id in pairs:
+            grouped.setdefault(book_id, set()).add(category_id)
+        self._extras.update((book_id, frozenset(cats)) for book_id, cats in grouped.items())
+        self._extra_arrays = None
+
+    def _extra_columns(self):
+        if self._extra_arrays is None:
+            pairs = [(book_id, cat) for book_id, cats in self._extras.items() for cat in cats]
+            books = np.fromiter((p[0] for p in pairs), dtype=np.int64, count=len(pairs))
+            cats = np.fromiter((p[1] for p in pairs), dtype=np.int64, count=len(pairs))
+            self._extra_arrays = (books, cats)
+        return self._extra_arrays
+
+    # ---- refresh -------------------------------------------------------------
+    def _load(self, conn):
+        count = conn.scalar(select(func.count()).select_from(Book))
+        self._reset(int(count * 1.25))
+        for row in conn.execute(select(*BOOK_COLUMNS).execution_options(yield_per=10_000)):
+            self._put(tuple(row))
+        self._set_extras([], conn.execute(select(BookCategory.book_id, BookCategory.category_id)))
+
+    def _reload(self, conn, book_ids: list[int]):
+        rows = {row[0]: tuple(row) for row in conn.execute(select(*BOOK_COLUMNS).where(Book.id.in_(book_ids)))}
+        pairs = conn.execute(
+            select(BookCategory.book_id, BookCategory.category_id).where(BookCategory.book_id.in_(book_ids))
+        )
+        with self._lock:
+            for book_id in book_ids:
+                if book_id in rows:
+                    self._put(rows[book_id])
+                else:
+                    self._remove(book_id)
+            self._set_extras(book_ids, pairs)
+
+    def book_count(self) -> int:
+        with self._lock:
+            return int(self._alive[:self._size].sum())
+
+    # ---- query ---------------------------------------------------------------
+    def search(self, *, status=None, min_cents=None, max_cents=None, category_ids=None, author_id=None,
+               sort_field="created_at", descending=True, offset=0, limit=20):
+        """Return (total matches, book ids of the requested page in order)."""
+        with self._lock:
+            size = self._size
+            mask = self._alive[:size].copy()
+            if status is not None:
+                code = self._status_codes.get(status)
+                if code is None:
+                    return 0, []
+                mask &= self._status[:size] == code
+            price = self._cols["price"][:size]
+            if min_cents is not None:
+                mask &= (price != NULL_KEY) & (price >= min_cents)
+            if max_cents is not None:
+                mask &= (price != NULL_KEY) & (price <= max_cents)
+            if author_id is not None:
+                mask &= self._cols["author_id"][:size] == author_id
+            if category_ids is not None:
+                in_category = np.isin(self._cols["category_id"][:size], category_ids)
+                extra_books, extra_cats = self._extra_columns()
+                tagged = extra_books[np.isin(extra_cats, category_ids)]
+                if len(tagged):
+                    in_category |= np.isin(self._cols["id"][:size], tagged)
+                mask &= in_category
+
+            rows = np.flatnonzero(mask)
+            total = len(rows)
+            end = offset + limit
+            if offset >= total:
+                return total, []
+
+            keys = self._cols[sort_field][rows]
+            ids = self._cols["id"][rows]
+            if descending:
+                keys, ids = ~keys, ~ids  # 비트 반전: 오버플로 없이 순서만 뒤집는다.
+
+            candidates = np.arange(total)
+            if end < total // 2:
+                # 상위 end 개만 필요: 부분 정렬(partition)로 경계값을 구하고 그 이하만 정렬
+                kth = np.partition(keys, end - 1)[end - 1]
+                candidates = np.flatnonzero(keys <= kth)
+            ordered = candidates[np.lexsort((ids[candidates], keys[candidates]))]
+            return total, self._cols["id"][rows[ordered[offset:end]]].tolist()
+
+
+def _decimal_bound(value, rounding) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int((Decimal(str(value)) * 100).to_integral_value(rounding=rounding))
+    except (InvalidOperation, TypeError):
+        return None
+
+
+def get_catalog_index(app=None) -> CatalogIndex | None:
+    """The app's index while CATALOG_INDEX_ENABLED is on (created on first use, loaded on first search)."""
+    app = app or current_app._get_current_object()
+    if not app.config.get("CATALOG_INDEX_ENABLED", False):
+        return None
+    index = app.extensions.get("catalog_index")
+    if index is None:
+        index = app.extensions.setdefault("catalog_index", CatalogIndex(
+            refresh_seconds=float(app.config.get("CATALOG_INDEX_REFRESH_SECONDS", 5)),
+        ))
+    return index
+
+
+def catalog_page(args):
+    """
+    Pick the ids of one `GET /books` page from the index. Returns (ids, page
+    meta), or None when the index is disabled or the query needs SQL (keyword,
+    facets, sort on a text column). The sync and ASGI routes both call this
+    and load the rows with their own session. `args` must already have passed
+    build_book_filters.
+    """
+    index = get_catalog_index()
+    if index is None:
+        return None
+
+    page, size, sort_field, sort_dir = parse_pagination_args(args, Book)
+    if any(args.get(name) for name in UNSUPPORTED_ARGS) or sort_field not in SORTABLE:
+        record_cache_access("catalog_index", False)
+        return None
+
+    index.ensure_fresh(db.engine)
+    category_id = args.get("category_id")
+    author_id = args.get("author_id")
+    total, ids = index.search(
+        status=args.get("status") or None,
+        min_cents=_decimal_bound(args.get("min_price"), ROUND_CEILING),
+        max_cents=_decimal_bound(args.get("max_price"), ROUND_FLOOR),
+        category_ids=np.asarray(subtree_ids(int(category_id)), dtype=np.int64) if category_id else None,
+        author_id=int(author_id) if author_id else None,
+        sort_field=sort_field,
+        descending=sort_dir == "DESC",
+        offset=(page - 1) * size,
+        limit=size,
+    )
+    record_cache_access("catalog_index", True)
+    return ids, build_page_meta(page, size, total, sort_field, sort_dir)
+
+
+def search_catalog(args):
+    """Answer `GET /books` from the index: (books, page meta), or None (see catalog_page)."""
+    indexed = catalog_page(args)
+    if indexed is None:
+        return None
+    ids, meta = indexed
+    books = {
+        book.id: book
+        for book in Book.query.options(joinedload(Book.author), joinedload(Book.category)).filter(Book.id.in_(ids))
+    } if ids else {}
+    return [books[i] for i in ids if i in books], meta
+
+
+track_book_changes("catalog_index")
@@ -0,0 +1,132 @@
+from collections import defaultdict
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event, insert, literal, select, true, union
+from sqlalchemy.orm import aliased
+
+from .extensions import db
+from .models import Book, BookCategory, Category, CategoryClosure
+
+
+def subtree_ids(category_id: int) -> list[int]:
+    return [
+        descendant_id for (descendant_id,) in db.session.query(CategoryClosure.descendant_id)
+        .filter(CategoryClosure.ancestor_id == category_id)
+    ]
+
+
+def category_path(category_id: int) -> list[dict]:
+    """Ancestors from the root down to the category itself ("IT > Python")."""
+    rows = (
+        db.session.query(Category.id, Category.name)
+        .join(CategoryClosure, CategoryClosure.ancestor_id == Category.id)
+        .filter(CategoryClosure.descendant_id == category_id)
+        .order_by(CategoryClosure.depth.desc())
+    )
+    return [{"id": row_id, "name": name} for row_id, name in rows]
+
+
+def books_in_subtree(category_id: int):
+    """
+    Ids of books whose primary category (`books.category_id`) or any extra
+    category (`book_categories`) lies in the subtree of `category_id`.
+    Each branch is one join from the closure PK range into an indexed column.
+    """
+    primary = (
+        select(Book.id)
+        .join(CategoryClosure, CategoryClosure.descendant_id == Book.category_id)
+        .where(CategoryClosure.ancestor_id == category_id)
+    )
+    extra = (
+        select(BookCategory.book_id)
+        .join(CategoryClosure, CategoryClosure.descendant_id == BookCategory.category_id)
+        .where(CategoryClosure.ancestor_id == category_id)
+    )
+    return union(primary, extra)
+
+
+@event.listens_for(Category, "after_insert")
+def _attach_node(mapper, connection, category: Category):
+    """Closure rows for every new category (self row + one per ancestor), in the same flush."""
+    connection.execute(insert(CategoryClosure).values(
+        ancestor_id=category.id, descendant_id=category.id, depth=0,
+    ))
+    if category.parent_id is not None:
+        connection.execute(insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(CategoryClosure.ancestor_id, literal(category.id), CategoryClosure.depth + 1)
+            .where(CategoryClosure.descendant_id == category.parent_id),
+        ))
+
+
+def move_node(category: Category, new_parent_id: int | None):
+    """
+    Re-parent a category with its whole subtree. Raises ValueError when the
+    new parent is the category itself or one of its descendants.
+    """
+    ids = subtree_ids(category.id)
+    if new_parent_id is not None and new_parent_id in ids:
+        raise ValueError("cycle")
+
+    # 서브트리 밖의 조상과의 연결만 끊고, 새 부모의 조상 × 서브트리로 다시 잇는다.
+    CategoryClosure.query.filter(
+        CategoryClosure.descendant_id.in_(ids),
+        CategoryClosure.ancestor_id.notin_(ids),
+    ).delete(synchronize_session=False)
+
+    if new_parent_id is not None:
+        above = aliased(CategoryClosure)
+        below = aliased(CategoryClosure)
+        db.session.execute(insert(CategoryClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .select_from(above)
+            .join(below, true())
+            .where(above.descendant_id == new_parent_id, below.ancestor_id == category.id),
+        ))
+    category.parent_id = new_parent_id
+
+
+def detach_node(category: Category):
+    """Remove closure rows of a leaf category before it is deleted."""
+    CategoryClosure.query.filter(
+        CategoryClosure.descendant_id == category.id,
+    ).delete(synchronize_session=False)
+
+
+def rebuild_closure(batch_size: int = 5000) -> int:
+    """Recompute category_closure from categories.parent_id (backfill / repair)."""
+    parents = dict(db.session.query(Category.id, Category.parent_id))
+    children = defaultdict(list)
+    for category_id, parent_id in parents.items():
+        children[parent_id].append(category_id)
+
+    rows = []
+    stack = [(root, [root]) for root in children[None]]
+    while stack:
+        category_id, path = stack.pop()
+        rows.extend(
+            {"ancestor_id": ancestor_id, "descendant_id": category_id, "depth": len(path) - 1 - depth}
+            for depth, ancestor_id in enumerate(path)
+        )
+        stack.extend((child, path + [child]) for child in children[category_id])
+
+    CategoryClosure.query.delete(synchronize_session=False)
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(insert(CategoryClosure), rows[start:start + batch_size])
+    db.session.commit()
+    return len(rows)
+
+
+category_cli = AppGroup("categories", help="Category tree maintenance.")
+
+
+@category_cli.command("rebuild-closure")
+def rebuild_closure_command():
+    """Recompute category_closure from categories.parent_id."""
+    click.echo(f"stored {rebuild_closure()} closure rows")
+
+
+def register_category_tree(app):
+    app.cli.add_command(category_cli)
@@ -0,0 +1,149 @@
+"""
+Response compression negotiated via Accept-Encoding.
+
+gzip is always available; brotli (`brotli`) and zstd (`zstandard`) are used
+when the packages are installed. Bodies smaller than COMPRESSION_MIN_SIZE
+are sent as-is, and streamed responses are compressed chunk by chunk with a
+sync flush so each chunk still reaches the client as soon as it is produced.
+"""
+import zlib
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript",
+}
+
+# 응답마다 압축하는 기본 레벨 (속도 우선) / 시작 시 한 번 압축하는 정적 본문용 레벨
+DYNAMIC_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+STATIC_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _gzip_stream(level: int):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _br(data: bytes, level: int) -> bytes:
+    return brotli.compress(data, quality=level)
+
+
+def _br_stream(level: int):
+    compressor = brotli.Compressor(quality=level)
+    return lambda chunk: compressor.process(chunk) + compressor.flush(), compressor.finish
+
+
+def _zstd(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_stream(level: int):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# encoding -> (한 번에 압축, 스트림 압축기 생성). 앞쪽일수록 서버 선호도가 높다.
+CODECS = {}
+if brotli is not None:
+    CODECS["br"] = (_br, _br_stream)
+if zstandard is not None:
+    CODECS["zstd"] = (_zstd, _zstd_stream)
+CODECS["gzip"] = (_gzip, _gzip_stream)
+
+
+def negotiate_encoding(accept_encoding: str | None = None, encodings=None) -> str | None:
+    """
+    Best encoding for an Accept-Encoding value (client q-values first, then
+    server preference). Defaults to the current Flask request's header.
+    """
+    if accept_encoding is None:
+        accept_encoding = request.headers.get("Accept-Encoding", "")
+    return parse_accept_header(accept_encoding).best_match(list(encodings if encodings is not None else CODECS))
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    codec, _ = CODECS[encoding]
+    return codec(data, DYNAMIC_LEVELS[encoding] if level is None else level)
+
+
+def compress_body(data: bytes, accept_encoding: str | None, min_size: int) -> tuple[bytes, str | None]:
+    """(body, Content-Encoding or None): small bodies and bodies that do not shrink are left as-is."""
+    if len(data) < min_size:
+        return data, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return data, None
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return data, None
+    return compressed, encoding
+
+
+def _compress_stream(chunks, encoding: str):
+    _, stream = CODECS[encoding]
+    process, finish = stream(DYNAMIC_LEVELS[encoding])
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if chunk:
+            yield process(chunk)
+    yield finish()
+
+
+def _weaken_etag(response):
+    # 인코딩마다 바이트가 달라지므로 강한 ETag 는 약한 ETag 로 바꾼다.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def register_compression(app):
+    # 다른 after_request 훅(헤더 추가, 로깅)이 끝난 뒤 마지막에 실행되도록 앞쪽에서 등록한다.
+    @app.after_request
+    def _compress_response(response):
+        if not app.config.get("COMPRESSION_ENABLED", True):
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES or "Content-Encoding" in response.headers:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206, 304) or request.method == "HEAD":
+            return response
+        if response.direct_passthrough:
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if response.is_streamed:
+            # 내보내기 등 스트리밍 응답: 청크 단위 압축, 길이는 미리 알 수 없음
+            encoding = negotiate_encoding()
+            if encoding is None:
+                return response
+            response.response = _compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            body, encoding = compress_body(response.get_data(), None, int(app.config.get("COMPRESSION_MIN_SIZE", 1024)))
+            if encoding is None:
+                return response
+            response.set_data(body)
+
+        response.headers["Content-Encoding"] = encoding
+        _weaken_etag(response)
+        return response
@@ -13,12 +13,104 @@ class Config:
     JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-key")
     JWT_ACCESS_EXPIRES_MIN = int(os.getenv("JWT_ACCESS_EXPIRES_MIN", "30"))
     JWT_REFRESH_EXPIRES_DAYS = int(os.getenv("JWT_REFRESH_EXPIRES_DAYS", "7"))
+    # HS256(공유 시크릿) | RS256 | EdDSA (비대칭: JWT_KEYS_DIR 의 <kid>.pem 사용)
+    JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", os.path.join(BASE_DIR, "keys"))
+    JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID", "")
+    # HS256 에서 RS256/EdDSA 로 전환하는 동안 기존 HS256 토큰을 검증만 허용
+    JWT_HS256_VERIFY = os.getenv("JWT_HS256_VERIFY", "false").lower() == "true"
+    JWKS_MAX_AGE_SECONDS = int(os.getenv("JWKS_MAX_AGE_SECONDS", "300"))
+    # Refresh 토큰 저장소 / 폐기 캐시
+    TOKEN_REVOCATION_BLOOM_CAPACITY = int(os.getenv("TOKEN_REVOCATION_BLOOM_CAPACITY", "100000"))
+    TOKEN_REVOCATION_LRU_SIZE = int(os.getenv("TOKEN_REVOCATION_LRU_SIZE", "10000"))
+    TOKEN_REVOCATION_SYNC_SECONDS = float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "5"))
+    # 커밋 지연/시계 오차 여유: 동기화마다 (주기 + 여유) 만큼 이전부터 다시 읽는다
+    TOKEN_REVOCATION_SYNC_MARGIN_SECONDS = float(os.getenv("TOKEN_REVOCATION_SYNC_MARGIN_SECONDS", "60"))
+    TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv("TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+    TOKEN_PURGE_BATCH_SIZE = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", "1000"))
     SWAGGER_UI_URL = "/docs"
     SWAGGER_SPEC_URL = "/swagger.json"
     SWAGGER_SPEC_PATH = os.path.join(BASE_DIR, "docs", "swagger.json")
+
+    # 응답 압축 (Accept-Encoding: br/zstd 는 패키지가 설치된 경우만), 이 크기(바이트) 미만은 압축하지 않음
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # 비밀번호 해싱 (bcrypt cost, 전용 프로세스 풀)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+    # 로그인 스로틀 (계정/IP 별 실패 카운터 + 지수 백오프)
+    LOGIN_THROTTLE_ENABLED = os.getenv("LOGIN_THROTTLE_ENABLED", "true").lower() == "true"
+    LOGIN_THROTTLE_BACKEND = os.getenv("LOGIN_THROTTLE_BACKEND", "memory")  # memory | database
+    LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS = int(os.getenv("LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS", "5"))
+    LOGIN_THROTTLE_IP_FREE_ATTEMPTS = int(os.getenv("LOGIN_THROTTLE_IP_FREE_ATTEMPTS", "20"))
+    LOGIN_THROTTLE_BASE_DELAY_SECONDS = float(os.getenv("LOGIN_THROTTLE_BASE_DELAY_SECONDS", "1"))
+    LOGIN_THROTTLE_MAX_DELAY_SECONDS = float(os.getenv("LOGIN_THROTTLE_MAX_DELAY_SECONDS", "900"))
+    LOGIN_THROTTLE_RESET_SECONDS = int(os.getenv("LOGIN_THROTTLE_RESET_SECONDS", "3600"))
+    LOGIN_THROTTLE_MAX_ENTRIES = int(os.getenv("LOGIN_THROTTLE_MAX_ENTRIES", "100000"))
     RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "200"))
     RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
 
+    # SQL 프로파일러 / 슬로우 쿼리 로그
+    QUERY_PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    QUERY_PROFILER_TOP_N = int(os.getenv("QUERY_PROFILER_TOP_N", "3"))
+
+    # Prometheus 메트릭 (/metrics)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_LATENCY_BUCKETS = os.getenv("METRICS_LATENCY_BUCKETS", "")
+    # prefork(gunicorn 등) 환경에서 워커 간 집계를 위한 공유 디렉터리
+    METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "5"))
+
+    # 읽기 복제본 (콤마 구분 URI, 비우면 모든 쿼리가 primary 로)
+    SQLALCHEMY_REPLICA_URIS = os.getenv("SQLALCHEMY_REPLICA_URIS", "")
+    DB_REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("DB_REPLICA_HEALTH_CHECK_SECONDS", "10"))
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+    # 함께 구매한 도서 추천 (오프라인 배치 + 조회 캐시)
+    RECOMMENDATIONS_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+    RECOMMENDATIONS_CHUNK_ORDERS = int(os.getenv("RECOMMENDATIONS_CHUNK_ORDERS", "10000"))
+    RECOMMENDATIONS_MAX_BASKET = int(os.getenv("RECOMMENDATIONS_MAX_BASKET", "50"))
+    RECOMMENDATIONS_MIN_SUPPORT = int(os.getenv("RECOMMENDATIONS_MIN_SUPPORT", "2"))
+    RECOMMENDATIONS_MAX_PAIRS = int(os.getenv("RECOMMENDATIONS_MAX_PAIRS", "20000000"))
+    RECOMMENDATIONS_CACHE_SIZE = int(os.getenv("RECOMMENDATIONS_CACHE_SIZE", "10000"))
+    RECOMMENDATIONS_CACHE_TTL_SECONDS = float(os.getenv("RECOMMENDATIONS_CACHE_TTL_SECONDS", "300"))
+
+    # GET /books?facets=true (가격대 경계값, 카테고리/저자 facet 최대 항목 수)
+    BOOK_FACET_PRICE_BANDS = os.getenv("BOOK_FACET_PRICE_BANDS", "10000,20000,30000,50000")
+    BOOK_FACET_LIMIT = int(os.getenv("BOOK_FACET_LIMIT", "20"))
+
+    # GET /books 필터+정렬을 메모리 컬럼 인덱스로 처리 (키워드/패싯은 SQL), 외부 변경 반영 주기(초)
+    CATALOG_INDEX_ENABLED = os.getenv("CATALOG_INDEX_ENABLED", "false").lower() == "true"
+    CATALOG_INDEX_REFRESH_SECONDS = float(os.getenv("CATALOG_INDEX_REFRESH_SECONDS", "5"))
+
+    # GET /books/suggest 기본 결과 수, 판매량/외부 변경 반영 주기(초)
+    SUGGEST_LIMIT = int(os.getenv("SUGGEST_LIMIT", "10"))
+    SUGGEST_REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", "30"))
+
+    # 트랜잭션 아웃박스 워커 (flask outbox worker)
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+    OUTBOX_WORKER_CONCURRENCY = int(os.getenv("OUTBOX_WORKER_CONCURRENCY", "4"))
+    OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "60"))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+    OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "2"))
+    OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "300"))
+
+    # soft delete 행 보관/정리 (flask maintenance archive-deleted, 주기 0 이면 스케줄러 비활성)
+    SOFT_DELETE_RETENTION_DAYS = int(os.getenv("SOFT_DELETE_RETENTION_DAYS", "30"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv("ARCHIVE_BATCH_PAUSE_SECONDS", "0.05"))
+    ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "0"))
+
+    # ASGI 모드 비동기 엔진 (비우면 동기 URI 의 드라이버만 교체)
+    ASYNC_DATABASE_URI = os.getenv("ASYNC_DATABASE_URI", "")
+    ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "20"))
+    ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20"))
+
 
 class DevConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.getenv(
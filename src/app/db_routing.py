@@ -0,0 +1,162 @@
+import itertools
+import os
+import threading
+from functools import wraps
+from time import monotonic
+
+from flask import current_app, g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class ReplicaSet:
+    """
+    Read replicas picked round-robin. A replica is skipped after a failed
+    health check or a connection-level error for `retry_seconds`; when every
+    replica is down, reads fall back to the primary.
+    """
+
+    def __init__(self, engines: list, health_check_seconds: float = 10.0, retry_seconds: float = 30.0):
+        self.engines = engines
+        self.health_check_seconds = health_check_seconds
+        self.retry_seconds = retry_seconds
+
+        self._counter = itertools.count()
+        self._down_until = [0.0] * len(engines)
+        self._checked_at = [float("-inf")] * len(engines)
+
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, exception_context):
+        if exception_context.is_disconnect or exception_context.connection is None:
+            self.mark_down(exception_context.engine)
+
+    def mark_down(self, engine):
+        if engine in self.engines:
+            self._down_until[self.engines.index(engine)] = monotonic() + self.retry_seconds
+
+    def _healthy(self, index: int, now: float) -> bool:
+        if self._down_until[index] > now:
+            return False
+        if now - self._checked_at[index] < self.health_check_seconds:
+            return True
+
+        self._checked_at[index] = now
+        try:
+            with self.engines[index].connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+        except SQLAlchemyError:
+            self._down_until[index] = now + self.retry_seconds
+            return False
+        return True
+
+    def choose(self):
+        if not self.engines:
+            return None
+        start = next(self._counter)
+        now = monotonic()
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._healthy(index, now):
+                return self.engines[index]
+        return None
+
+    def healthy_flags(self):
+        now = monotonic()
+        return [self._down_until[i] <= now for i in range(len(self.engines))]
+
+
+def _replica_url(app, uri: str):
+    url = make_url(uri)
+    # Flask-SQLAlchemy 와 동일하게 상대 경로 SQLite 는 instance 폴더 기준
+    if url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") \
+            and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(app.instance_path, url.database))
+    return url
+
+
+def build_replica_set(app) -> ReplicaSet:
+    from .query_profiler import instrument_engine
+
+    uris = [u.strip() for u in str(app.config.get("SQLALCHEMY_REPLICA_URIS") or "").split(",") if u.strip()]
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+
+    engines = []
+    for uri in uris:
+        engine = create_engine(_replica_url(app, uri), **options)
+        if app.config.get("QUERY_PROFILER_ENABLED", True):
+            instrument_engine(app, engine)
+        engines.append(engine)
+
+    return ReplicaSet(
+        engines,
+        health_check_seconds=float(app.config.get("DB_REPLICA_HEALTH_CHECK_SECONDS", 10)),
+        retry_seconds=float(app.config.get("DB_REPLICA_RETRY_SECONDS", 30)),
+    )
+
+
+_build_lock = threading.Lock()
+
+
+def get_replica_set(app=None) -> ReplicaSet:
+    app = app or current_app._get_current_object()
+    replicas = app.extensions.get("db_replicas")
+    if replicas is None:
+        with _build_lock:
+            replicas = app.extensions.get("db_replicas")
+            if replicas is None:
+                replicas = app.extensions["db_replicas"] = build_replica_set(app)
+    return replicas
+
+
+def replica_read(view):
+    """읽기 전용 라우트 표시: 이 요청의 조회 쿼리는 읽기 복제본으로 보낸다."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g._db_read_replica = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads of `@replica_read` routes to a replica.
+
+    Anything that writes stays on the primary, and once the session has
+    flushed or executed DML in the current request every later read goes to
+    the primary too, so read-after-write is always consistent.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = self._replica_bind(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_bind(self, clause):
+        if self._flushing or self.info.get("db_wrote"):
+            return None
+        if clause is not None and getattr(clause, "is_dml", False):
+            self.info["db_wrote"] = True
+            return None
+        if not has_request_context() or not g.get("_db_read_replica"):
+            return None
+
+        engine = self.info.get("db_replica")
+        if engine is None:
+            engine = get_replica_set().choose()
+            if engine is None:
+                return None
+            # 한 요청 안에서는 같은 복제본을 사용해 일관된 스냅샷을 본다.
+            self.info["db_replica"] = engine
+        return engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["db_wrote"] = True
@@ -0,0 +1,126 @@
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from .error_codes import ErrorCodes
+from .error_handlers import ApiError
+from .extensions import db
+
+MYSQL_FK_VIOLATION = 1452  # Cannot add or update a child row: a foreign key constraint fails
+
+
+def enable_sqlite_foreign_keys(engine):
+    """SQLite only enforces FOREIGN KEY constraints when each connection turns them on."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys_on(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def is_foreign_key_violation(err: IntegrityError) -> bool:
+    orig = err.orig
+    if getattr(orig, "args", None) and orig.args[0] == MYSQL_FK_VIOLATION:
+        return True
+    return "FOREIGN KEY constraint failed" in str(orig)
+
+
+def commit_or_404(message: str, code: str = ErrorCodes.RESOURCE_NOT_FOUND):
+    """
+    Commit, turning a foreign key violation into a 404 ApiError: the referenced
+    row is checked by the constraint instead of a SELECT before the write.
+    """
+    try:
+        db.session.commit()
+    except IntegrityError as err:
+        db.session.rollback()
+        if not is_foreign_key_violation(err):
+            raise
+        raise ApiError(status_code=404, code=code, message=message)
+
+
+def _upsert_dialect(name: str = "upsert") -> str:
+    dialect = db.engine.dialect.name
+    if dialect not in ("mysql", "sqlite"):
+        raise RuntimeError(f"{name} does not support dialect '{dialect}'.")
+    return dialect
+
+
+def _on_conflict_increment(dialect, table, insert_values, conflict_columns, increment_columns, value_columns):
+    """`insert_values(stmt)` attaches VALUES / FROM SELECT to the dialect's insert()."""
+    if dialect == "mysql":
+        stmt = insert_values(mysql.insert(table))
+        update = {name: table.c[name] + stmt.inserted[name] for name in increment_columns}
+        update.update({name: stmt.inserted[name] for name in value_columns})
+        return stmt.on_duplicate_key_update(update)
+    stmt = insert_values(sqlite.insert(table))
+    update = {name: table.c[name] + stmt.excluded[name] for name in increment_columns}
+    update.update({name: stmt.excluded[name] for name in value_columns})
+    return stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=update)
+
+
+def upsert_increment_many(model, rows: list[dict], key_columns, increment_columns, value_columns=(),
+                          batch_size: int = 1000):
+    """
+    Multi-row version of `upsert_increment`: INSERT ... VALUES (...), (...)
+    statements of `batch_size` rows that add `increment_columns` on conflict
+    with `key_columns`.
+
+    SQLite: INSERT ... ON CONFLICT (...) DO UPDATE
+    MySQL:  INSERT ... ON DUPLICATE KEY UPDATE
+    """
+    table = model.__table__
+    dialect = _upsert_dialect("upsert_increment")
+
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        db.session.execute(_on_conflict_increment(
+            dialect, table, lambda stmt: stmt.values(chunk), key_columns, increment_columns, value_columns,
+        ))
+
+
+def upsert_increment_from_select(model, columns, select_stmt, conflict_columns, increment_columns,
+                                 value_columns=()):
+    """
+    INSERT INTO model (columns) SELECT ... with the same conflict handling as
+    `upsert_increment_many`; `conflict_columns` must match a unique index.
+    Returns the rowcount (0 when the SELECT produced no row). The SELECT needs
+    a WHERE clause: SQLite would otherwise parse `ON CONFLICT` as a join.
+    """
+    dialect = _upsert_dialect("upsert_increment")
+    stmt = _on_conflict_increment(
+        dialect, model.__table__, lambda insert: insert.from_select(list(columns), select_stmt),
+        conflict_columns, increment_columns, value_columns,
+    )
+    return db.session.execute(stmt).rowcount
+
+
+def insert_ignore_from_select(model, columns, select_stmt):
+    """
+    INSERT INTO model (columns) SELECT ..., skipping rows that hit a unique
+    key. Returns the result: rowcount 0 means nothing was inserted (duplicate
+    or empty SELECT), otherwise `lastrowid` is the new row's id.
+
+    SQLite: INSERT ... ON CONFLICT DO NOTHING
+    MySQL:  INSERT IGNORE (ON DUPLICATE KEY UPDATE reports 1 affected row for
+            an unchanged duplicate under CLIENT_FOUND_ROWS, so it cannot tell
+            the two apart; the SELECT already guarantees the FK targets exist)
+    """
+    table = model.__table__
+    if _upsert_dialect("insert_ignore") == "mysql":
+        stmt = mysql.insert(table).prefix_with("IGNORE").from_select(list(columns), select_stmt)
+    else:
+        stmt = sqlite.insert(table).from_select(list(columns), select_stmt).on_conflict_do_nothing()
+    return db.session.execute(stmt)
+
+
+def upsert_increment(model, keys: dict, increments: dict, values: dict | None = None):
+    """
+    Atomically add `increments` to the row identified by `keys`, inserting it
+    when missing. `values` are written as-is on both insert and update.
+    """
+    values = values or {}
+    upsert_increment_many(model, [{**keys, **values, **increments}], keys, increments, values)
@@ -29,3 +29,6 @@ class ErrorCodes:
     INTERNAL_SERVER_ERROR = "INTERNAL_SERVER_ERROR"
     DATABASE_ERROR = "DATABASE_ERROR"
     UNKNOWN_ERROR = "UNKNOWN_ERROR"
+
+    # 503 Service Unavailable
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
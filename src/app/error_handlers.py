@@ -19,15 +19,19 @@ class ApiError(Exception):
         self.details = details or {}
 
 
-def _make_error_response(status_code: int, code: str, message: str, details: dict | None = None):
-    return jsonify({
+def error_payload(path: str, status_code: int, code: str, message: str, details: dict | None = None) -> dict:
+    return {
         "timestamp": datetime.utcnow().isoformat() + "Z",
-        "path": request.path,
+        "path": path,
         "status": status_code,
         "code": code,
         "message": message,
         "details": details or {},
-    }), status_code
+    }
+
+
+def _make_error_response(status_code: int, code: str, message: str, details: dict | None = None):
+    return jsonify(error_payload(request.path, status_code, code, message, details)), status_code
 
 
 def register_error_handlers(app):
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import Integer, String, case, func, literal, null, select, union_all
+
+from .models import Author, Book, Category
+
+FACET_NAMES = ("category", "author", "price", "status")
+
+
+def wants_facets(args) -> bool:
+    return str(args.get("facets", "")).lower() in ("1", "true", "yes")
+
+
+def price_bands(config=None) -> list[Decimal]:
+    """BOOK_FACET_PRICE_BANDS 경계값 (오름차순). 구간은 [이전 경계, 경계) 로 나뉜다."""
+    config = config if config is not None else current_app.config
+    raw = str(config.get("BOOK_FACET_PRICE_BANDS") or "")
+    return sorted(Decimal(value.strip()) for value in raw.split(",") if value.strip())
+
+
+def book_facets_query(filters: list, bands: list[Decimal]):
+    """
+    Every facet for the books matching `filters` in one statement: the
+    filtered rows are read once into a CTE and grouped per facet, with the
+    groups returned as (facet, id, label, count) rows via UNION ALL.
+    """
+    matched = (
+        select(Book.category_id, Book.author_id, Book.price, Book.status)
+        .where(*filters)
+        .cte("matched_books")
+    )
+    band = case(
+        *[(matched.c.price < edge, index) for index, edge in enumerate(bands)],
+        else_=len(bands),
+    ) if bands else literal(0)
+
+    by_category = (
+        select(literal("category"), Category.id, Category.name, func.count())
+        .select_from(matched)
+        .join(Category, Category.id == matched.c.category_id)
+        .group_by(Category.id, Category.name)
+    )
+    by_author = (
+        select(literal("author"), Author.id, Author.name, func.count())
+        .select_from(matched)
+        .join(Author, Author.id == matched.c.author_id)
+        .group_by(Author.id, Author.name)
+    )
+    by_price = (
+        select(literal("price"), band, null().cast(String), func.count())
+        .select_from(matched)
+        .group_by(band)
+    )
+    by_status = (
+        select(literal("status"), null().cast(Integer), matched.c.status, func.count())
+        .group_by(matched.c.status)
+    )
+    return union_all(by_category, by_author, by_price, by_status)
+
+
+def build_facets(rows, bands: list[Decimal], limit: int) -> dict:
+    grouped = {name: [] for name in FACET_NAMES}
+    for facet, key, label, count in rows:
+        grouped[facet].append((key, label, count))
+
+    def top(entries):
+        return [
+            {"id": key, "name": label, "count": count}
+            for key, label, count in sorted(entries, key=lambda e: (-e[2], e[0]))[:limit]
+        ]
+
+    band_counts = {int(key): count for key, _, count in grouped["price"]}
+    edges = [None, *bands, None]
+    return {
+        "category": top(grouped["category"]),
+        "author": top(grouped["author"]),
+        "price": [
+            {
+                "min": str(edges[index]) if edges[index] is not None else None,
+                "max": str(edges[index + 1]) if edges[index + 1] is not None else None,
+                "count": band_counts.get(index, 0),
+            }
+            for index in range(len(bands) + 1)
+        ],
+        "status": [
+            {"value": label, "count": count}
+            for _, label, count in sorted(grouped["status"], key=lambda e: (-e[2], e[1]))
+        ],
+    }
@@ -0,0 +1,152 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import jwt
+from flask import current_app
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+HMAC_KID = "hs256"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    # HS256: 공유 시크릿 문자열, RS256/EdDSA: cryptography 키 객체
+    signing_key: object | None
+    verification_key: object
+
+
+class KeyRing:
+    """
+    JWT keys indexed by `kid`, loaded once per app and cached.
+
+    Asymmetric mode reads every `*.pem` in JWT_KEYS_DIR: private keys can sign
+    and verify, `*.pub.pem` files only verify. Each key's algorithm follows
+    its type (RSA → RS256, Ed25519 → EdDSA), so RSA and Ed25519 keys can sit
+    side by side while switching algorithms. Rotation is done by overlapping
+    windows: publish the next key (it shows up in the JWKS), switch
+    JWT_ACTIVE_KID to it, and delete the old key once every token it signed
+    has expired.
+    """
+
+    def __init__(self, keys: dict[str, SigningKey], active_kid: str, jwks_max_age: int = 300):
+        if active_kid not in keys or keys[active_kid].signing_key is None:
+            raise RuntimeError(f"JWT active key '{active_kid}' has no private key loaded.")
+        self.keys = keys
+        self.active = keys[active_kid]
+        self.jwks_max_age = jwks_max_age
+        self.jwks = self._build_jwks()
+        self.jwks_body = json.dumps(self.jwks, separators=(",", ":"), sort_keys=True)
+        self.jwks_etag = hashlib.sha256(self.jwks_body.encode("utf-8")).hexdigest()[:32]
+
+    def _build_jwks(self) -> dict:
+        entries = []
+        for key in self.keys.values():
+            if key.algorithm == "RS256":
+                jwk = jwt.algorithms.RSAAlgorithm.to_jwk(key.verification_key, as_dict=True)
+            elif key.algorithm == "EdDSA":
+                jwk = jwt.algorithms.OKPAlgorithm.to_jwk(key.verification_key, as_dict=True)
+            else:
+                # 대칭키는 절대 공개하지 않는다.
+                continue
+            jwk.update({"kid": key.kid, "alg": key.algorithm, "use": "sig"})
+            entries.append(jwk)
+        return {"keys": sorted(entries, key=lambda item: item["kid"])}
+
+    def verification_key(self, kid: str | None) -> SigningKey:
+        if kid is None:
+            # kid 도입 이전에 발급된 HS256 토큰 호환
+            if HMAC_KID in self.keys:
+                return self.keys[HMAC_KID]
+            raise jwt.InvalidTokenError("토큰에 kid 헤더가 없습니다.")
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError("알 수 없는 서명 키입니다.")
+        return key
+
+
+def _key_algorithm(key, path: Path) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise RuntimeError(f"Unsupported JWT key type in '{path}': {type(key).__name__}")
+
+
+def _load_pem_keys(keys_dir: Path) -> dict[str, SigningKey]:
+    from cryptography.hazmat.primitives import serialization
+
+    keys: dict[str, SigningKey] = {}
+    for path in sorted(keys_dir.glob("*.pem")):
+        data = path.read_bytes()
+        if path.name.endswith(".pub.pem"):
+            kid = path.name[: -len(".pub.pem")]
+            if kid in keys:
+                continue
+            public_key = serialization.load_pem_public_key(data)
+            keys[kid] = SigningKey(kid, _key_algorithm(public_key, path), None, public_key)
+        else:
+            kid = path.stem
+            private_key = serialization.load_pem_private_key(data, password=None)
+            keys[kid] = SigningKey(kid, _key_algorithm(private_key, path), private_key, private_key.public_key())
+    return keys
+
+
+def build_keyring(config) -> KeyRing:
+    algorithm = config.get("JWT_ALGORITHM", "HS256")
+    max_age = int(config.get("JWKS_MAX_AGE_SECONDS", 300))
+    hmac_key = SigningKey(HMAC_KID, "HS256", config.get("JWT_SECRET"), config.get("JWT_SECRET"))
+
+    if algorithm == "HS256":
+        return KeyRing({HMAC_KID: hmac_key}, HMAC_KID, max_age)
+
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise RuntimeError(f"Unsupported JWT_ALGORITHM: {algorithm}")
+
+    keys_dir = Path(config.get("JWT_KEYS_DIR") or "")
+    if not keys_dir.is_dir():
+        raise RuntimeError(f"JWT_KEYS_DIR '{keys_dir}' does not exist.")
+    keys = _load_pem_keys(keys_dir)
+    # JWT_ALGORITHM 은 서명 키 선택에만 쓴다: 다른 종류의 키는 검증 전용으로 남는다.
+    signable = sorted(
+        kid for kid, key in keys.items() if key.signing_key is not None and key.algorithm == algorithm
+    )
+    if not signable and not config.get("JWT_ACTIVE_KID"):
+        raise RuntimeError(f"No {algorithm} private key found in JWT_KEYS_DIR '{keys_dir}'.")
+
+    if config.get("JWT_HS256_VERIFY", False) and hmac_key.verification_key:
+        # HS256 → 비대칭 전환 기간: 기존 토큰이 만료될 때까지 검증만 허용 (서명에는 쓰지 않음)
+        keys[HMAC_KID] = SigningKey(HMAC_KID, "HS256", None, hmac_key.verification_key)
+
+    active_kid = config.get("JWT_ACTIVE_KID") or signable[-1]
+    return KeyRing(keys, active_kid, max_age)
+
+
+def get_keyring() -> KeyRing:
+    keyring = current_app.extensions.get("jwt_keyring")
+    if keyring is None:
+        keyring = current_app.extensions["jwt_keyring"] = build_keyring(current_app.config)
+    return keyring
+
+
+def generate_private_key_pem(algorithm: str) -> bytes:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
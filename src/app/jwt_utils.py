@@ -1,13 +1,26 @@
 from datetime import datetime, timedelta
 from typing import Optional, Literal
+from uuid import uuid4
 
 import jwt
 from flask import current_app
 
+from .jwt_keys import get_keyring
+
 TokenType = Literal["access", "refresh"]
 
 
-def create_token(user_id: int, role: str, token_type: TokenType) -> str:
+def new_jti() -> str:
+    return uuid4().hex
+
+
+def create_token(
+    user_id: int,
+    role: str,
+    token_type: TokenType,
+    jti: str | None = None,
+    family_id: str | None = None,
+) -> str:
     now = datetime.utcnow()
 
     if token_type == "access":
@@ -23,17 +36,23 @@ def create_token(user_id: int, role: str, token_type: TokenType) -> str:
         "sub": str(user_id),
         "role": role,
         "type": token_type,
+        "jti": jti or new_jti(),
         "iat": now,
         "exp": exp,
     }
+    # 로그인 세션(토큰 패밀리) 식별자: 패밀리 단위로 폐기 여부를 검사한다.
+    if family_id:
+        payload["fam"] = family_id
 
-    secret = current_app.config["JWT_SECRET"]
-    return jwt.encode(payload, secret, algorithm="HS256")
+    key = get_keyring().active
+    return jwt.encode(payload, key.signing_key, algorithm=key.algorithm, headers={"kid": key.kid})
 
 
 def decode_token(token: str, expected_type: Optional[TokenType] = None) -> dict:
-    secret = current_app.config["JWT_SECRET"]
-    payload = jwt.decode(token, secret, algorithms=["HS256"])
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = get_keyring().verification_key(kid)
+    # 키에 묶인 알고리즘만 허용 (alg 혼동 공격 방지)
+    payload = jwt.decode(token, key.verification_key, algorithms=[key.algorithm])
 
     if expected_type and payload.get("type") != expected_type:
         raise jwt.InvalidTokenError("잘못된 토큰 타입입니다.")
@@ -0,0 +1,209 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from time import time
+
+from flask import current_app
+from sqlalchemy import or_, select
+
+from .db_utils import upsert_increment
+from .extensions import db
+from .error_handlers import ApiError
+from .error_codes import ErrorCodes
+from .metrics import get_metrics
+from .models import LoginThrottle
+
+
+def _to_epoch(value: datetime) -> float:
+    # DB 에는 다른 컬럼과 마찬가지로 naive UTC 로 저장
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+
+class MemoryThrottleStore:
+    """
+    Process-local failure counters kept in an LRU bounded by `max_entries`,
+    so a spray of random emails/IPs cannot grow memory without limit.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """-> (failures, locked_until, last_failure_at) or None"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def add_failure(self, key: str, now: float, reset_seconds: int, backoff) -> int:
+        """
+        Count one failure and apply `backoff(failures)` (lock seconds, 0 = none)
+        in one step under the lock; returns the new failure count.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            failures, locked_until = 0, 0.0
+            if entry and now - entry[2] < reset_seconds:
+                failures, locked_until = entry[0], entry[1]
+            failures += 1
+            delay = backoff(failures)
+            if delay:
+                locked_until = max(locked_until, now + delay)
+            self._entries[key] = (failures, locked_until, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return failures
+
+    def reset(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DatabaseThrottleStore:
+    """Counters in the `login_throttles` table, shared by every worker/instance."""
+
+    PURGE_EVERY = 500
+
+    def __init__(self, retention_seconds: int):
+        self.retention_seconds = retention_seconds
+        self._writes = 0
+
+    def get(self, key: str):
+        row = db.session.get(LoginThrottle, key)
+        if row is None:
+            return None
+        locked_until = _to_epoch(row.locked_until) if row.locked_until else 0.0
+        return row.failures, locked_until, _to_epoch(row.last_failure_at)
+
+    def add_failure(self, key: str, now: float, reset_seconds: int, backoff) -> int:
+        """
+        Atomic across workers: the counter is bumped by one upsert (no
+        read-modify-write), and the lock is derived from the count that
+        statement produced. The row stays write-locked until the commit, so
+        concurrent failures on one key serialize instead of overwriting.
+        """
+        now_dt = _from_epoch(now)
+        # 초기화 기간이 지난 카운터는 먼저 지워 upsert 가 1부터 다시 세게 한다.
+        LoginThrottle.query.filter(
+            LoginThrottle.key == key,
+            LoginThrottle.last_failure_at <= now_dt - timedelta(seconds=reset_seconds),
+        ).delete(synchronize_session=False)
+        upsert_increment(LoginThrottle, {"key": key}, {"failures": 1}, {"last_failure_at": now_dt})
+        failures = db.session.execute(select(LoginThrottle.failures).where(LoginThrottle.key == key)).scalar_one()
+
+        delay = backoff(failures)
+        if delay:
+            locked_until = _from_epoch(now + delay)
+            # 동시에 기록된 더 긴 잠금을 줄이지 않는다
+            LoginThrottle.query.filter(
+                LoginThrottle.key == key,
+                or_(LoginThrottle.locked_until.is_(None), LoginThrottle.locked_until < locked_until),
+            ).update({"locked_until": locked_until}, synchronize_session=False)
+        db.session.commit()
+
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+            LoginThrottle.query.filter(LoginThrottle.last_failure_at < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+        return failures
+
+    def reset(self, key: str):
+        if LoginThrottle.query.filter(LoginThrottle.key == key).delete(synchronize_session=False):
+            db.session.commit()
+
+
+class LoginThrottler:
+    """
+    Per-account and per-IP failure counters with exponential backoff.
+
+    After `free_attempts` failures a key is locked for
+    base_delay * 2 ** (failures - free_attempts) seconds (capped), and
+    counters are forgotten `reset_seconds` after the last failure.
+    `check()` only reads counters, so locked callers are rejected before any
+    user lookup or bcrypt work.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def account_key(email: str) -> str:
+        return "acct:" + email.strip().lower()
+
+    @staticmethod
+    def ip_key(ip: str | None) -> str:
+        return "ip:" + (ip or "anonymous")
+
+    def _policy(self, key: str) -> tuple[int, float, float, int]:
+        config = current_app.config
+        free = config.get("LOGIN_THROTTLE_IP_FREE_ATTEMPTS", 20) if key.startswith("ip:") \
+            else config.get("LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS", 5)
+        return (
+            int(free),
+            float(config.get("LOGIN_THROTTLE_BASE_DELAY_SECONDS", 1)),
+            float(config.get("LOGIN_THROTTLE_MAX_DELAY_SECONDS", 900)),
+            int(config.get("LOGIN_THROTTLE_RESET_SECONDS", 3600)),
+        )
+
+    def retry_after(self, email: str, ip: str | None, now: float | None = None) -> float:
+        now = time() if now is None else now
+        wait = 0.0
+        for key in (self.account_key(email), self.ip_key(ip)):
+            entry = self.store.get(key)
+            if entry and entry[1] > now:
+                wait = max(wait, entry[1] - now)
+        return wait
+
+    def check(self, email: str, ip: str | None):
+        wait = self.retry_after(email, ip)
+        if wait <= 0:
+            return
+
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.inc("login_throttle_rejections_total")
+        raise ApiError(
+            status_code=429,
+            code=ErrorCodes.TOO_MANY_REQUESTS,
+            message="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            details={"retry_after_seconds": int(wait) + 1},
+        )
+
+    def record_failure(self, email: str, ip: str | None, now: float | None = None):
+        now = time() if now is None else now
+        for key in (self.account_key(email), self.ip_key(ip)):
+            free, base_delay, max_delay, reset_seconds = self._policy(key)
+
+            def backoff(failures: int) -> float:
+                if failures <= free:
+                    return 0.0
+                return min(max_delay, base_delay * 2 ** (failures - free - 1))
+
+            self.store.add_failure(key, now, reset_seconds, backoff)
+
+    def record_success(self, email: str):
+        # IP 카운터는 유지: 유효 계정 하나로 IP 카운터를 초기화하지 못하게 한다.
+        self.store.reset(self.account_key(email))
+
+
+def get_login_throttle() -> LoginThrottler | None:
+    return current_app.extensions.get("login_throttle")
+
+
+def register_login_throttle(app):
+    if not app.config.get("LOGIN_THROTTLE_ENABLED", True):
+        return
+
+    backend = app.config.get("LOGIN_THROTTLE_BACKEND", "memory")
+    if backend == "database":
+        store = DatabaseThrottleStore(retention_seconds=int(app.config.get("LOGIN_THROTTLE_RESET_SECONDS", 3600)))
+    else:
+        store = MemoryThrottleStore(max_entries=int(app.config.get("LOGIN_THROTTLE_MAX_ENTRIES", 100_000)))
+
+    app.extensions["login_throttle"] = LoginThrottler(store)
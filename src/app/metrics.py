@@ -0,0 +1,323 @@
+import json
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from flask import current_app, g, request
+
+from .extensions import db
+from .query_profiler import get_query_stats
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    "http_requests_total": ("counter", "Total HTTP requests by endpoint, method and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency in seconds."),
+    "db_queries_total": ("counter", "SQL statements executed while serving requests."),
+    "rate_limit_rejections_total": ("counter", "Requests rejected by the rate limiter."),
+    "login_throttle_rejections_total": ("counter", "Login attempts rejected by the login throttle."),
+    "cache_requests_total": ("counter", "Cache lookups by cache name and result (hit/miss)."),
+    "db_pool_size": ("gauge", "Configured connection pool size."),
+    "db_pool_checked_out": ("gauge", "Connections currently checked out of the pool."),
+    "db_pool_checked_in": ("gauge", "Idle connections currently held by the pool."),
+    "db_pool_overflow": ("gauge", "Connections opened beyond the pool size."),
+    "db_replica_up": ("gauge", "1 if the read replica is currently selectable, 0 if marked down."),
+}
+
+
+def _merge_series(merged: dict, series: dict):
+    for key, value in series.items():
+        if key[0] == "c":
+            merged[key] = merged.get(key, 0) + value
+        else:
+            current = merged.get(key)
+            if current is None:
+                merged[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    current[i] += v
+
+
+class MetricsRegistry:
+    """
+    Counters and bucketed histograms with lock-free writes.
+
+    Each thread writes into its own shard (a plain dict), so the hot path is a
+    couple of dict operations without any lock. Shards are merged only when
+    /metrics is scraped. Shards of finished threads (the threaded dev server
+    uses one thread per request) are folded into a retired total, so memory
+    and scrape cost follow the number of live threads, not requests served.
+    With `multiproc_dir`, every process periodically dumps its merged
+    snapshot to `<dir>/metrics-<pid>.json` and the scrape sums all files,
+    which makes the numbers aggregatable across prefork workers.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS, multiproc_dir: str | None = None,
+                 flush_interval: float = 5.0):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        # (스레드 weakref, 샤드): 끝난 스레드의 샤드는 _retired 에 합친다
+        self._shards: list[tuple[weakref.ref, dict]] = []
+        self._retired: dict = {}
+        self._sweep_at = 64
+        self._shards_lock = threading.Lock()
+        self._gauge_collectors = []
+        self._last_flush = monotonic()
+
+        if self.multiproc_dir is not None:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---- write path -------------------------------------------------------
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+                if len(self._shards) >= self._sweep_at:
+                    self._retire_dead_shards()
+                    self._sweep_at = max(64, 2 * len(self._shards))
+            self._local.shard = shard
+        return shard
+
+    def _retire_dead_shards(self):
+        """Fold shards of finished threads into `_retired` (caller holds `_shards_lock`)."""
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+            else:
+                # 끝난 스레드는 더 이상 쓰지 않으므로 그대로 합쳐도 된다.
+                _merge_series(self._retired, shard)
+        self._shards = live
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1):
+        shard = self._shard()
+        key = ("c", name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name: str, labels: tuple, value: float):
+        shard = self._shard()
+        key = ("h", name, labels)
+        slots = shard.get(key)
+        if slots is None:
+            # 버킷별 카운트 + (+Inf) + 합계
+            slots = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def add_gauge_collector(self, collector):
+        """collector() -> iterable of (name, labels, value), evaluated at scrape time"""
+        self._gauge_collectors.append(collector)
+
+    # ---- read path --------------------------------------------------------
+    def _local_snapshot(self) -> dict:
+        merged: dict = {}
+        with self._shards_lock:
+            self._retire_dead_shards()
+            _merge_series(merged, self._retired)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            # dict.copy() is atomic under the GIL, so writers never block here.
+            _merge_series(merged, shard.copy())
+        return merged
+
+    def _snapshot_path(self, pid: int) -> Path:
+        return self.multiproc_dir / f"metrics-{pid}.json"
+
+    def flush(self):
+        """Write this process' snapshot into the shared directory (atomic replace)."""
+        self._last_flush = monotonic()
+        if self.multiproc_dir is None:
+            return
+        pid = os.getpid()
+        payload = {
+            "buckets": list(self.buckets),
+            "series": [[k[0], k[1], [list(p) for p in k[2]], v] for k, v in self._local_snapshot().items()],
+            "gauges": [[name, [list(p) for p in labels], value] for name, labels, value in self._collect_gauges()],
+        }
+        target = self._snapshot_path(pid)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def maybe_flush(self):
+        if self.multiproc_dir is not None and monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _collect_gauges(self) -> list:
+        gauges = []
+        for collector in self._gauge_collectors:
+            for name, labels, value in collector():
+                gauges.append((name, tuple(labels), value))
+        return gauges
+
+    def collect(self):
+        """Return (series, gauges) merged over threads and, if configured, processes."""
+        if self.multiproc_dir is None:
+            return self._local_snapshot(), self._collect_gauges()
+
+        self.flush()
+        series: dict = {}
+        gauges = []
+        for path in sorted(self.multiproc_dir.glob("metrics-*.json")):
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if tuple(payload.get("buckets", ())) != self.buckets:
+                continue
+            pid = path.stem.split("-", 1)[1]
+            for kind, name, labels, value in payload["series"]:
+                key = (kind, name, tuple(tuple(p) for p in labels))
+                if kind == "c":
+                    series[key] = series.get(key, 0) + value
+                elif key in series:
+                    series[key] = [a + b for a, b in zip(series[key], value)]
+                else:
+                    series[key] = value
+            # 게이지는 합산하지 않고 살아 있는 프로세스별 시계열로 노출
+            if not _pid_alive(int(pid)):
+                continue
+            for name, labels, value in payload.get("gauges", []):
+                gauges.append((name, tuple(tuple(p) for p in labels) + (("pid", pid),), value))
+        return series, gauges
+
+    def render(self) -> str:
+        series, gauges = self.collect()
+
+        grouped: dict[str, list] = {}
+        for (kind, name, labels), value in series.items():
+            grouped.setdefault(name, []).append((kind, labels, value))
+        for name, labels, value in gauges:
+            grouped.setdefault(name, []).append(("g", labels, value))
+
+        lines = []
+        for name in sorted(grouped):
+            metric_type, help_text = METRIC_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for kind, labels, value in sorted(grouped[name], key=lambda item: item[1]):
+                if kind != "h":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), value[:-1]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def get_metrics() -> MetricsRegistry | None:
+    return current_app.extensions.get("metrics")
+
+
+def record_cache_access(cache_name: str, hit: bool):
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.inc("cache_requests_total", (("cache", cache_name), ("result", "hit" if hit else "miss")))
+
+
+def _pool_gauges(app):
+    def collect():
+        with app.app_context():
+            engines = dict(db.engines)
+        replicas = app.extensions.get("db_replicas")
+        if replicas is not None:
+            for index, (engine, up) in enumerate(zip(replicas.engines, replicas.healthy_flags())):
+                engines[f"replica-{index}"] = engine
+                yield "db_replica_up", (("replica", str(index)),), int(up)
+        for bind_key, engine in engines.items():
+            pool = engine.pool
+            labels = (("bind", bind_key or "default"),)
+            for name, attr in (
+                ("db_pool_size", "size"),
+                ("db_pool_checked_out", "checkedout"),
+                ("db_pool_checked_in", "checkedin"),
+                ("db_pool_overflow", "overflow"),
+            ):
+                getter = getattr(pool, attr, None)
+                if callable(getter):
+                    yield name, labels, getter()
+
+    return collect
+
+
+def register_metrics(app):
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    buckets_raw = app.config.get("METRICS_LATENCY_BUCKETS")
+    buckets = DEFAULT_LATENCY_BUCKETS
+    if buckets_raw:
+        buckets = tuple(float(b) for b in str(buckets_raw).split(",") if b.strip())
+
+    metrics = MetricsRegistry(
+        buckets=buckets,
+        multiproc_dir=app.config.get("METRICS_MULTIPROC_DIR") or None,
+        flush_interval=float(app.config.get("METRICS_FLUSH_INTERVAL_SECONDS", 5)),
+    )
+    metrics.add_gauge_collector(_pool_gauges(app))
+    app.extensions["metrics"] = metrics
+
+    @app.before_request
+    def _start_metrics_timer():
+        g._metrics_started_at = perf_counter()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        started = g.get("_metrics_started_at")
+        if started is None:
+            return response
+
+        rule = request.url_rule
+        endpoint = rule.rule if rule is not None else "unmatched"
+        method = request.method
+
+        metrics.inc("http_requests_total", (("endpoint", endpoint), ("method", method),
+                                            ("status", str(response.status_code))))
+        metrics.observe("http_request_duration_seconds", (("endpoint", endpoint), ("method", method)),
+                        perf_counter() - started)
+
+        stats = get_query_stats()
+        if stats is not None:
+            metrics.inc("db_queries_total", (("endpoint", endpoint),), stats.count)
+
+        metrics.maybe_flush()
+        return response
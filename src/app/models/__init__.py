@@ -2,6 +2,7 @@ from .user import User  # noqa: F401
 from .book import Book  # noqa: F401
 from .author import Author  # noqa: F401
 from .category import Category  # noqa: F401
+from .category_closure import CategoryClosure  # noqa: F401
 from .book_category import BookCategory  # noqa: F401
 from .review import Review  # noqa: F401
 from .review_like import ReviewLike  # noqa: F401
@@ -10,3 +11,12 @@ from .wishlist import Wishlist  # noqa: F401
 from .cart import Cart  # noqa: F401
 from .order import Order  # noqa: F401
 from .order_item import OrderItem  # noqa: F401
+from .login_throttle import LoginThrottle  # noqa: F401
+from .refresh_token import RefreshToken  # noqa: F401
+from .book_sales_daily import BookSalesDaily  # noqa: F401
+from .book_sales_ranking import BookSalesRanking  # noqa: F401
+from .ranking_window import RankingWindow  # noqa: F401
+from .book_recommendation import BookRecommendation  # noqa: F401
+from .order_summary import OrderSummary  # noqa: F401
+from .outbox_event import OutboxEvent  # noqa: F401
+from .archive import reviews_archive, comments_archive, orders_archive, order_items_archive  # noqa: F401
@@ -0,0 +1,28 @@
+from ..extensions import db
+from .comment import Comment
+from .order import Order
+from .order_item import OrderItem
+from .review import Review
+
+
+def _archive_table(source: db.Table) -> db.Table:
+    """
+    Same columns as `source` plus `archived_at`; only the primary key is kept
+    (no FKs or secondary indexes), so archived rows cost nothing on hot paths.
+    """
+    columns = [
+        db.Column(column.name, column.type, primary_key=column.primary_key, autoincrement=False)
+        for column in source.columns
+    ]
+    return db.Table(
+        f"{source.name}_archive",
+        db.metadata,
+        *columns,
+        db.Column("archived_at", db.DateTime, nullable=False),
+    )
+
+
+reviews_archive = _archive_table(Review.__table__)
+comments_archive = _archive_table(Comment.__table__)
+orders_archive = _archive_table(Order.__table__)
+order_items_archive = _archive_table(OrderItem.__table__)
@@ -5,6 +5,10 @@ from ._types import BigInt
 
 class BookCategory(db.Model):
     __tablename__ = "book_categories"
+    __table_args__ = (
+        # 카테고리 → 도서 방향 조회 (GET /books?category_id=)
+        db.Index("ix_book_categories_category_book", "category_id", "book_id"),
+    )
 
     book_id = db.Column(BigInt, db.ForeignKey("books.id"), primary_key=True)
     category_id = db.Column(BigInt, db.ForeignKey("categories.id"), primary_key=True)
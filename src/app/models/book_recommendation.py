@@ -0,0 +1,16 @@
+from ..extensions import db
+from ._types import BigInt
+
+
+class BookRecommendation(db.Model):
+    """
+    Top-K "also bought" neighbours per book, written by the offline
+    co-purchase job (`flask recommendations rebuild`). Reads are a PK range scan.
+    """
+
+    __tablename__ = "book_recommendations"
+
+    book_id = db.Column(BigInt, db.ForeignKey("books.id"), primary_key=True)
+    rank = db.Column(db.SmallInteger, primary_key=True, autoincrement=False)
+    related_book_id = db.Column(BigInt, db.ForeignKey("books.id"), nullable=False)
+    score = db.Column(db.Float, nullable=False)
@@ -0,0 +1,12 @@
+from ..extensions import db
+from ._types import BigInt
+
+
+class BookSalesDaily(db.Model):
+    """Sold quantity per book per UTC day; source for the rolling-window rankings."""
+
+    __tablename__ = "book_sales_daily"
+
+    book_id = db.Column(BigInt, db.ForeignKey("books.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True, index=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,21 @@
+from ..extensions import db
+from ._types import BigInt
+
+
+class BookSalesRanking(db.Model):
+    """
+    Precomputed sales counters per ranking scope ("all", "7d", "30d").
+    The composite indexes match the `ORDER BY quantity DESC, book_id DESC LIMIT k`
+    reads, so a top-k request only walks k index entries.
+    """
+
+    __tablename__ = "book_sales_rankings"
+    __table_args__ = (
+        db.Index("ix_book_sales_rankings_scope_qty", "scope", "quantity", "book_id"),
+        db.Index("ix_book_sales_rankings_scope_cat_qty", "scope", "category_id", "quantity", "book_id"),
+    )
+
+    scope = db.Column(db.String(8), primary_key=True)
+    book_id = db.Column(BigInt, db.ForeignKey("books.id"), primary_key=True)
+    category_id = db.Column(BigInt, db.ForeignKey("categories.id"), nullable=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
@@ -5,6 +5,10 @@ from ._types import BigInt
 
 class Cart(db.Model):
     __tablename__ = "cart"
+    __table_args__ = (
+        # 삭제되지 않은 (user_id, book_id) 는 하나만: is_active 는 soft delete 된 행에서 NULL 이라 중복 허용
+        db.UniqueConstraint("user_id", "book_id", "is_active", name="uq_cart_user_book_active"),
+    )
 
     id = db.Column(BigInt, primary_key=True, autoincrement=True)
     user_id = db.Column(BigInt, db.ForeignKey("users.id"), nullable=False, index=True)
@@ -18,6 +22,7 @@ class Cart(db.Model):
         db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
     deleted_at = db.Column(db.DateTime, nullable=True)
+    is_active = db.Column(db.SmallInteger, db.Computed("CASE WHEN deleted_at IS NULL THEN 1 END"))
 
     user = db.relationship("User", back_populates="cart_items")
     book = db.relationship("Book", back_populates="cart_items")
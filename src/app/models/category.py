@@ -9,6 +9,8 @@ class Category(db.Model):
     id = db.Column(BigInt, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False, unique=True, index=True)
     slug = db.Column(db.String(120), nullable=False, unique=True, index=True)
+    # 상위 카테고리 (None: 최상위). 조상/자손 조회는 category_closure 사용
+    parent_id = db.Column(BigInt, db.ForeignKey("categories.id"), nullable=True, index=True)
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(
@@ -0,0 +1,16 @@
+from ..extensions import db
+from ._types import BigInt
+
+
+class CategoryClosure(db.Model):
+    """
+    Transitive closure of the category tree: one row per (ancestor,
+    descendant) pair including the (id, id, 0) self row. Maintained on
+    category writes, so subtree reads are a single PK range scan.
+    """
+
+    __tablename__ = "category_closure"
+
+    ancestor_id = db.Column(BigInt, db.ForeignKey("categories.id"), primary_key=True)
+    descendant_id = db.Column(BigInt, db.ForeignKey("categories.id"), primary_key=True, index=True)
+    depth = db.Column(db.Integer, nullable=False)
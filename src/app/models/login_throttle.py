@@ -0,0 +1,14 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class LoginThrottle(db.Model):
+    """Shared backend for the login throttle (per-account / per-IP failure counters)."""
+
+    __tablename__ = "login_throttles"
+
+    # "acct:<email>" 또는 "ip:<address>"
+    key = db.Column(db.String(320), primary_key=True)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_failure_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -22,4 +22,5 @@ class Order(db.Model):
     deleted_at = db.Column(db.DateTime, nullable=True)
 
     user = db.relationship("User", back_populates="orders")
-    items = db.relationship("OrderItem", back_populates="order", lazy="dynamic")
+    # 상세/배치 조회에서 selectinload 로 한 번에 읽도록 일반 relationship 사용
+    items = db.relationship("OrderItem", back_populates="order", order_by="OrderItem.id")
@@ -0,0 +1,19 @@
+from ..extensions import db
+from ._types import BigInt
+
+
+class OrderSummary(db.Model):
+    """
+    Order count / amount per (user, month, status), maintained incrementally on
+    order creation and status changes. `user_id = 0` holds the global rollup,
+    so there is no FK on the column.
+    """
+
+    __tablename__ = "order_summaries"
+
+    user_id = db.Column(BigInt, primary_key=True, autoincrement=False)
+    month = db.Column(db.Date, primary_key=True)  # 해당 월 1일
+    status = db.Column(db.String(20), primary_key=True)
+
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
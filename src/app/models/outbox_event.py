@@ -0,0 +1,31 @@
+from datetime import datetime
+from ..extensions import db
+from ._types import BigInt
+
+
+class OutboxEvent(db.Model):
+    """
+    Side effect recorded in the same transaction as the business change and
+    executed later by the outbox worker (`flask outbox worker`).
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # 워커 폴링: status = PENDING AND available_at <= now ORDER BY id
+        db.Index("ix_outbox_events_status_available", "status", "available_at", "id"),
+    )
+
+    id = db.Column(BigInt, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+
+    # PENDING, DONE, FAILED
+    status = db.Column(db.String(10), nullable=False, default="PENDING")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # 다음 실행 가능 시각 (재시도 백오프 / 워커 임대 만료)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(64), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
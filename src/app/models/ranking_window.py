@@ -0,0 +1,10 @@
+from ..extensions import db
+
+
+class RankingWindow(db.Model):
+    """Day up to which a rolling ranking scope has been rebuilt from daily buckets."""
+
+    __tablename__ = "ranking_windows"
+
+    scope = db.Column(db.String(8), primary_key=True)
+    as_of = db.Column(db.Date, nullable=False)
@@ -0,0 +1,24 @@
+from datetime import datetime
+from ..extensions import db
+from ._types import BigInt
+
+
+class RefreshToken(db.Model):
+    """
+    Issued refresh tokens. One login starts a family; every rotation adds a row
+    to the same family and links the previous row through `replaced_by`.
+    Revoking (logout, reuse detection) stamps `revoked_at` on the whole family.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(BigInt, primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(32), nullable=False, unique=True, index=True)
+    family_id = db.Column(db.String(32), nullable=False, index=True)
+    user_id = db.Column(BigInt, db.ForeignKey("users.id"), nullable=False, index=True)
+
+    replaced_by = db.Column(db.String(32), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from ..extensions import db
 from ._types import BigInt
-import bcrypt  # 🔹 추가
+from ..password_hashing import hash_password, verify_password, needs_rehash
 
 
 class User(db.Model):
@@ -33,15 +33,15 @@ class User(db.Model):
 
     # 비밀번호 해싱 메서드 추가
     def set_password(self, raw_password: str):
-        """평문 비밀번호를 받아 bcrypt로 해싱하여 password_hash에 저장"""
-        hashed = bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt())
-        self.password_hash = hashed.decode("utf-8")
+        """평문 비밀번호를 받아 bcrypt(BCRYPT_ROUNDS)로 해싱하여 password_hash에 저장"""
+        self.password_hash = hash_password(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
         """입력한 평문 비밀번호가 저장된 해시와 일치하는지 확인"""
         if not self.password_hash:
             return False
-        return bcrypt.checkpw(
-            raw_password.encode("utf-8"),
-            self.password_hash.encode("utf-8"),
-        )
+        return verify_password(raw_password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        """저장된 해시의 cost 가 현재 BCRYPT_ROUNDS 와 다른지 여부"""
+        return needs_rehash(self.password_hash)
@@ -5,6 +5,10 @@ from ._types import BigInt
 
 class Wishlist(db.Model):
     __tablename__ = "wishlists"
+    __table_args__ = (
+        # 삭제되지 않은 (user_id, book_id) 는 하나만: is_active 는 soft delete 된 행에서 NULL 이라 중복 허용
+        db.UniqueConstraint("user_id", "book_id", "is_active", name="uq_wishlists_user_book_active"),
+    )
 
     id = db.Column(BigInt, primary_key=True, autoincrement=True)
     user_id = db.Column(BigInt, db.ForeignKey("users.id"), nullable=False, index=True)
@@ -12,6 +16,7 @@ class Wishlist(db.Model):
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     deleted_at = db.Column(db.DateTime, nullable=True)
+    is_active = db.Column(db.SmallInteger, db.Computed("CASE WHEN deleted_at IS NULL THEN 1 END"))
 
     user = db.relationship("User", back_populates="wishlists")
     book = db.relationship("Book", back_populates="wishlists")
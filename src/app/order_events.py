@@ -0,0 +1,34 @@
+import logging
+
+from .outbox import enqueue, handler
+from .order_summary import record_orders_created, record_status_changes
+from .rankings import on_orders_transitioned
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+notification_logger = logging.getLogger("bookstore.notifications")
+
+
+def order_created(order):
+    """주문 생성과 같은 트랜잭션에 요약 갱신 이벤트를 기록한다 (order.id 확보 후 호출)."""
+    enqueue(ORDER_CREATED, {"order_ids": [order.id], "status": order.status})
+
+
+def orders_transitioned(order_ids: list[int], previous_status: str, new_status: str):
+    enqueue(ORDER_STATUS_CHANGED, {"order_ids": order_ids, "from": previous_status, "to": new_status})
+
+
+@handler(ORDER_CREATED)
+def _on_order_created(payload: dict):
+    record_orders_created(payload["order_ids"], payload["status"])
+
+
+@handler(ORDER_STATUS_CHANGED)
+def _on_status_changed(payload: dict):
+    order_ids, previous_status, new_status = payload["order_ids"], payload["from"], payload["to"]
+    on_orders_transitioned(order_ids, previous_status, new_status)
+    record_status_changes(order_ids, previous_status, new_status)
+    notification_logger.info(
+        "orders %s: %s -> %s", ",".join(map(str, order_ids)), previous_status, new_status
+    )
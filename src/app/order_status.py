@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from .extensions import db
+from .models import Book, Order, OrderItem
+from .order_events import orders_transitioned
+
+# 현재 상태 -> 이동 가능한 다음 상태
+ORDER_TRANSITIONS = {
+    "PENDING": {"PAID", "CANCELLED"},
+    "PAID": {"SHIPPED", "CANCELLED"},
+    "SHIPPED": {"COMPLETED"},
+    "COMPLETED": set(),
+    "CANCELLED": set(),
+}
+ORDER_STATUSES = set(ORDER_TRANSITIONS)
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in ORDER_TRANSITIONS.get(from_status, set())
+
+
+def restore_stock(order_ids: list[int]):
+    """취소된 주문들의 수량을 도서별로 합산해 UPDATE 한 번으로 재고에 되돌린다."""
+    restored = (
+        select(func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id.in_(order_ids), OrderItem.book_id == Book.id)
+        .scalar_subquery()
+    )
+    Book.query.filter(
+        Book.id.in_(select(OrderItem.book_id).where(OrderItem.order_id.in_(order_ids))),
+        Book.stock_cnt.isnot(None),
+    ).update(
+        # updated_at 을 함께 올려야 카탈로그 인덱스의 델타 폴링이 이 행들을 다시 읽는다
+        {Book.stock_cnt: Book.stock_cnt + restored, Book.updated_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
+
+
+def transition_orders(order_ids: list[int], from_status: str, to_status: str):
+    """
+    Move every order in `order_ids` that is currently `from_status` to
+    `to_status` with one conditional UPDATE, then apply the side effects
+    (stock, rankings, summaries) for exactly the rows that moved.
+
+    Returns (updated ids, {id: status before the update} for the orders found).
+    The caller validates the transition and commits.
+    """
+    current = dict(
+        db.session.query(Order.id, Order.status)
+        .filter(Order.id.in_(order_ids), Order.deleted_at.is_(None))
+        .with_for_update()
+    )
+    updated = [order_id for order_id in order_ids if current.get(order_id) == from_status]
+    if not updated:
+        return [], current
+
+    now = datetime.utcnow()
+    values = {Order.status: to_status, Order.updated_at: now}
+    if to_status == "PAID":
+        values[Order.paid_at] = func.coalesce(Order.paid_at, now)
+    Order.query.filter(
+        Order.id.in_(updated),
+        Order.status == from_status,
+    ).update(values, synchronize_session=False)
+
+    if to_status == "CANCELLED":
+        restore_stock(updated)
+    orders_transitioned(updated, from_status, to_status)
+    return updated, current
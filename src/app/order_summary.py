@@ -0,0 +1,145 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import insert
+
+from .extensions import db
+from .db_utils import upsert_increment_many
+from .models import Order, OrderSummary
+
+# order_summaries.user_id = 0 → 전체 사용자 합계
+GLOBAL_USER_ID = 0
+
+
+def _month_of(value: datetime | None) -> date:
+    value = value or datetime.utcnow()
+    return date(value.year, value.month, 1)
+
+
+def _summary_rows(orders, status: str, sign: int) -> list[dict]:
+    """(user_id, created_at, total_amount) 목록을 사용자/전체 × 월 단위 증분 행으로 합친다."""
+    totals: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    for user_id, created_at, amount in orders:
+        month = _month_of(created_at)
+        for key in ((user_id, month), (GLOBAL_USER_ID, month)):
+            totals[key][0] += sign
+            totals[key][1] += Decimal(amount or 0) * sign
+    return [
+        {"user_id": user_id, "month": month, "status": status, "order_count": count, "total_amount": amount}
+        for (user_id, month), (count, amount) in totals.items()
+    ]
+
+
+def _apply(rows: list[dict]):
+    upsert_increment_many(
+        OrderSummary, rows, ("user_id", "month", "status"), ("order_count", "total_amount"),
+    )
+
+
+def _orders(order_ids: list[int]):
+    return (
+        db.session.query(Order.user_id, Order.created_at, Order.total_amount)
+        .filter(Order.id.in_(order_ids))
+        .all()
+    )
+
+
+def record_orders_created(order_ids: list[int], status: str = "PENDING"):
+    """Add newly created orders to their creation-status rows."""
+    _apply(_summary_rows(_orders(order_ids), status, 1))
+
+
+def record_status_changes(order_ids: list[int], previous_status: str, new_status: str):
+    """Move the given orders from one status row to another (grouped per user and month)."""
+    if previous_status == new_status or not order_ids:
+        return
+    orders = _orders(order_ids)
+    _apply(_summary_rows(orders, previous_status, -1) + _summary_rows(orders, new_status, 1))
+
+
+def _amount_str(value) -> str:
+    return format(Decimal(value or 0).quantize(Decimal("0.01")), "f")
+
+
+def summarize(user_id: int) -> dict:
+    rows = (
+        db.session.query(OrderSummary.month, OrderSummary.status, OrderSummary.order_count,
+                         OrderSummary.total_amount)
+        .filter(OrderSummary.user_id == user_id, OrderSummary.order_count != 0)
+        .order_by(OrderSummary.month.desc(), OrderSummary.status.asc())
+        .all()
+    )
+
+    total_count, total_amount = 0, Decimal("0")
+    by_status: dict[str, list] = defaultdict(lambda: [0, Decimal("0")])
+    by_month: dict[date, dict] = {}
+    for month, status, count, amount in rows:
+        amount = Decimal(amount or 0)
+        total_count += count
+        total_amount += amount
+        by_status[status][0] += count
+        by_status[status][1] += amount
+
+        entry = by_month.setdefault(month, {"count": 0, "amount": Decimal("0"), "by_status": {}})
+        entry["count"] += count
+        entry["amount"] += amount
+        entry["by_status"][status] = {"order_count": count, "total_amount": _amount_str(amount)}
+
+    return {
+        "order_count": total_count,
+        "total_amount": _amount_str(total_amount),
+        "by_status": {
+            status: {"order_count": count, "total_amount": _amount_str(amount)}
+            for status, (count, amount) in sorted(by_status.items())
+        },
+        "by_month": [
+            {
+                "month": month.strftime("%Y-%m"),
+                "order_count": entry["count"],
+                "total_amount": _amount_str(entry["amount"]),
+                "by_status": entry["by_status"],
+            }
+            for month, entry in by_month.items()
+        ],
+    }
+
+
+def rebuild_order_summaries(batch_size: int = 10_000) -> int:
+    """Recompute every summary row from `orders` (backfill / repair)."""
+    totals: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    orders = (
+        db.session.query(Order.user_id, Order.created_at, Order.status, Order.total_amount)
+        .filter(Order.deleted_at.is_(None))
+        .execution_options(yield_per=batch_size)
+    )
+    for user_id, created_at, status, amount in orders:
+        month = _month_of(created_at)
+        for key in ((user_id, month, status), (GLOBAL_USER_ID, month, status)):
+            totals[key][0] += 1
+            totals[key][1] += Decimal(amount or 0)
+
+    OrderSummary.query.delete(synchronize_session=False)
+    rows = [
+        {"user_id": user_id, "month": month, "status": status, "order_count": count, "total_amount": amount}
+        for (user_id, month, status), (count, amount) in totals.items()
+    ]
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(insert(OrderSummary), rows[start:start + batch_size])
+    db.session.commit()
+    return len(rows)
+
+
+order_summary_cli = AppGroup("order-summaries", help="Order summary aggregate maintenance.")
+
+
+@order_summary_cli.command("rebuild")
+def rebuild_command():
+    """Recompute order_summaries from the orders table."""
+    click.echo(f"stored {rebuild_order_summaries()} summary rows")
+
+
+def register_order_summary(app):
+    app.cli.add_command(order_summary_cli)
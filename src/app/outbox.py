@@ -0,0 +1,258 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from .extensions import db
+from .models import OutboxEvent
+
+logger = logging.getLogger("bookstore.outbox")
+
+# event_type -> handler(payload). 핸들러는 호출한 트랜잭션 안에서 실행되고 커밋하지 않는다.
+_HANDLERS: dict = {}
+
+
+def handler(event_type: str):
+    """Register the function that executes `event_type` events."""
+    def decorator(func):
+        _HANDLERS[event_type] = func
+        return func
+
+    return decorator
+
+
+def enqueue(event_type: str, payload: dict):
+    """
+    Record a side effect in the current session. It is committed (or rolled
+    back) together with the caller's business change.
+    """
+    if event_type not in _HANDLERS:
+        raise KeyError(f"no outbox handler registered for '{event_type}'")
+    db.session.add(OutboxEvent(event_type=event_type, payload=payload))
+
+
+def retry_delay(attempts: int, base: float, maximum: float) -> float:
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+def claim_batch(limit: int, lease_seconds: float) -> tuple[str, list[int]]:
+    """
+    Lease up to `limit` due events to this caller and commit the claim.
+    On MySQL the candidates are read with FOR UPDATE SKIP LOCKED, so
+    concurrent workers never wait on each other's rows; the conditional
+    UPDATE keeps the claim exclusive on SQLite as well.
+    """
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    ids = [
+        event_id for (event_id,) in db.session.query(OutboxEvent.id)
+        .filter(OutboxEvent.status == "PENDING", OutboxEvent.available_at <= now)
+        .order_by(OutboxEvent.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ]
+    if not ids:
+        db.session.rollback()
+        return token, []
+
+    OutboxEvent.query.filter(
+        OutboxEvent.id.in_(ids),
+        OutboxEvent.status == "PENDING",
+        OutboxEvent.available_at <= now,
+    ).update({
+        OutboxEvent.locked_by: token,
+        OutboxEvent.available_at: now + timedelta(seconds=lease_seconds),
+        OutboxEvent.attempts: OutboxEvent.attempts + 1,
+    }, synchronize_session=False)
+    db.session.commit()
+
+    claimed = [
+        event_id for (event_id,) in db.session.query(OutboxEvent.id)
+        .filter(OutboxEvent.id.in_(ids), OutboxEvent.locked_by == token)
+        .order_by(OutboxEvent.id.asc())
+    ]
+    return token, claimed
+
+
+def run_event(event_id: int, token: str) -> bool:
+    """
+    Execute one claimed event. The handler's writes and the DONE mark commit
+    together, so a crash before the commit simply re-runs the event after
+    the lease expires. DONE is only set while this caller still holds the
+    lease; if the handler outlived it and another worker reclaimed the event,
+    the handler's writes are rolled back so they are applied once.
+    """
+    config = current_app.config
+    event = db.session.get(OutboxEvent, event_id)
+    if event is None or event.locked_by != token or event.status != "PENDING":
+        return False
+    event_type = event.event_type
+
+    try:
+        _HANDLERS[event_type](event.payload)
+        finished = OutboxEvent.query.filter(
+            OutboxEvent.id == event_id,
+            OutboxEvent.locked_by == token,
+            OutboxEvent.status == "PENDING",
+        ).update({
+            OutboxEvent.status: "DONE",
+            OutboxEvent.locked_by: None,
+            OutboxEvent.last_error: None,
+            OutboxEvent.processed_at: datetime.utcnow(),
+        }, synchronize_session=False)
+        if not finished:
+            db.session.rollback()
+            logger.warning("outbox event %s (%s) lost its lease; discarding this run", event_id, event_type)
+            return False
+        db.session.commit()
+        return True
+    except Exception as exc:  # noqa: BLE001 - 실패는 재시도로 처리
+        db.session.rollback()
+        logger.exception("outbox event %s (%s) failed", event_id, event_type)
+
+        event = db.session.get(OutboxEvent, event_id)
+        if event.locked_by != token:
+            # 다른 워커가 이미 재점유: 그쪽 시도를 건드리지 않는다
+            db.session.rollback()
+            return False
+        if event.attempts >= int(config.get("OUTBOX_MAX_ATTEMPTS", 8)):
+            event.status = "FAILED"
+        else:
+            delay = retry_delay(
+                event.attempts,
+                float(config.get("OUTBOX_RETRY_BASE_SECONDS", 2)),
+                float(config.get("OUTBOX_RETRY_MAX_SECONDS", 300)),
+            )
+            event.available_at = datetime.utcnow() + timedelta(seconds=delay)
+        event.locked_by = None
+        event.last_error = repr(exc)[:2000]
+        db.session.commit()
+        return False
+
+
+def process_batch(limit: int | None = None) -> int:
+    """Claim and run one batch in the current app context. Returns the number of events claimed."""
+    config = current_app.config
+    token, ids = claim_batch(
+        limit or int(config.get("OUTBOX_BATCH_SIZE", 100)),
+        float(config.get("OUTBOX_LEASE_SECONDS", 60)),
+    )
+    for event_id in ids:
+        run_event(event_id, token)
+    return len(ids)
+
+
+class OutboxWorker:
+    """
+    Polls the outbox and runs each claimed batch on a thread pool; every
+    task pushes its own app context, i.e. its own session and connection.
+    """
+
+    def __init__(self, app, concurrency: int = 4, batch_size: int = 100, poll_seconds: float = 1.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox")
+        self._stop = threading.Event()
+
+    def _run_event(self, event_id: int, token: str) -> bool:
+        with self.app.app_context():
+            return run_event(event_id, token)
+
+    def run_once(self) -> int:
+        with self.app.app_context():
+            token, ids = claim_batch(self.batch_size, float(self.app.config.get("OUTBOX_LEASE_SECONDS", 60)))
+        for future in [self._pool.submit(self._run_event, event_id, token) for event_id in ids]:
+            future.result()
+        return len(ids)
+
+    def run(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    claimed = self.run_once()
+                except Exception:  # noqa: BLE001 - DB 장애 시에도 워커는 계속 폴링
+                    logger.exception("outbox poll failed")
+                    claimed = 0
+                # 가득 찬 배치였다면 곧바로 다음 배치, 아니면 폴링 간격만큼 대기
+                if claimed < self.batch_size:
+                    self._stop.wait(self.poll_seconds)
+        finally:
+            self.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+outbox_cli = AppGroup("outbox", help="Transactional outbox worker and maintenance.")
+
+
+@outbox_cli.command("worker")
+@click.option("--concurrency", type=int, default=None, help="Handler threads (OUTBOX_WORKER_CONCURRENCY).")
+@click.option("--once", is_flag=True, help="Process a single batch and exit.")
+def worker_command(concurrency, once):
+    """Run outbox handlers until interrupted."""
+    app = current_app._get_current_object()
+    worker = OutboxWorker(
+        app,
+        concurrency=concurrency or int(app.config.get("OUTBOX_WORKER_CONCURRENCY", 4)),
+        batch_size=int(app.config.get("OUTBOX_BATCH_SIZE", 100)),
+        poll_seconds=float(app.config.get("OUTBOX_POLL_SECONDS", 1)),
+    )
+    if once:
+        try:
+            click.echo(f"processed {worker.run_once()} events")
+        finally:
+            worker.close()
+        return
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+@outbox_cli.command("retry-failed")
+def retry_failed_command():
+    """Re-queue events that exhausted their attempts."""
+    count = OutboxEvent.query.filter(OutboxEvent.status == "FAILED").update({
+        OutboxEvent.status: "PENDING",
+        OutboxEvent.attempts: 0,
+        OutboxEvent.available_at: datetime.utcnow(),
+    }, synchronize_session=False)
+    db.session.commit()
+    click.echo(f"re-queued {count} events")
+
+
+@outbox_cli.command("purge")
+@click.option("--days", type=int, default=7, help="Delete DONE events older than this.")
+@click.option("--batch-size", type=int, default=1000)
+def purge_command(days, batch_size):
+    """Delete processed events in batches."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    removed = 0
+    while True:
+        ids = [
+            event_id for (event_id,) in db.session.query(OutboxEvent.id)
+            .filter(OutboxEvent.status == "DONE", OutboxEvent.processed_at < cutoff)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+        removed += OutboxEvent.query.filter(OutboxEvent.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+    click.echo(f"purged {removed} events")
+
+
+def register_outbox(app):
+    # 핸들러 등록 (import 부작용)
+    from . import order_events  # noqa: F401
+
+    app.cli.add_command(outbox_cli)
@@ -3,20 +3,24 @@ from flask import request
 from sqlalchemy.orm import Query
 
 
-def apply_pagination_and_sort(
-    query: Query,
+def parse_pagination_args(
+    args,
     model,
     default_sort_field: str = "created_at",
     default_sort_dir: str = "DESC",
     max_size: int = 100,
 ):
+    """
+    page/size/sort 쿼리 파라미터 해석 (Flask request 에 의존하지 않음).
+    반환: (page, size, sort_field, sort_dir)
+    """
     # page, size
     try:
-        page = int(request.args.get("page", 1))
+        page = int(args.get("page", 1))
     except ValueError:
         page = 1
     try:
-        size = int(request.args.get("size", 20))
+        size = int(args.get("size", 20))
     except ValueError:
         size = 20
 
@@ -28,7 +32,7 @@ def apply_pagination_and_sort(
         size = max_size
 
     # sort=field,DESC|ASC
-    sort_param = request.args.get("sort", f"{default_sort_field},{default_sort_dir}")
+    sort_param = args.get("sort", f"{default_sort_field},{default_sort_dir}")
     sort_field, sort_dir = default_sort_field, default_sort_dir
 
     if "," in sort_param:
@@ -40,6 +44,31 @@ def apply_pagination_and_sort(
         if sd in ("ASC", "DESC"):
             sort_dir = sd
 
+    return page, size, sort_field, sort_dir
+
+
+def build_page_meta(page: int, size: int, total_elements: int, sort_field: str, sort_dir: str) -> dict:
+    total_pages = ceil(total_elements / size) if total_elements > 0 else 1
+    return {
+        "page": page,
+        "size": size,
+        "totalElements": total_elements,
+        "totalPages": total_pages,
+        "sort": f"{sort_field},{sort_dir}",
+    }
+
+
+def apply_pagination_and_sort(
+    query: Query,
+    model,
+    default_sort_field: str = "created_at",
+    default_sort_dir: str = "DESC",
+    max_size: int = 100,
+):
+    page, size, sort_field, sort_dir = parse_pagination_args(
+        request.args, model, default_sort_field, default_sort_dir, max_size
+    )
+
     sort_column = getattr(model, sort_field, None)
     if sort_column is not None:
         if sort_dir == "DESC":
@@ -48,16 +77,8 @@ def apply_pagination_and_sort(
             query = query.order_by(sort_column.asc())
 
     total_elements = query.count()
-    total_pages = ceil(total_elements / size) if total_elements > 0 else 1
-
     items = query.offset((page - 1) * size).limit(size).all()
 
-    meta = {
-        "page": page,
-        "size": size,
-        "totalElements": total_elements,
-        "totalPages": total_pages,
-        "sort": f"{sort_field},{sort_dir}",
-    }
+    meta = build_page_meta(page, size, total_elements, sort_field, sort_dir)
 
     return items, meta
@@ -0,0 +1,172 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+from flask import current_app, has_app_context
+
+from .error_handlers import ApiError
+from .error_codes import ErrorCodes
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
+def _hashpw(raw_password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(raw_password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(raw_password: bytes, password_hash: bytes) -> bool:
+    return bcrypt.checkpw(raw_password, password_hash)
+
+
+class HashingExecutor:
+    """
+    Process pool dedicated to bcrypt so hashing neither holds the GIL of the
+    request process nor occupies every request thread during a login burst.
+
+    The number of in-flight jobs is capped; callers beyond the cap are rejected
+    immediately (503) instead of queueing behind other hashes. The pool is
+    created lazily and re-created after a fork (prefork servers).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_pid: int | None = None
+        self._pool_workers = 0
+        self._pending = 0
+
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid or self._pool_workers != workers:
+            if self._pool is not None and self._pool_pid == pid:
+                self._pool.shutdown(wait=False)
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+            self._pool_pid = pid
+            self._pool_workers = workers
+        return self._pool
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, fn, *args, workers: int, max_pending: int, timeout: float):
+        if workers <= 0:
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= max_pending:
+                raise ApiError(
+                    status_code=503,
+                    code=ErrorCodes.SERVICE_UNAVAILABLE,
+                    message="Authentication service is busy. Please retry shortly.",
+                )
+            self._pending += 1
+            try:
+                future = self._get_pool(workers).submit(fn, *args)
+            except Exception:
+                self._pending -= 1
+                raise
+        # 슬롯은 작업이 실제로 끝났을 때 반환 (타임아웃으로 포기한 작업도 포함)
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise ApiError(
+                status_code=503,
+                code=ErrorCodes.SERVICE_UNAVAILABLE,
+                message="Authentication service is busy. Please retry shortly.",
+            )
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_executor = HashingExecutor()
+atexit.register(_executor.shutdown)
+
+
+def _settings() -> dict:
+    config = current_app.config if has_app_context() else {}
+    return {
+        "rounds": int(config.get("BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS)),
+        "workers": int(config.get("PASSWORD_HASH_WORKERS", 0)),
+        "max_pending": int(config.get("PASSWORD_HASH_MAX_PENDING", 32)),
+        "timeout": float(config.get("PASSWORD_HASH_TIMEOUT_SECONDS", 10)),
+    }
+
+
+def hash_password(raw_password: str) -> str:
+    settings = _settings()
+    return _executor.run(
+        _hashpw,
+        raw_password.encode("utf-8"),
+        settings["rounds"],
+        workers=settings["workers"],
+        max_pending=settings["max_pending"],
+        timeout=settings["timeout"],
+    )
+
+
+def verify_password(raw_password: str, password_hash: str) -> bool:
+    settings = _settings()
+    try:
+        return _executor.run(
+            _checkpw,
+            raw_password.encode("utf-8"),
+            password_hash.encode("utf-8"),
+            workers=settings["workers"],
+            max_pending=settings["max_pending"],
+            timeout=settings["timeout"],
+        )
+    except ValueError:
+        # bcrypt 형식이 아닌 해시 (잘못된 salt 등)
+        return False
+
+
+# bcrypt 다이제스트 자리를 채우는 고정 문자열 (31자, bcrypt base64 알파벳)
+_DUMMY_DIGEST = b"." * 31
+
+
+def _dummy_hash(rounds: int) -> bytes:
+    """
+    A well-formed bcrypt hash of the given cost that no password matches.
+    checkpw pays the full cost of the salt's rounds regardless of the digest,
+    so only a salt is generated here; no bcrypt hash runs on the request thread.
+    """
+    return bcrypt.gensalt(rounds) + _DUMMY_DIGEST
+
+
+def verify_dummy_password(raw_password: str) -> bool:
+    """
+    Run a real bcrypt check against a dummy hash of the current cost, through
+    the hashing pool like any other check, so an unknown email costs the same
+    time as a wrong password. Always False.
+    """
+    settings = _settings()
+    _executor.run(
+        _checkpw,
+        raw_password.encode("utf-8"),
+        _dummy_hash(settings["rounds"]),
+        workers=settings["workers"],
+        max_pending=settings["max_pending"],
+        timeout=settings["timeout"],
+    )
+    return False
+
+
+def hash_rounds(password_hash: str) -> int | None:
+    """'$2b$12$...' -> 12"""
+    parts = (password_hash or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str) -> bool:
+    return hash_rounds(password_hash) != _settings()["rounds"]
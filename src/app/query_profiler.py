@@ -0,0 +1,155 @@
+import heapq
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+slow_query_logger = logging.getLogger("bookstore.slow_query")
+
+# Flask 밖에서 처리되는 요청(ASGI 네이티브 라우트)의 통계. Flask 요청은 g 를 쓴다.
+_request_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """
+    Per-request SQL statistics collected from SQLAlchemy cursor events.
+    Only the `top_n` slowest statements are kept (min-heap) to bound memory.
+    """
+
+    __slots__ = ("count", "total_ms", "route", "_slowest", "_top_n")
+
+    def __init__(self, top_n: int = 3, route: tuple[str, str, str] | None = None):
+        self.count = 0
+        self.total_ms = 0.0
+        # (endpoint, method, path): 슬로우 쿼리 로그용, Flask 요청은 request 에서 읽는다
+        self.route = route
+        self._slowest: list[tuple[float, str]] = []
+        self._top_n = top_n
+
+    def record(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+
+        if self._top_n <= 0:
+            return
+        entry = (duration_ms, statement)
+        if len(self._slowest) < self._top_n:
+            heapq.heappush(self._slowest, entry)
+        elif duration_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+
+def get_query_stats() -> QueryStats | None:
+    if not has_request_context():
+        return _request_stats.get()
+    return g.get("_query_stats")
+
+
+def begin_query_stats(app, endpoint: str, method: str, path: str):
+    """
+    Start collecting for a request handled outside Flask (ASGI native routes).
+    Returns the token for `end_query_stats`; the stats follow the current
+    context, including async engine cursor events and `asyncio.to_thread`.
+    """
+    if not app.config.get("QUERY_PROFILER_ENABLED", True):
+        return None
+    top_n = int(app.config.get("QUERY_PROFILER_TOP_N", 3))
+    return _request_stats.set(QueryStats(top_n=top_n, route=(endpoint, method, path)))
+
+
+def end_query_stats(token):
+    if token is not None:
+        _request_stats.reset(token)
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"'
+
+
+def _compact_sql(statement: str, limit: int = 120) -> str:
+    compact = " ".join(statement.split())
+    if len(compact) > limit:
+        return compact[: limit - 3] + "..."
+    return compact
+
+
+def format_query_stats(stats: QueryStats) -> str:
+    """접근 로그 한 줄 뒤에 붙일 요약 문자열"""
+    summary = f"queries={stats.count} db={stats.total_ms:.2f}ms"
+    slowest = stats.slowest
+    if slowest:
+        parts = [f"{ms:.2f}ms {_compact_sql(sql)}" for ms, sql in slowest]
+        summary += " slowest=[" + " | ".join(parts) + "]"
+    return summary
+
+
+def instrument_engine(app, engine):
+    """
+    Attach cursor timing listeners to a single engine.
+    Kept separate so engines created after startup can be instrumented too.
+    """
+    config = app.config
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_query_started_at")
+        if not started:
+            return
+        duration_ms = (perf_counter() - started.pop()) * 1000
+
+        if has_request_context():
+            stats = g.get("_query_stats")
+            if stats is None:
+                stats = g._query_stats = QueryStats(top_n=int(config.get("QUERY_PROFILER_TOP_N", 3)))
+            route = (request.endpoint, request.method, request.path)
+        else:
+            stats = _request_stats.get()
+            if stats is None:
+                return
+            route = stats.route
+        stats.record(statement, duration_ms)
+
+        threshold_ms = float(config.get("SLOW_QUERY_THRESHOLD_MS", 0) or 0)
+        if threshold_ms and duration_ms >= threshold_ms:
+            slow_query_logger.warning(
+                "slow query %.2f ms route=%s %s %s :: %s",
+                duration_ms,
+                *route,
+                _compact_sql(statement, limit=1000),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None:
+            started = conn.info.get("_query_started_at")
+            if started:
+                started.pop()
+
+
+def register_query_profiler(app):
+    if not app.config.get("QUERY_PROFILER_ENABLED", True):
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(app, engine)
+
+    @app.after_request
+    def _add_server_timing(response):
+        stats = get_query_stats()
+        if stats is not None:
+            response.headers.add("Server-Timing", server_timing(stats))
+        return response
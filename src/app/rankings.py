@@ -0,0 +1,206 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Date, func, insert, literal, select
+
+from .extensions import db
+from .db_utils import insert_ignore_from_select, upsert_increment_many
+from .models import Book, BookSalesDaily, BookSalesRanking, Order, OrderItem, RankingWindow
+
+# 판매로 집계되는 주문 상태 (PAID 이후 단계 포함)
+SALE_STATUSES = {"PAID", "SHIPPED", "COMPLETED"}
+
+# scope -> rolling window 일수 (None: 전체 기간)
+RANKING_SCOPES = {
+    "all": None,
+    "7d": 7,
+    "30d": 30,
+}
+
+
+def _window_start(today: date, days: int) -> date:
+    return today - timedelta(days=days - 1)
+
+
+def _rebuild_window(scope: str, days: int, today: date):
+    BookSalesRanking.query.filter(BookSalesRanking.scope == scope).delete(synchronize_session=False)
+    totals = (
+        select(
+            literal(scope),
+            BookSalesDaily.book_id,
+            Book.category_id,
+            func.sum(BookSalesDaily.quantity),
+        )
+        .join(Book, Book.id == BookSalesDaily.book_id)
+        .where(BookSalesDaily.day >= _window_start(today, days))
+        .group_by(BookSalesDaily.book_id, Book.category_id)
+        .having(func.sum(BookSalesDaily.quantity) > 0)
+    )
+    db.session.execute(
+        insert(BookSalesRanking).from_select(["scope", "book_id", "category_id", "quantity"], totals)
+    )
+
+
+def _claim_window(scope: str, today: date) -> bool:
+    """
+    Move `scope` to `today` on the primary; True for the one caller that did.
+    Conditional UPDATE for an existing row, INSERT IGNORE for the first day,
+    so concurrent claimers never hit a duplicate key.
+    """
+    claimed = RankingWindow.query.filter(
+        RankingWindow.scope == scope,
+        RankingWindow.as_of < today,
+    ).update({"as_of": today}, synchronize_session=False)
+    if claimed:
+        return True
+    inserted = insert_ignore_from_select(
+        RankingWindow, ["scope", "as_of"], select(literal(scope), literal(today, Date)),
+    )
+    return bool(inserted.rowcount)
+
+
+def refresh_windows(today: date | None = None) -> bool:
+    """
+    Rebuild the rolling scopes once per day from the daily buckets (at most
+    `days` rows per book); within the day they are kept current incrementally.
+    Runs from the sales handler and `flask rankings refresh`, never from reads.
+    Returns True when something was rebuilt (the caller commits).
+    """
+    today = today or datetime.utcnow().date()
+
+    rebuilt = False
+    for scope, days in RANKING_SCOPES.items():
+        # 같은 날 재구성은 선점한 한 트랜잭션만 수행
+        if days is None or not _claim_window(scope, today):
+            continue
+        _rebuild_window(scope, days, today)
+        rebuilt = True
+    return rebuilt
+
+
+def record_orders_sale(order_ids: list[int], sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) the quantities of the given orders.
+    One grouped read over order_items, then one multi-row upsert per table;
+    runs in the caller's transaction, so counters commit with the status change.
+    """
+    now = datetime.utcnow()
+    today = now.date()
+    refresh_windows(today)
+
+    paid_at = dict(db.session.query(Order.id, Order.paid_at).filter(Order.id.in_(order_ids)))
+    lines = (
+        db.session.query(OrderItem.order_id, OrderItem.book_id, Book.category_id, func.sum(OrderItem.quantity))
+        .join(Book, Book.id == OrderItem.book_id)
+        .filter(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.order_id, OrderItem.book_id, Book.category_id)
+    )
+
+    daily: dict[tuple, int] = defaultdict(int)
+    scoped: dict[tuple, int] = defaultdict(int)
+    categories = {}
+    for order_id, book_id, category_id, quantity in lines:
+        sold_on = (paid_at.get(order_id) or now).date()
+        delta = sign * int(quantity)
+        daily[(book_id, sold_on)] += delta
+        categories[book_id] = category_id
+        for scope, days in RANKING_SCOPES.items():
+            if days is None or sold_on >= _window_start(today, days):
+                scoped[(scope, book_id)] += delta
+
+    upsert_increment_many(
+        BookSalesDaily,
+        [{"book_id": book_id, "day": day, "quantity": q} for (book_id, day), q in daily.items()],
+        ("book_id", "day"), ("quantity",),
+    )
+    upsert_increment_many(
+        BookSalesRanking,
+        [
+            {"scope": scope, "book_id": book_id, "category_id": categories[book_id], "quantity": q}
+            for (scope, book_id), q in scoped.items()
+        ],
+        ("scope", "book_id"), ("quantity",), ("category_id",),
+    )
+
+
+def on_orders_transitioned(order_ids: list[int], previous_status: str, new_status: str):
+    was_sale = previous_status in SALE_STATUSES
+    is_sale = new_status in SALE_STATUSES
+    if is_sale and not was_sale:
+        record_orders_sale(order_ids, 1)
+    elif was_sale and not is_sale:
+        record_orders_sale(order_ids, -1)
+
+
+def top_books(scope: str = "all", category_id: int | None = None, limit: int = 10) -> list[dict]:
+    query = (
+        db.session.query(BookSalesRanking.book_id, BookSalesRanking.category_id,
+                         BookSalesRanking.quantity, Book.title)
+        .join(Book, Book.id == BookSalesRanking.book_id)
+        .filter(BookSalesRanking.scope == scope, BookSalesRanking.quantity > 0)
+    )
+    if category_id is not None:
+        query = query.filter(BookSalesRanking.category_id == category_id)
+    rows = query.order_by(BookSalesRanking.quantity.desc(), BookSalesRanking.book_id.desc()).limit(limit)
+
+    return [
+        {
+            "rank": rank,
+            "book_id": book_id,
+            "title": title,
+            "category_id": row_category_id,
+            "quantity": quantity,
+        }
+        for rank, (book_id, row_category_id, quantity, title) in enumerate(rows, start=1)
+    ]
+
+
+def rebuild_rankings():
+    """Backfill every scope from orders already in a sale status."""
+    BookSalesDaily.query.delete(synchronize_session=False)
+    BookSalesRanking.query.delete(synchronize_session=False)
+    RankingWindow.query.delete(synchronize_session=False)
+
+    sold_on = func.date(func.coalesce(Order.paid_at, Order.created_at))
+    daily = (
+        select(OrderItem.book_id, sold_on, func.sum(OrderItem.quantity))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(Order.status.in_(SALE_STATUSES), Order.deleted_at.is_(None))
+        .group_by(OrderItem.book_id, sold_on)
+    )
+    db.session.execute(insert(BookSalesDaily).from_select(["book_id", "day", "quantity"], daily))
+
+    overall = (
+        select(literal("all"), BookSalesDaily.book_id, Book.category_id, func.sum(BookSalesDaily.quantity))
+        .join(Book, Book.id == BookSalesDaily.book_id)
+        .group_by(BookSalesDaily.book_id, Book.category_id)
+    )
+    db.session.execute(
+        insert(BookSalesRanking).from_select(["scope", "book_id", "category_id", "quantity"], overall)
+    )
+    refresh_windows()
+    db.session.commit()
+
+
+rankings_cli = AppGroup("rankings", help="Best-seller ranking maintenance.")
+
+
+@rankings_cli.command("rebuild")
+def rebuild_command():
+    """Recompute every ranking scope from existing orders."""
+    rebuild_rankings()
+    click.echo("rankings rebuilt")
+
+
+@rankings_cli.command("refresh")
+def refresh_command():
+    """Roll the 7d/30d scopes over to today (run daily from cron)."""
+    rebuilt = refresh_windows()
+    db.session.commit()
+    click.echo("rolling windows rebuilt" if rebuilt else "rolling windows already current")
+
+
+def register_rankings(app):
+    app.cli.add_command(rankings_cli)
@@ -0,0 +1,54 @@
+from time import perf_counter
+
+from flask import request
+
+from .error_handlers import ApiError
+from .error_codes import ErrorCodes
+from .metrics import get_metrics
+
+
+class RateLimiter:
+    """
+    Sliding-window request limiter keyed by client address.
+    Shared between the Flask before_request hook and the ASGI catalog routes.
+    """
+
+    def __init__(self, limit: int, window: float, metrics=None):
+        self.limit = limit
+        self.window = window
+        self.metrics = metrics
+        self._buckets: dict[str, list[float]] = {}
+
+    def hit(self, key: str):
+        now = perf_counter()
+        bucket = self._buckets.setdefault(key, [])
+        cutoff = now - self.window
+        bucket[:] = [ts for ts in bucket if ts >= cutoff]
+        if len(bucket) >= self.limit:
+            if self.metrics is not None:
+                self.metrics.inc("rate_limit_rejections_total")
+            raise ApiError(
+                status_code=429,
+                code=ErrorCodes.TOO_MANY_REQUESTS,
+                message="Too many requests. Please try again later.",
+            )
+        bucket.append(now)
+
+
+def get_rate_limiter(app) -> RateLimiter | None:
+    return app.extensions.get("rate_limiter")
+
+
+def register_rate_limit(app):
+    limit = app.config.get("RATE_LIMIT_REQUESTS", 0)
+    window = app.config.get("RATE_LIMIT_WINDOW_SECONDS", 60)
+    if not limit or limit <= 0 or window <= 0:
+        return
+
+    with app.app_context():
+        limiter = RateLimiter(limit, window, metrics=get_metrics())
+    app.extensions["rate_limiter"] = limiter
+
+    @app.before_request
+    def _enforce_rate_limit():
+        limiter.hit(request.remote_addr or "anonymous")
@@ -0,0 +1,258 @@
+import threading
+from collections import OrderedDict
+from time import monotonic, perf_counter
+
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import insert
+
+from .extensions import db
+from .error_handlers import ApiError
+from .error_codes import ErrorCodes
+from .metrics import record_cache_access
+from .models import Book, BookRecommendation, Order, OrderItem
+
+
+class TTLCache:
+    """Bounded LRU with per-entry expiry; values may be None (negative caching)."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (hit, value)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_if(self, predicate):
+        """Drop every entry for which predicate(key, value) is true."""
+        with self._lock:
+            for key in [key for key, (_, value) in self._data.items() if predicate(key, value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# ---- offline co-purchase job ------------------------------------------------
+def _iter_order_chunks(chunk_orders: int):
+    """Yield (order_id, book_id) int64 arrays, `chunk_orders` orders at a time (keyset on orders.id)."""
+    last_id = 0
+    while True:
+        ids = [
+            order_id for (order_id,) in db.session.query(Order.id)
+            .filter(Order.id > last_id, Order.status != "CANCELLED", Order.deleted_at.is_(None))
+            .order_by(Order.id.asc())
+            .limit(chunk_orders)
+        ]
+        if not ids:
+            return
+        rows = (
+            db.session.query(OrderItem.order_id, OrderItem.book_id)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(
+                OrderItem.order_id.between(ids[0], ids[-1]),
+                Order.status != "CANCELLED",
+                Order.deleted_at.is_(None),
+            )
+            .all()
+        )
+        last_id = ids[-1]
+        if rows:
+            lines = np.asarray(rows, dtype=np.int64)
+            yield lines[:, 0], lines[:, 1]
+        # 세션에 쌓인 결과를 비워 메모리를 청크 크기로 제한
+        db.session.expunge_all()
+
+
+def _basket_pairs(order_ids, book_index, n_books: int, max_basket: int):
+    """
+    Vectorized pair expansion for one chunk.
+    Returns (books in kept baskets, pair keys left * n_books + right).
+    """
+    keys = np.unique(order_ids * n_books + book_index)  # 주문 내 중복 도서 제거 + 주문별 정렬
+    orders = keys // n_books
+    books = keys % n_books
+
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+    line_size = np.repeat(sizes, sizes)
+    line_start = np.repeat(starts, sizes)
+
+    kept = line_size <= max_basket
+    paired = kept & (line_size >= 2)
+    lines = np.flatnonzero(paired)
+    if len(lines) == 0:
+        return books[kept], np.empty(0, dtype=np.int64)
+
+    fanout = line_size[lines]
+    left = np.repeat(lines, fanout)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+    right = np.repeat(line_start[lines], fanout) + offsets
+    distinct = left != right
+
+    return books[kept], books[left[distinct]] * n_books + books[right[distinct]]
+
+
+def _merge_counts(keys_a, counts_a, keys_b, counts_b):
+    keys = np.concatenate([keys_a, keys_b])
+    counts = np.concatenate([counts_a, counts_b])
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+def compute_recommendations(top_k: int = 20, chunk_orders: int = 10_000, max_basket: int = 50,
+                            min_support: int = 2, max_pairs: int = 20_000_000):
+    """
+    Stream orders in chunks and accumulate sparse co-occurrence counts as
+    sorted (pair key, count) arrays. Score is cosine similarity
+    count(a, b) / sqrt(orders(a) * orders(b)); the top `top_k` per book are kept.
+
+    Returns (book_id, rank, related_book_id, score) arrays.
+    """
+    book_ids = np.asarray([book_id for (book_id,) in db.session.query(Book.id).order_by(Book.id)], dtype=np.int64)
+    n_books = len(book_ids)
+    empty = np.empty(0, dtype=np.int64)
+    if n_books == 0:
+        return empty, empty, empty, np.empty(0)
+
+    item_counts = np.zeros(n_books, dtype=np.int64)
+    pair_keys, pair_counts = empty, empty
+
+    for order_ids, raw_book_ids in _iter_order_chunks(chunk_orders):
+        kept_books, keys = _basket_pairs(order_ids, np.searchsorted(book_ids, raw_book_ids), n_books, max_basket)
+        item_counts += np.bincount(kept_books, minlength=n_books)
+        if len(keys):
+            chunk_keys, chunk_counts = np.unique(keys, return_counts=True)
+            pair_keys, pair_counts = _merge_counts(pair_keys, pair_counts, chunk_keys, chunk_counts)
+        if len(pair_keys) > max_pairs:
+            # 메모리 상한: 한 번만 함께 구매된 쌍부터 버린다.
+            frequent = pair_counts > 1
+            pair_keys, pair_counts = pair_keys[frequent], pair_counts[frequent]
+
+    supported = pair_counts >= min_support
+    pair_keys, pair_counts = pair_keys[supported], pair_counts[supported]
+    if len(pair_keys) == 0:
+        return empty, empty, empty, np.empty(0)
+
+    left, right = pair_keys // n_books, pair_keys % n_books
+    scores = pair_counts / np.sqrt(item_counts[left] * item_counts[right])
+
+    order = np.lexsort((right, -scores, left))
+    left, right, scores = left[order], right[order], scores[order]
+    starts = np.flatnonzero(np.r_[True, left[1:] != left[:-1]])
+    ranks = np.arange(len(left)) - np.repeat(starts, np.diff(np.r_[starts, len(left)]))
+    top = ranks < top_k
+
+    return book_ids[left[top]], ranks[top] + 1, book_ids[right[top]], scores[top]
+
+
+def rebuild_recommendations(batch_size: int = 5000) -> int:
+    config = current_app.config
+    book_id, rank, related, score = compute_recommendations(
+        top_k=int(config.get("RECOMMENDATIONS_TOP_K", 20)),
+        chunk_orders=int(config.get("RECOMMENDATIONS_CHUNK_ORDERS", 10_000)),
+        max_basket=int(config.get("RECOMMENDATIONS_MAX_BASKET", 50)),
+        min_support=int(config.get("RECOMMENDATIONS_MIN_SUPPORT", 2)),
+        max_pairs=int(config.get("RECOMMENDATIONS_MAX_PAIRS", 20_000_000)),
+    )
+
+    # 한 트랜잭션 안에서 교체: 읽는 쪽은 이전 결과 또는 새 결과만 본다.
+    BookRecommendation.query.delete(synchronize_session=False)
+    for start in range(0, len(book_id), batch_size):
+        end = start + batch_size
+        db.session.execute(insert(BookRecommendation), [
+            {"book_id": int(b), "rank": int(r), "related_book_id": int(rb), "score": float(s)}
+            for b, r, rb, s in zip(book_id[start:end], rank[start:end], related[start:end], score[start:end])
+        ])
+    db.session.commit()
+
+    cache = current_app.extensions.get("recommendation_cache")
+    if cache is not None:
+        cache.clear()
+    return len(book_id)
+
+
+# ---- serving ----------------------------------------------------------------
+def _load_recommendations(book_id: int):
+    if db.session.get(Book, book_id) is None:
+        return None
+    rows = (
+        db.session.query(BookRecommendation.related_book_id, BookRecommendation.score, Book.title)
+        .join(Book, Book.id == BookRecommendation.related_book_id)
+        .filter(BookRecommendation.book_id == book_id)
+        .order_by(BookRecommendation.rank.asc())
+        .all()
+    )
+    return [
+        {"book_id": related_id, "title": title, "score": round(score, 6)}
+        for related_id, score, title in rows
+    ]
+
+
+def forget_book(book_id: int):
+    """Evict a deleted book's own list and every cached list that names it."""
+    cache = current_app.extensions.get("recommendation_cache")
+    if cache is not None:
+        cache.discard_if(lambda key, items: key == book_id or any(
+            item["book_id"] == book_id for item in items or ()
+        ))
+
+
+def get_recommendations(book_id: int, limit: int) -> list[dict]:
+    cache: TTLCache = current_app.extensions["recommendation_cache"]
+    hit, items = cache.get(book_id)
+    record_cache_access("book_recommendations", hit)
+    if not hit:
+        items = _load_recommendations(book_id)
+        cache.set(book_id, items)
+
+    if items is None:
+        raise ApiError(
+            status_code=404,
+            code=ErrorCodes.RESOURCE_NOT_FOUND,
+            message="Book could not be found.",
+        )
+    return items[:limit]
+
+
+recommendations_cli = AppGroup("recommendations", help="Co-purchase recommendation batch job.")
+
+
+@recommendations_cli.command("rebuild")
+def rebuild_command():
+    """Recompute "also bought" neighbours from order history."""
+    started = perf_counter()
+    rows = rebuild_recommendations()
+    click.echo(f"stored {rows} recommendations in {perf_counter() - started:.1f}s")
+
+
+def register_recommendations(app):
+    app.extensions["recommendation_cache"] = TTLCache(
+        maxsize=int(app.config.get("RECOMMENDATIONS_CACHE_SIZE", 10_000)),
+        ttl=float(app.config.get("RECOMMENDATIONS_CACHE_TTL_SECONDS", 300)),
+    )
+    app.cli.add_command(recommendations_cli)
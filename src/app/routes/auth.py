@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
+from ..extensions import db
 from ..models import User
-from ..jwt_utils import create_token, decode_token
+from ..jwt_utils import decode_token
+from ..token_store import get_token_store
+from ..login_throttle import get_login_throttle
+from ..password_hashing import verify_dummy_password
 from ..error_handlers import ApiError
 from ..error_codes import ErrorCodes
 import jwt
@@ -23,20 +27,40 @@ def login():
             details={"email": bool(email), "password": bool(password)},
         )
 
+    throttle = get_login_throttle()
+    if throttle is not None:
+        # 잠긴 계정/IP 는 사용자 조회와 bcrypt 이전에 거절
+        throttle.check(email, request.remote_addr)
+
     user = User.query.filter_by(email=email).first()
-    if not user or not user.check_password(password):
+    if user:
+        valid = user.check_password(password)
+    else:
+        # 존재하지 않는 이메일도 동일한 bcrypt 비용을 치르도록 더미 해시와 비교
+        valid = verify_dummy_password(password)
+
+    if not valid:
+        if throttle is not None:
+            throttle.record_failure(email, request.remote_addr)
         raise ApiError(
             status_code=401,
             code=ErrorCodes.UNAUTHORIZED,
             message="이메일 또는 비밀번호가 올바르지 않습니다.",
         )
 
-    access_token = create_token(user.id, user.role, "access")
-    refresh_token = create_token(user.id, user.role, "refresh")
+    if throttle is not None:
+        throttle.record_success(email)
+
+    # cost 설정이 바뀌었으면 평문을 알고 있는 지금 새 cost 로 재해싱
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+
+    tokens = get_token_store().issue(user)
 
     return jsonify({
-        "access_token": access_token,
-        "refresh_token": refresh_token,
+        "access_token": tokens["access_token"],
+        "refresh_token": tokens["refresh_token"],
         "user": {
             "id": user.id,
             "email": user.email,
@@ -73,10 +97,7 @@ def refresh():
             message="유효하지 않은 Refresh 토큰입니다.",
         )
 
-    user_id = payload.get("sub")
-    role = payload.get("role")
-
-    user = User.query.get(user_id)
+    user = db.session.get(User, int(payload.get("sub")))
     if not user:
         raise ApiError(
             status_code=401,
@@ -84,10 +105,36 @@ def refresh():
             message="사용자를 찾을 수 없습니다.",
         )
 
-    new_access = create_token(user.id, role, "access")
-    new_refresh = create_token(user.id, role, "refresh")
+    # 역할은 이전 토큰이 아닌 현재 DB 값을 사용
+    tokens = get_token_store().rotate(payload, user)
 
-    return jsonify({
-        "access_token": new_access,
-        "refresh_token": new_refresh
-    }), 200
+    return jsonify(tokens), 200
+
+
+@bp.route("/logout", methods=["POST"])
+def logout():
+    data = request.get_json() or {}
+    token = data.get("refresh_token")
+
+    if not token:
+        raise ApiError(
+            status_code=400,
+            code=ErrorCodes.VALIDATION_FAILED,
+            message="refresh_token 필드는 필수입니다.",
+        )
+
+    try:
+        payload = decode_token(token, expected_type="refresh")
+    except jwt.InvalidTokenError:
+        raise ApiError(
+            status_code=401,
+            code=ErrorCodes.UNAUTHORIZED,
+            message="유효하지 않은 Refresh 토큰입니다.",
+        )
+
+    family_id = payload.get("fam")
+    if family_id:
+        # 같은 로그인 세션의 Refresh/Access 토큰을 모두 폐기
+        get_token_store().revoke_family(family_id)
+
+    return jsonify({"message": "로그아웃되었습니다."}), 200
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db
 from ..models import Author
+from ..db_routing import replica_read
 
 bp = Blueprint("authors", __name__)
 
@@ -28,6 +30,7 @@ def create_author():
 
 
 @bp.route("", methods=["GET"])
+@replica_read
 def list_authors():
     authors = Author.query.all()
     result = [
@@ -38,6 +41,7 @@ def list_authors():
 
 
 @bp.route("/<int:author_id>", methods=["GET"])
+@replica_read
 def get_author(author_id):
     author = Author.query.get(author_id)
     if not author:
@@ -71,6 +75,11 @@ def delete_author(author_id):
         return jsonify({"message": "저자를 찾을 수 없습니다."}), 404
 
     db.session.delete(author)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # books.author_id 가 아직 참조하는 저자 (FK / NOT NULL 제약)
+        db.session.rollback()
+        return jsonify({"message": "도서가 남아 있는 저자는 삭제할 수 없습니다."}), 409
 
     return jsonify({"message": "저자 정보가 삭제되었습니다."}), 200
@@ -1,65 +1,29 @@
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import delete, or_
+from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
-from ..models import Book, Category, Author
+from ..models import Book, BookCategory, Category, Author, BookRecommendation, BookSalesDaily, BookSalesRanking
 from ..pagination import apply_pagination_and_sort
 from ..error_handlers import ApiError
 from ..error_codes import ErrorCodes
 from ..auth_utils import jwt_required
+from ..db_routing import replica_read
+from ..rankings import top_books
+from ..recommendations import forget_book, get_recommendations
+from ..category_tree import books_in_subtree
+from ..schemas import BOOK_CREATE, BOOK_LIST_QUERY, BOOK_UPDATE, LIMIT_QUERY, RANKING_QUERY, SUGGEST_QUERY
+from ..validation import load_query, use_body, use_query
+from ..facets import book_facets_query, build_facets, price_bands, wants_facets
+from ..catalog_index import search_catalog
+from ..suggest import suggest_books
 
 bp = Blueprint("books", __name__)
 
 
-def _parse_decimal(value, field_name: str) -> Decimal:
-    try:
-        return Decimal(str(value))
-    except (InvalidOperation, TypeError):
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message=f"{field_name} must be a numeric value.",
-        )
-
-
-def _parse_date(value, field_name: str):
-    if value in (None, ""):
-        return None
-    if isinstance(value, datetime):
-        return value.date()
-    try:
-        return datetime.fromisoformat(value).date()
-    except ValueError:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message=f"{field_name} must follow YYYY-MM-DD format.",
-        )
-
-
-def _parse_int(value, field_name: str, min_value: int | None = None):
-    try:
-        parsed = int(value)
-    except (TypeError, ValueError):
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message=f"{field_name} must be an integer.",
-        )
-
-    if min_value is not None and parsed < min_value:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message=f"{field_name} must be greater than or equal to {min_value}.",
-        )
-
-    return parsed
-
-
-def _book_to_dict(book: Book) -> dict:
+def book_to_dict(book: Book) -> dict:
     return {
         "id": book.id,
         "title": book.title,
@@ -82,27 +46,60 @@ def _book_to_dict(book: Book) -> dict:
     }
 
 
-# 도서 등록 (ADMIN 전용)
-@bp.route("", methods=["POST"])
-@jwt_required(role="ADMIN")
-def create_book():
-    data = request.get_json() or {}
+def build_book_filters(args) -> list:
+    """
+    /books 검색 조건을 SQLAlchemy 필터 목록으로 변환.
+    동기 라우트와 ASGI 비동기 라우트가 같은 조건을 쓰도록 분리해 둔다.
+    """
+    params = load_query(BOOK_LIST_QUERY, args)
+    filters = []
 
-    title = data.get("title")
-    price_raw = data.get("price")
-    stock_raw = data.get("stock_cnt", 0)
-    category_id = data.get("category_id")
-    author_id = data.get("author_id")
+    keyword = params.get("keyword")
+    if keyword:
+        like = f"%{keyword}%"
+        filters.append(
+            (Book.title.ilike(like)) | (Book.description.ilike(like))
+        )
 
-    if not title or price_raw is None or category_id is None or author_id is None:
+    if params.get("status"):
+        filters.append(Book.status == params["status"])
+    if "min_price" in params:
+        filters.append(Book.price >= params["min_price"])
+    if "max_price" in params:
+        filters.append(Book.price <= params["max_price"])
+    if "category_id" in params:
+        # 하위 카테고리 + book_categories 까지 포함 (category_closure 조인)
+        filters.append(Book.id.in_(books_in_subtree(params["category_id"])))
+    if "author_id" in params:
+        filters.append(Book.author_id == params["author_id"])
+
+    return filters
+
+
+def _set_extra_categories(book: Book, category_ids: list[int]):
+    """book_categories (주 카테고리 외 추가 분류) 를 주어진 목록으로 교체"""
+    ids = set(category_ids)
+    found = {category_id for (category_id,) in db.session.query(Category.id).filter(Category.id.in_(ids))}
+    if ids - found:
         raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message="title, price, category_id, author_id are required.",
+            status_code=404,
+            code=ErrorCodes.RESOURCE_NOT_FOUND,
+            message="Category could not be found.",
+            details={"category_ids": sorted(ids - found)},
         )
 
-    price = _parse_decimal(price_raw, "price")
-    stock_cnt = _parse_int(stock_raw, "stock_cnt", min_value=0)
+    BookCategory.query.filter(BookCategory.book_id == book.id).delete(synchronize_session=False)
+    book.updated_at = datetime.utcnow()  # 카탈로그 인덱스 등 updated_at 기반 변경 감지용
+    db.session.add_all(BookCategory(book_id=book.id, category_id=category_id) for category_id in sorted(ids))
+
+
+# 도서 등록 (ADMIN 전용)
+@bp.route("", methods=["POST"])
+@jwt_required(role="ADMIN")
+@use_body(BOOK_CREATE)
+def create_book(body):
+    category_id = body["category_id"]
+    author_id = body["author_id"]
 
     category = Category.query.get(category_id)
     if not category:
@@ -122,98 +119,86 @@ def create_book():
             details={"author_id": author_id},
         )
 
-    published_at = _parse_date(data.get("published_at"), "published_at")
-
     book = Book(
-        title=title,
-        description=data.get("description"),
-        price=price,
-        isbn13=data.get("isbn13"),
-        published_at=published_at,
-        stock_cnt=stock_cnt,
-        status=data.get("status", "ACTIVE"),
+        title=body["title"],
+        description=body.get("description"),
+        price=body["price"],
+        isbn13=body.get("isbn13"),
+        published_at=body.get("published_at"),
+        stock_cnt=body["stock_cnt"],
+        status=body["status"],
         category_id=category.id,
         author_id=author.id,
     )
     db.session.add(book)
+    if "category_ids" in body:
+        db.session.flush()
+        _set_extra_categories(book, body["category_ids"])
     db.session.commit()
 
-    return jsonify(_book_to_dict(book)), 201
+    return jsonify(book_to_dict(book)), 201
 
 
 # 도서 목록 조회
 @bp.route("", methods=["GET"])
+@replica_read
 def list_books():
-    query = Book.query
-
-    keyword = request.args.get("keyword")
-    status = request.args.get("status")
-    min_price = request.args.get("min_price")
-    max_price = request.args.get("max_price")
-    category_filter = request.args.get("category_id")
-    author_filter = request.args.get("author_id")
-
-    if keyword:
-        like = f"%{keyword}%"
-        query = query.filter(
-            (Book.title.ilike(like)) | (Book.description.ilike(like))
+    filters = build_book_filters(request.args)
+
+    # CATALOG_INDEX_ENABLED: 키워드/패싯이 없는 필터+정렬은 메모리 컬럼 인덱스로 처리
+    indexed = search_catalog(request.args)
+    if indexed is not None:
+        books, meta = indexed
+    else:
+        books, meta = apply_pagination_and_sort(
+            query=Book.query.filter(*filters),
+            model=Book,
+            default_sort_field="created_at",
+            default_sort_dir="DESC",
         )
 
-    if status:
-        query = query.filter(Book.status == status)
-
-    try:
-        if min_price is not None:
-            query = query.filter(Book.price >= Decimal(str(min_price)))
-        if max_price is not None:
-            query = query.filter(Book.price <= Decimal(str(max_price)))
-    except (InvalidOperation, TypeError):
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.INVALID_QUERY_PARAM,
-            message="min_price and max_price must be numeric values.",
-        )
-
-    if category_filter:
-        try:
-            category_id = int(category_filter)
-        except ValueError:
-            raise ApiError(
-                status_code=400,
-                code=ErrorCodes.INVALID_QUERY_PARAM,
-                message="category_id query parameter must be numeric.",
-            )
-        query = query.filter(Book.category_id == category_id)
-
-    if author_filter:
-        try:
-            author_id = int(author_filter)
-        except ValueError:
-            raise ApiError(
-                status_code=400,
-                code=ErrorCodes.INVALID_QUERY_PARAM,
-                message="author_id query parameter must be numeric.",
-            )
-        query = query.filter(Book.author_id == author_id)
-
-    books, meta = apply_pagination_and_sort(
-        query=query,
-        model=Book,
-        default_sort_field="created_at",
-        default_sort_dir="DESC",
-    )
-
-    content = [_book_to_dict(b) for b in books]
+    content = [book_to_dict(b) for b in books]
 
     response = {
         "content": content,
         **meta,
     }
+    # facets=true: 현재 검색 조건의 카테고리/저자/가격대/상태별 건수 (쿼리 1회)
+    if wants_facets(request.args):
+        bands = price_bands()
+        rows = db.session.execute(book_facets_query(filters, bands))
+        response["facets"] = build_facets(rows, bands, int(current_app.config.get("BOOK_FACET_LIMIT", 20)))
     return jsonify(response), 200
 
 
+# 베스트셀러 / 트렌딩 순위 (사전 집계 테이블에서 top-k 조회)
+@bp.route("/rankings", methods=["GET"])
+@replica_read
+@use_query(RANKING_QUERY)
+def book_rankings(query):
+    scope = query["scope"]
+    category_id = query.get("category_id")
+    limit = min(query.get("limit", 10), 100)
+
+    return jsonify({
+        "scope": scope,
+        "category_id": category_id,
+        "content": top_books(scope, category_id, limit),
+    }), 200
+
+
+# 검색어 자동완성 (제목/저자명/ISBN 접두어, 판매량 순)
+@bp.route("/suggest", methods=["GET"])
+@use_query(SUGGEST_QUERY)
+def suggest(query):
+    q = query["q"]
+    limit = min(query.get("limit", int(current_app.config.get("SUGGEST_LIMIT", 10))), 50)
+    return jsonify({"q": q, "content": suggest_books(q, limit)}), 200
+
+
 # 단일 도서 조회
 @bp.route("/<int:book_id>", methods=["GET"])
+@replica_read
 def get_book(book_id):
     book = Book.query.get(book_id)
     if not book:
@@ -223,13 +208,26 @@ def get_book(book_id):
             message="Book could not be found.",
         )
 
-    return jsonify(_book_to_dict(book)), 200
+    return jsonify(book_to_dict(book)), 200
+
+
+# 함께 구매한 도서 (오프라인 배치 결과 + TTL 캐시)
+@bp.route("/<int:book_id>/recommendations", methods=["GET"])
+@replica_read
+@use_query(LIMIT_QUERY)
+def book_recommendations(book_id, query):
+    limit = min(query.get("limit", 10), 50)
+    return jsonify({
+        "book_id": book_id,
+        "content": get_recommendations(book_id, limit),
+    }), 200
 
 
 # 도서 수정 (ADMIN 전용)
 @bp.route("/<int:book_id>", methods=["PUT"])
 @jwt_required(role="ADMIN")
-def update_book(book_id):
+@use_body(BOOK_UPDATE)
+def update_book(book_id, body):
     book = Book.query.get(book_id)
     if not book:
         raise ApiError(
@@ -238,47 +236,38 @@ def update_book(book_id):
             message="Book could not be found.",
         )
 
-    data = request.get_json() or {}
-
-    if "category_id" in data:
-        category = Category.query.get(data["category_id"])
+    if "category_id" in body:
+        category = Category.query.get(body["category_id"])
         if not category:
             raise ApiError(
                 status_code=404,
                 code=ErrorCodes.RESOURCE_NOT_FOUND,
                 message="Category could not be found.",
-                details={"category_id": data["category_id"]},
+                details={"category_id": body["category_id"]},
             )
         book.category_id = category.id
 
-    if "author_id" in data:
-        author = Author.query.get(data["author_id"])
+    if "category_ids" in body:
+        _set_extra_categories(book, body["category_ids"])
+
+    if "author_id" in body:
+        author = Author.query.get(body["author_id"])
         if not author:
             raise ApiError(
                 status_code=404,
                 code=ErrorCodes.RESOURCE_NOT_FOUND,
                 message="Author could not be found.",
-                details={"author_id": data["author_id"]},
+                details={"author_id": body["author_id"]},
             )
         book.author_id = author.id
 
-    if "title" in data:
-        book.title = data["title"]
-    if "description" in data:
-        book.description = data["description"]
-    if "price" in data:
-        book.price = _parse_decimal(data["price"], "price")
-    if "isbn13" in data:
-        book.isbn13 = data["isbn13"]
-    if "published_at" in data:
-        book.published_at = _parse_date(data["published_at"], "published_at")
-    if "stock_cnt" in data:
-        book.stock_cnt = _parse_int(data["stock_cnt"], "stock_cnt", min_value=0)
-    if "status" in data:
-        book.status = data["status"]
+    # 검증된 단순 컬럼은 보낸 필드만 반영
+    for field in ("title", "description", "price", "isbn13", "published_at", "stock_cnt", "status"):
+        if field in body:
+            setattr(book, field, body[field])
 
     db.session.commit()
-    return jsonify(_book_to_dict(book)), 200
+    return jsonify(book_to_dict(book)), 200
 
 
 # 도서 삭제 (ADMIN 전용)
@@ -293,7 +282,23 @@ def delete_book(book_id):
             message="Book could not be found.",
         )
 
+    # 판매 집계/추천은 도서에서 파생된 데이터라 함께 지운다.
+    db.session.execute(delete(BookSalesDaily).where(BookSalesDaily.book_id == book_id))
+    db.session.execute(delete(BookSalesRanking).where(BookSalesRanking.book_id == book_id))
+    db.session.execute(delete(BookRecommendation).where(
+        or_(BookRecommendation.book_id == book_id, BookRecommendation.related_book_id == book_id)
+    ))
     db.session.delete(book)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # 주문/리뷰/장바구니 등이 아직 참조하는 도서 (FK 제약)
+        db.session.rollback()
+        raise ApiError(
+            status_code=409,
+            code=ErrorCodes.STATE_CONFLICT,
+            message="Book is still referenced by orders, reviews or carts.",
+        )
+    forget_book(book_id)
 
     return jsonify({"message": "Book deleted."}), 200
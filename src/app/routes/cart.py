@@ -1,77 +1,76 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, jsonify
+from sqlalchemy import DateTime, literal, select
 from ..extensions import db
-from ..models import Cart, User, Book
+from ..db_utils import upsert_increment_from_select
+from ..models import Cart, Book
+from ..auth_utils import jwt_required
+from ..schemas import CART_ADD, CART_UPDATE
+from ..validation import use_body
 
 bp = Blueprint("cart", __name__)
 
 
-@bp.route("", methods=["POST"])
-def add_to_cart():
-    data = request.get_json() or {}
-
-    user_id = data.get("user_id")
-    book_id = data.get("book_id")
-    quantity = data.get("quantity", 1)
-
-    if not user_id or not book_id:
-        return jsonify({"message": "user_id, book_id 는 필수입니다."}), 400
-
-    try:
-        quantity = int(quantity)
-    except ValueError:
-        return jsonify({"message": "quantity 는 정수여야 합니다."}), 400
-
-    if quantity < 1:
-        return jsonify({"message": "quantity 는 최소 1 이상이어야 합니다."}), 400
+def _own_cart_item(item_id: int):
+    """로그인한 사용자의 장바구니 항목만 조회 (다른 사용자 항목은 없는 것으로 취급)"""
+    return Cart.query.filter(
+        Cart.id == item_id,
+        Cart.user_id == g.current_user.id,
+        Cart.deleted_at.is_(None),
+    ).first()
 
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
 
-    book = Book.query.get(book_id)
-    if not book:
+@bp.route("", methods=["POST"])
+@jwt_required()
+@use_body(CART_ADD)
+def add_to_cart(body):
+    user_id = g.current_user.id
+    book_id = body["book_id"]
+    quantity = body["quantity"]
+    now = datetime.utcnow()
+
+    # 한 문장으로 담기: 단가는 books 에서 바로 읽고, 이미 담긴 도서면 수량을 더하고 단가를 최신 가격으로 동기화
+    source = select(
+        literal(user_id), Book.id, literal(quantity), Book.price, literal(now, DateTime), literal(now, DateTime),
+    ).where(Book.id == book_id)
+    written = upsert_increment_from_select(
+        Cart,
+        ["user_id", "book_id", "quantity", "unit_price", "created_at", "updated_at"],
+        source,
+        conflict_columns=["user_id", "book_id", "is_active"],
+        increment_columns=["quantity"],
+        value_columns=["unit_price", "updated_at"],
+    )
+    if not written:
         return jsonify({"message": "도서를 찾을 수 없습니다."}), 404
 
-    existing = Cart.query.filter(
+    # 같은 트랜잭션에서 방금 쓴 행을 읽는다 (커밋 전이라 다른 요청의 증가분과 섞이지 않음)
+    cart_item = Cart.query.filter(
         Cart.user_id == user_id,
         Cart.book_id == book_id,
         Cart.deleted_at.is_(None)
-    ).first()
-
-    if existing:
-        existing.quantity += quantity
-        existing.unit_price = book.price  # 최신 가격으로 동기화
-        db.session.commit()
-        return jsonify({"message": "장바구니 수량이 증가했습니다."}), 200
-
-    cart_item = Cart(
-        user_id=user_id,
-        book_id=book_id,
-        quantity=quantity,
-        unit_price=book.price,
-    )
-    db.session.add(cart_item)
-    db.session.commit()
-
-    return jsonify({
+    ).one()
+    created = cart_item.quantity == quantity  # 기존 행이면 수량(>= 1)이 더해져 있다
+    result = {
         "id": cart_item.id,
         "user_id": cart_item.user_id,
         "book_id": cart_item.book_id,
         "quantity": cart_item.quantity,
         "unit_price": str(cart_item.unit_price),
         "created_at": cart_item.created_at.isoformat()
-    }), 201
+    }
+    db.session.commit()
+
+    if not created:
+        return jsonify({"message": "장바구니 수량이 증가했습니다."}), 200
+    return jsonify(result), 201
 
 
 @bp.route("", methods=["GET"])
+@jwt_required()
 def list_cart():
-    user_id = request.args.get("user_id")
-    if not user_id:
-        return jsonify({"message": "user_id 쿼리 파라미터는 필수입니다."}), 400
-
     items = Cart.query.filter(
-        Cart.user_id == user_id,
+        Cart.user_id == g.current_user.id,
         Cart.deleted_at.is_(None)
     ).order_by(Cart.created_at.desc()).all()
 
@@ -90,35 +89,24 @@ def list_cart():
 
 
 @bp.route("/<int:item_id>", methods=["PUT"])
-def update_cart_item(item_id):
-    cart_item = Cart.query.get(item_id)
-    if not cart_item or cart_item.deleted_at is not None:
+@jwt_required()
+@use_body(CART_UPDATE)
+def update_cart_item(item_id, body):
+    cart_item = _own_cart_item(item_id)
+    if not cart_item:
         return jsonify({"message": "장바구니 항목을 찾을 수 없습니다."}), 404
 
-    data = request.get_json() or {}
-    quantity = data.get("quantity")
-
-    if quantity is None:
-        return jsonify({"message": "quantity 는 필수입니다."}), 400
-
-    try:
-        quantity = int(quantity)
-    except ValueError:
-        return jsonify({"message": "quantity 는 정수여야 합니다."}), 400
-
-    if quantity < 1:
-        return jsonify({"message": "quantity 는 최소 1 이상이어야 합니다."}), 400
-
-    cart_item.quantity = quantity
+    cart_item.quantity = body["quantity"]
     db.session.commit()
 
     return jsonify({"message": "장바구니 수량이 수정되었습니다."}), 200
 
 
 @bp.route("/<int:item_id>", methods=["DELETE"])
+@jwt_required()
 def delete_cart_item(item_id):
-    cart_item = Cart.query.get(item_id)
-    if not cart_item or cart_item.deleted_at is not None:
+    cart_item = _own_cart_item(item_id)
+    if not cart_item:
         return jsonify({"message": "장바구니 항목을 찾을 수 없습니다."}), 404
 
     cart_item.deleted_at = datetime.utcnow()
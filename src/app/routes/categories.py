@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from ..extensions import db
-from ..models import Category
+from ..models import BookSalesRanking, Category
+from ..db_routing import replica_read
+from ..category_tree import category_path, detach_node, move_node
 
 bp = Blueprint("categories", __name__)
 
@@ -11,6 +15,8 @@ def create_category():
     name = data.get("name")
     slug = data.get("slug")
 
+    parent_id = data.get("parent_id")
+
     if not name or not slug:
         return jsonify({"message": "name, slug 는 필수입니다."}), 400
 
@@ -18,7 +24,10 @@ def create_category():
     if Category.query.filter((Category.name == name) | (Category.slug == slug)).first():
         return jsonify({"message": "이미 존재하는 카테고리 이름 또는 슬러그입니다."}), 409
 
-    category = Category(name=name, slug=slug)
+    if parent_id is not None and not Category.query.get(parent_id):
+        return jsonify({"message": "상위 카테고리를 찾을 수 없습니다."}), 404
+
+    category = Category(name=name, slug=slug, parent_id=parent_id)
     db.session.add(category)
     db.session.commit()
 
@@ -26,20 +35,23 @@ def create_category():
         "id": category.id,
         "name": category.name,
         "slug": category.slug,
+        "parent_id": category.parent_id,
     }), 201
 
 
 @bp.route("", methods=["GET"])
+@replica_read
 def list_categories():
     categories = Category.query.all()
     result = [
-        {"id": c.id, "name": c.name, "slug": c.slug}
+        {"id": c.id, "name": c.name, "slug": c.slug, "parent_id": c.parent_id}
         for c in categories
     ]
     return jsonify(result), 200
 
 
 @bp.route("/<int:category_id>", methods=["GET"])
+@replica_read
 def get_category(category_id):
     category = Category.query.get(category_id)
     if not category:
@@ -49,6 +61,8 @@ def get_category(category_id):
         "id": category.id,
         "name": category.name,
         "slug": category.slug,
+        "parent_id": category.parent_id,
+        "path": category_path(category.id),
     }), 200
 
 
@@ -61,6 +75,17 @@ def update_category(category_id):
     data = request.get_json() or {}
     category.name = data.get("name", category.name)
     category.slug = data.get("slug", category.slug)
+
+    # parent_id 변경 시 서브트리째 이동 (자기 자신/자손 아래로는 이동 불가)
+    if "parent_id" in data and data["parent_id"] != category.parent_id:
+        parent_id = data["parent_id"]
+        if parent_id is not None and not Category.query.get(parent_id):
+            return jsonify({"message": "상위 카테고리를 찾을 수 없습니다."}), 404
+        try:
+            move_node(category, parent_id)
+        except ValueError:
+            db.session.rollback()
+            return jsonify({"message": "자기 자신이나 하위 카테고리 아래로 이동할 수 없습니다."}), 409
     db.session.commit()
 
     return jsonify({"message": "카테고리 정보가 수정되었습니다."}), 200
@@ -72,7 +97,20 @@ def delete_category(category_id):
     if not category:
         return jsonify({"message": "카테고리를 찾을 수 없습니다."}), 404
 
+    if Category.query.filter(Category.parent_id == category.id).first():
+        return jsonify({"message": "하위 카테고리가 있는 카테고리는 삭제할 수 없습니다."}), 409
+
+    detach_node(category)
+    # 랭킹의 category_id 는 다음 판매 때 갱신되는 사본이라 비워 둔다.
+    db.session.execute(
+        update(BookSalesRanking).where(BookSalesRanking.category_id == category.id).values(category_id=None)
+    )
     db.session.delete(category)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # books.category_id 가 아직 참조하는 카테고리 (FK 제약)
+        db.session.rollback()
+        return jsonify({"message": "도서가 남아 있는 카테고리는 삭제할 수 없습니다."}), 409
 
     return jsonify({"message": "카테고리가 삭제되었습니다."}), 200
@@ -1,29 +1,37 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, jsonify
 from ..extensions import db
-from ..models import Comment, Review, User
+from ..models import Comment, Review
+from ..auth_utils import jwt_required, require_owner_or_admin
+from ..db_routing import replica_read
+from ..schemas import COMMENT_CREATE, COMMENT_UPDATE
+from ..validation import use_body
 
 bp = Blueprint("comments", __name__)
 
 
-@bp.route("/reviews/<int:review_id>/comments", methods=["POST"])
-def create_comment(review_id):
-    data = request.get_json() or {}
+def comment_to_dict(comment: Comment) -> dict:
+    return {
+        "id": comment.id,
+        "review_id": comment.review_id,
+        "user_id": comment.user_id,
+        "content": comment.content,
+        "parent_id": comment.parent_id,
+        "created_at": comment.created_at.isoformat()
+    }
 
-    user_id = data.get("user_id")
-    content = data.get("content")
-    parent_id = data.get("parent_id")
 
-    if not user_id or not content:
-        return jsonify({"message": "user_id, content 는 필수입니다."}), 400
+@bp.route("/reviews/<int:review_id>/comments", methods=["POST"])
+@jwt_required()
+@use_body(COMMENT_CREATE)
+def create_comment(review_id, body):
+    parent_id = body.get("parent_id")
 
+    # 삭제(soft delete)된 리뷰/댓글은 FK 로 걸러지지 않으므로 직접 확인한다.
     review = Review.query.get(review_id)
     if not review or review.deleted_at is not None:
         return jsonify({"message": "리뷰를 찾을 수 없습니다."}), 404
 
-    if not User.query.get(user_id):
-        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
-
     parent = None
     if parent_id:
         parent = Comment.query.get(parent_id)
@@ -32,8 +40,8 @@ def create_comment(review_id):
 
     comment = Comment(
         review_id=review_id,
-        user_id=user_id,
-        content=content,
+        user_id=g.current_user.id,
+        content=body["content"],
         parent=parent,
     )
     db.session.add(comment)
@@ -50,6 +58,7 @@ def create_comment(review_id):
 
 
 @bp.route("/reviews/<int:review_id>/comments", methods=["GET"])
+@replica_read
 def list_comments(review_id):
     review = Review.query.get(review_id)
     if not review or review.deleted_at is not None:
@@ -60,42 +69,33 @@ def list_comments(review_id):
         Comment.deleted_at.is_(None)
     ).order_by(Comment.created_at.asc()).all()
 
-    result = []
-    for c in comments:
-        result.append({
-            "id": c.id,
-            "review_id": c.review_id,
-            "user_id": c.user_id,
-            "content": c.content,
-            "parent_id": c.parent_id,
-            "created_at": c.created_at.isoformat()
-        })
+    result = [comment_to_dict(c) for c in comments]
 
     return jsonify(result), 200
 
 
 @bp.route("/comments/<int:comment_id>", methods=["PUT"])
-def update_comment(comment_id):
+@jwt_required()
+@use_body(COMMENT_UPDATE)
+def update_comment(comment_id, body):
     comment = Comment.query.get(comment_id)
     if not comment or comment.deleted_at is not None:
         return jsonify({"message": "댓글을 찾을 수 없습니다."}), 404
+    require_owner_or_admin(comment.user_id, "본인 댓글만 수정할 수 있습니다.")
 
-    data = request.get_json() or {}
-    content = data.get("content")
-    if not content:
-        return jsonify({"message": "content 는 필수입니다."}), 400
-
-    comment.content = content
+    comment.content = body["content"]
     db.session.commit()
 
     return jsonify({"message": "댓글이 수정되었습니다."}), 200
 
 
 @bp.route("/comments/<int:comment_id>", methods=["DELETE"])
+@jwt_required()
 def delete_comment(comment_id):
     comment = Comment.query.get(comment_id)
     if not comment or comment.deleted_at is not None:
         return jsonify({"message": "댓글을 찾을 수 없습니다."}), 404
+    require_owner_or_admin(comment.user_id, "본인 댓글만 삭제할 수 있습니다.")
 
     comment.deleted_at = datetime.utcnow()
     db.session.commit()
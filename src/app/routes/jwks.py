@@ -0,0 +1,24 @@
+from flask import Blueprint, Response, request
+
+from ..jwt_keys import get_keyring
+
+bp = Blueprint("jwks", __name__)
+
+
+@bp.route("/jwks.json", methods=["GET"])
+def jwks():
+    """
+    엣지 서비스가 토큰을 로컬에서 검증할 수 있도록 공개키(JWK Set)를 제공.
+    본문은 키 링 로드 시 한 번만 직렬화되며 ETag/Cache-Control 로 캐시된다.
+    """
+    keyring = get_keyring()
+    headers = {
+        "Cache-Control": f"public, max-age={keyring.jwks_max_age}",
+        "ETag": f'"{keyring.jwks_etag}"',
+    }
+
+    # 압축 응답은 약한 ETag (W/"...") 로 나가므로 약한 비교를 쓴다.
+    if request.if_none_match.contains_weak(keyring.jwks_etag):
+        return Response(status=304, headers=headers)
+
+    return Response(keyring.jwks_body, mimetype="application/json", headers=headers)
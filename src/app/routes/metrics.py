@@ -0,0 +1,20 @@
+from flask import Blueprint, Response
+
+from ..metrics import get_metrics
+from ..error_handlers import ApiError
+from ..error_codes import ErrorCodes
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.route("", methods=["GET"])
+def prometheus_metrics():
+    metrics = get_metrics()
+    if metrics is None:
+        raise ApiError(
+            status_code=404,
+            code=ErrorCodes.RESOURCE_NOT_FOUND,
+            message="Metrics are disabled.",
+        )
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -1,17 +1,24 @@
-from datetime import datetime
 from decimal import Decimal
 
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy.orm import selectinload
+
 from ..extensions import db
 from ..models import Order, OrderItem, User, Book
 from ..auth_utils import jwt_required
 from ..error_handlers import ApiError
 from ..error_codes import ErrorCodes
 from ..pagination import apply_pagination_and_sort
+from ..db_routing import replica_read
+from ..order_summary import GLOBAL_USER_ID, summarize
+from ..order_events import order_created
+from ..order_status import ORDER_TRANSITIONS, can_transition, transition_orders
+from ..schemas import ORDER_BATCH_QUERY, ORDER_BULK_STATUS, ORDER_CREATE, ORDER_STATUS, ORDER_SUMMARY_QUERY
+from ..validation import use_body, use_query
 
 bp = Blueprint("orders", __name__)
 
-ALLOWED_STATUSES = {"PENDING", "PAID", "CANCELLED", "SHIPPED", "COMPLETED"}
+ORDER_EXPANDS = {"items.book"}
 
 
 def decimal_to_str(value):
@@ -24,7 +31,8 @@ def decimal_to_str(value):
 
 @bp.route("", methods=["POST"])
 @jwt_required()   # 로그인한 사용자만 주문 생성 가능
-def create_order():
+@use_body(ORDER_CREATE)
+def create_order(body):
     """
     주문 생성
     요청 예시:
@@ -36,24 +44,7 @@ def create_order():
       ]
     }
     """
-    data = request.get_json() or {}
-
-    user_id = data.get("user_id")
-    if not user_id:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message="user_id 는 필수입니다.",
-        )
-
-    try:
-        user_id_int = int(user_id)
-    except ValueError:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.INVALID_QUERY_PARAM,
-            message="user_id 는 정수여야 합니다.",
-        )
+    user_id_int = body["user_id"]
 
     # 본인 또는 ADMIN만 해당 user_id로 주문 생성 가능
     if user_id_int != g.current_user.id and g.current_user.role != "ADMIN":
@@ -71,44 +62,13 @@ def create_order():
             message="사용자를 찾을 수 없습니다.",
         )
 
-    items = data.get("items", [])
-    if not items:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message="주문할 items 배열은 비어 있을 수 없습니다.",
-        )
-
     order_items: list[OrderItem] = []
     total_amount = Decimal("0")
 
     # 재고 체크 및 주문 항목 생성
-    for item in items:
-        book_id = item.get("book_id")
-        quantity = item.get("quantity", 1)
-
-        if not book_id:
-            raise ApiError(
-                status_code=400,
-                code=ErrorCodes.VALIDATION_FAILED,
-                message="각 항목의 book_id 는 필수입니다.",
-            )
-
-        try:
-            quantity = int(quantity)
-        except ValueError:
-            raise ApiError(
-                status_code=400,
-                code=ErrorCodes.VALIDATION_FAILED,
-                message="quantity 는 정수여야 합니다.",
-            )
-
-        if quantity < 1:
-            raise ApiError(
-                status_code=400,
-                code=ErrorCodes.VALIDATION_FAILED,
-                message="quantity 는 최소 1 이상이어야 합니다.",
-            )
+    for item in body["items"]:
+        book_id = item["book_id"]
+        quantity = item["quantity"]
 
         book = Book.query.get(book_id)
         if not book:
@@ -157,6 +117,7 @@ def create_order():
         if book and book.stock_cnt is not None:
             book.stock_cnt -= oi.quantity
 
+    order_created(order)
     db.session.commit()
 
     return jsonify({
@@ -169,6 +130,7 @@ def create_order():
 
 @bp.route("", methods=["GET"])
 @jwt_required()   # 자신의 주문만 기본 조회 (관리자는 전체 조회 가능하게 확장 가능)
+@replica_read
 def list_orders():
     """
     주문 목록 조회
@@ -220,6 +182,123 @@ def list_orders():
     return jsonify(response), 200
 
 
+@bp.route("/summary", methods=["GET"])
+@jwt_required()
+@replica_read
+@use_query(ORDER_SUMMARY_QUERY)
+def order_summary(query):
+    """
+    주문 요약 (상태별 / 월별 건수와 금액)
+    쿼리 파라미터:
+      - user_id (ADMIN 만 다른 사용자 지정 가능)
+      - scope=global (ADMIN 전용, 전체 사용자 합계)
+    """
+    is_admin = g.current_user.role == "ADMIN"
+    scope = query.get("scope", "user")
+    if scope not in ("user", "global"):
+        raise ApiError(
+            status_code=400,
+            code=ErrorCodes.INVALID_QUERY_PARAM,
+            message="scope 는 user 또는 global 이어야 합니다.",
+        )
+
+    if scope == "global":
+        if not is_admin:
+            raise ApiError(
+                status_code=403,
+                code=ErrorCodes.FORBIDDEN,
+                message="전체 주문 요약은 관리자만 조회할 수 있습니다.",
+            )
+        user_id = GLOBAL_USER_ID
+    else:
+        user_id = g.current_user.id
+        if "user_id" in query and is_admin:
+            user_id = query["user_id"]
+
+    return jsonify({
+        "scope": scope,
+        "user_id": None if scope == "global" else user_id,
+        **summarize(user_id),
+    }), 200
+
+
+def parse_expand(args) -> set[str]:
+    expand = {value.strip() for value in args.get("expand", "").split(",") if value.strip()}
+    unknown = expand - ORDER_EXPANDS
+    if unknown:
+        raise ApiError(
+            status_code=400,
+            code=ErrorCodes.INVALID_QUERY_PARAM,
+            message="지원하지 않는 expand 값입니다.",
+            details={"unknown": sorted(unknown), "allowed": sorted(ORDER_EXPANDS)},
+        )
+    return expand
+
+
+def order_detail_query(expand: set[str]):
+    """주문 + 항목 (+ 도서) 를 selectinload 로 읽는 쿼리 (N+1 방지)"""
+    items_loader = selectinload(Order.items)
+    if "items.book" in expand:
+        items_loader = items_loader.selectinload(OrderItem.book)
+    return Order.query.options(items_loader).filter(Order.deleted_at.is_(None))
+
+
+def order_item_to_dict(item: OrderItem, expand: set[str]) -> dict:
+    data = {
+        "id": item.id,
+        "book_id": item.book_id,
+        "quantity": item.quantity,
+        "unit_price": decimal_to_str(item.unit_price),
+        "created_at": item.created_at.isoformat(),
+    }
+    if "items.book" in expand:
+        book = item.book
+        data["book"] = {
+            "id": book.id,
+            "title": book.title,
+            "price": decimal_to_str(book.price),
+            "isbn13": book.isbn13,
+            "status": book.status,
+            "author_id": book.author_id,
+            "category_id": book.category_id,
+        } if book else None
+    return data
+
+
+def order_detail_to_dict(order: Order, expand: set[str]) -> dict:
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "status": order.status,
+        "total_amount": decimal_to_str(order.total_amount),
+        "paid_at": order.paid_at.isoformat() if order.paid_at else None,
+        "created_at": order.created_at.isoformat(),
+        "updated_at": order.updated_at.isoformat(),
+        "items": [order_item_to_dict(item, expand) for item in order.items],
+    }
+
+
+@bp.route("/batch", methods=["GET"])
+@jwt_required(role="ADMIN")
+@use_query(ORDER_BATCH_QUERY)
+def get_order_details_batch(query):
+    """
+    여러 주문 상세를 한 번에 조회 (ADMIN 콘솔용)
+    쿼리 파라미터:
+      - ids=1,2,3 (최대 ORDER_BATCH_MAX_IDS 개)
+      - expand=items.book
+    """
+    expand = parse_expand(request.args)
+    ids = list(dict.fromkeys(query["ids"]))
+
+    orders = {o.id: o for o in order_detail_query(expand).filter(Order.id.in_(ids))}
+
+    return jsonify({
+        "content": [order_detail_to_dict(orders[i], expand) for i in ids if i in orders],
+        "missing": [i for i in ids if i not in orders],
+    }), 200
+
+
 @bp.route("/<int:order_id>", methods=["GET"])
 @jwt_required()
 def get_order_detail(order_id):
@@ -227,9 +306,11 @@ def get_order_detail(order_id):
     주문 상세 조회 (주문 + 주문항목)
     - 일반 유저: 자신의 주문만 조회 가능
     - ADMIN: 아무 주문이나 조회 가능
+    - expand=items.book: 각 항목에 도서 요약 포함
     """
-    order = Order.query.get(order_id)
-    if not order or order.deleted_at is not None:
+    expand = parse_expand(request.args)
+    order = order_detail_query(expand).filter(Order.id == order_id).first()
+    if not order:
         raise ApiError(
             status_code=404,
             code=ErrorCodes.RESOURCE_NOT_FOUND,
@@ -243,35 +324,78 @@ def get_order_detail(order_id):
             message="본인의 주문만 조회할 수 있습니다.",
         )
 
-    items = []
-    for item in order.items.order_by(OrderItem.id.asc()).all():
-        items.append({
-            "id": item.id,
-            "book_id": item.book_id,
-            "quantity": item.quantity,
-            "unit_price": decimal_to_str(item.unit_price),
-            "created_at": item.created_at.isoformat(),
-        })
+    return jsonify(order_detail_to_dict(order, expand)), 200
+
+
+def _invalid_transition(from_status: str, to_status: str):
+    if from_status == "CANCELLED":
+        return ApiError(
+            status_code=409,
+            code=ErrorCodes.STATE_CONFLICT,
+            message="취소된 주문은 상태를 변경할 수 없습니다.",
+        )
+    return ApiError(
+        status_code=409,
+        code=ErrorCodes.STATE_CONFLICT,
+        message="허용되지 않는 상태 전이입니다.",
+        details={
+            "from": from_status,
+            "to": to_status,
+            "allowed": sorted(ORDER_TRANSITIONS.get(from_status, set())),
+        },
+    )
+
+
+@bp.route("/status", methods=["PATCH"])
+@jwt_required(role="ADMIN")
+@use_body(ORDER_BULK_STATUS)
+def bulk_update_order_status(body):
+    """
+    주문 상태 일괄 변경 (ADMIN 전용)
+    요청 바디 예시:
+    { "order_ids": [1, 2, 3], "from": "PAID", "to": "SHIPPED" }
+
+    from 상태인 주문만 UPDATE 한 번으로 변경하고, 주문별 결과를 돌려준다.
+      - updated: 변경됨
+      - not_found: 없거나 삭제된 주문
+      - conflict: 현재 상태가 from 과 다름 (status 에 현재 상태)
+    """
+    from_status, to_status = body["from_status"], body["to_status"]
+    if not can_transition(from_status, to_status):
+        raise _invalid_transition(from_status, to_status)
+
+    order_ids = list(dict.fromkeys(body["order_ids"]))
+
+    updated, current = transition_orders(order_ids, from_status, to_status)
+    db.session.commit()
+
+    moved = set(updated)
+    results = []
+    for order_id in order_ids:
+        if order_id in moved:
+            results.append({"id": order_id, "result": "updated", "status": to_status})
+        elif order_id in current:
+            results.append({"id": order_id, "result": "conflict", "status": current[order_id]})
+        else:
+            results.append({"id": order_id, "result": "not_found", "status": None})
 
     return jsonify({
-        "id": order.id,
-        "user_id": order.user_id,
-        "status": order.status,
-        "total_amount": decimal_to_str(order.total_amount),
-        "paid_at": order.paid_at.isoformat() if order.paid_at else None,
-        "created_at": order.created_at.isoformat(),
-        "updated_at": order.updated_at.isoformat(),
-        "items": items,
+        "from": from_status,
+        "to": to_status,
+        "updated": updated,
+        "results": results,
     }), 200
 
 
 @bp.route("/<int:order_id>/status", methods=["PATCH"])
 @jwt_required(role="ADMIN")
-def update_order_status(order_id):
+@use_body(ORDER_STATUS)
+def update_order_status(order_id, body):
     """
     주문 상태 변경 (ADMIN 전용)
     요청 바디 예시:
     { "status": "PAID" }
+    허용 전이는 ORDER_TRANSITIONS 참고 (취소 시 재고 복원)
     """
     order = Order.query.get(order_id)
     if not order or order.deleted_at is not None:
@@ -281,35 +405,15 @@ def update_order_status(order_id):
             message="주문을 찾을 수 없습니다.",
         )
 
-    data = request.get_json() or {}
-    new_status = data.get("status")
-
-    if not new_status:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.VALIDATION_FAILED,
-            message="status 필드는 필수입니다.",
-        )
-
-    if new_status not in ALLOWED_STATUSES:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.UNPROCESSABLE_ENTITY,
-            message="허용되지 않는 주문 상태입니다.",
-            details={"allowed": sorted(ALLOWED_STATUSES)},
-        )
-
-    if order.status == "CANCELLED":
-        raise ApiError(
-            status_code=409,
-            code=ErrorCodes.STATE_CONFLICT,
-            message="취소된 주문은 상태를 변경할 수 없습니다.",
-        )
+    new_status = body["status"]
 
-    if new_status == "PAID" and order.paid_at is None:
-        order.paid_at = datetime.utcnow()
+    if not can_transition(order.status, new_status):
+        raise _invalid_transition(order.status, new_status)
 
-    order.status = new_status
+    updated, current = transition_orders([order.id], order.status, new_status)
+    if not updated:
+        # 조회 이후 다른 요청이 먼저 상태를 바꾼 경우
+        raise _invalid_transition(current.get(order.id, order.status), new_status)
     db.session.commit()
 
     return jsonify({
@@ -1,45 +1,40 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+from flask import Blueprint, g, jsonify
+from sqlalchemy import DateTime, literal, select
 from ..extensions import db
-from ..models import Review, User, ReviewLike
+from ..models import Review, ReviewLike
+from ..auth_utils import jwt_required
+from ..db_utils import insert_ignore_from_select
 
 bp = Blueprint("review_likes", __name__)
 
 
 @bp.route("/<int:review_id>/like", methods=["POST"])
+@jwt_required()
 def like_review(review_id):
-    data = request.get_json() or {}
-    user_id = data.get("user_id")
-
-    if not user_id:
-        return jsonify({"message": "user_id 는 필수입니다."}), 400
-
-    review = Review.query.get(review_id)
-    if not review or review.deleted_at is not None:
-        return jsonify({"message": "리뷰를 찾을 수 없습니다."}), 404
-
-    if not User.query.get(user_id):
-        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
-
-    existing = ReviewLike.query.filter_by(user_id=user_id, review_id=review_id).first()
-    if existing:
+    # 리뷰 확인 + 중복 확인 + INSERT 를 한 문장으로: (user_id, review_id) PK 가 중복을 걸러낸다.
+    result = insert_ignore_from_select(
+        ReviewLike,
+        ["user_id", "review_id", "created_at"],
+        select(literal(g.current_user.id), Review.id, literal(datetime.utcnow(), DateTime)).where(
+            Review.id == review_id, Review.deleted_at.is_(None)
+        ),
+    )
+    if not result.rowcount:
+        db.session.rollback()
+        review = db.session.get(Review, review_id)
+        if not review or review.deleted_at is not None:
+            return jsonify({"message": "리뷰를 찾을 수 없습니다."}), 404
         return jsonify({"message": "이미 좋아요를 누른 리뷰입니다."}), 409
-
-    like = ReviewLike(user_id=user_id, review_id=review_id)
-    db.session.add(like)
     db.session.commit()
 
     return jsonify({"message": "리뷰에 좋아요를 추가했습니다."}), 201
 
 
 @bp.route("/<int:review_id>/like", methods=["DELETE"])
+@jwt_required()
 def unlike_review(review_id):
-    data = request.get_json() or {}
-    user_id = data.get("user_id")
-
-    if not user_id:
-        return jsonify({"message": "user_id 는 필수입니다."}), 400
-
-    like = ReviewLike.query.filter_by(user_id=user_id, review_id=review_id).first()
+    like = ReviewLike.query.filter_by(user_id=g.current_user.id, review_id=review_id).first()
     if not like:
         return jsonify({"message": "좋아요 기록을 찾을 수 없습니다."}), 404
 
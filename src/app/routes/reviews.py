@@ -1,42 +1,59 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, request, jsonify
 from ..extensions import db
-from ..models import Review, Book, User
+from ..models import Review
+from ..auth_utils import jwt_required, require_owner_or_admin
+from ..db_utils import commit_or_404
 from ..pagination import apply_pagination_and_sort
-from ..error_handlers import ApiError
-from ..error_codes import ErrorCodes
+from ..db_routing import replica_read
+from ..schemas import REVIEW_CREATE, REVIEW_LIST_QUERY, REVIEW_UPDATE
+from ..validation import load_query, use_body
 
 bp = Blueprint("reviews", __name__)
 
 
-@bp.route("", methods=["POST"])
-def create_review():
-    data = request.get_json() or {}
+def review_to_dict(review: Review) -> dict:
+    return {
+        "id": review.id,
+        "book_id": review.book_id,
+        "user_id": review.user_id,
+        "rating": review.rating,
+        "title": review.title,
+        "content": review.content,
+        "created_at": review.created_at.isoformat()
+    }
 
-    book_id = data.get("book_id")
-    user_id = data.get("user_id")
-    rating = data.get("rating")
 
-    if not book_id or not user_id or rating is None:
-        return jsonify({"message": "book_id, user_id, rating 은 필수입니다."}), 400
+def build_review_filters(args) -> list:
+    """리뷰 목록 조건 (동기/ASGI 라우트 공용)"""
+    filters = [Review.deleted_at.is_(None)]
 
-    if not (1 <= int(rating) <= 5):
-        return jsonify({"message": "rating 은 1~5 사이의 정수여야 합니다."}), 400
+    params = load_query(REVIEW_LIST_QUERY, args)
+    if "book_id" in params:
+        filters.append(Review.book_id == params["book_id"])
+    if "user_id" in params:
+        filters.append(Review.user_id == params["user_id"])
+    if "min_rating" in params:
+        filters.append(Review.rating >= params["min_rating"])
+    if "max_rating" in params:
+        filters.append(Review.rating <= params["max_rating"])
 
-    if not Book.query.get(book_id):
-        return jsonify({"message": "도서를 찾을 수 없습니다."}), 404
-    if not User.query.get(user_id):
-        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
+    return filters
 
+
+@bp.route("", methods=["POST"])
+@jwt_required()
+@use_body(REVIEW_CREATE)
+def create_review(body):
     review = Review(
-        book_id=book_id,
-        user_id=user_id,
-        rating=rating,
-        title=data.get("title"),
-        content=data.get("content"),
+        book_id=body["book_id"],
+        user_id=g.current_user.id,
+        rating=body["rating"],
+        title=body.get("title"),
+        content=body.get("content"),
     )
     db.session.add(review)
-    db.session.commit()
+    commit_or_404("도서를 찾을 수 없습니다.")  # 없는 book_id 는 FK 제약이 거부
 
     return jsonify({
         "id": review.id,
@@ -50,6 +67,7 @@ def create_review():
 
 
 @bp.route("", methods=["GET"])
+@replica_read
 def list_reviews():
     """
     리뷰 목록 조회
@@ -60,29 +78,7 @@ def list_reviews():
       - page, size
       - sort=created_at,DESC
     """
-    query = Review.query.filter(Review.deleted_at.is_(None))
-
-    book_id = request.args.get("book_id")
-    user_id = request.args.get("user_id")
-    min_rating = request.args.get("min_rating")
-    max_rating = request.args.get("max_rating")
-
-    if book_id:
-        query = query.filter(Review.book_id == book_id)
-    if user_id:
-        query = query.filter(Review.user_id == user_id)
-
-    try:
-        if min_rating is not None:
-            query = query.filter(Review.rating >= int(min_rating))
-        if max_rating is not None:
-            query = query.filter(Review.rating <= int(max_rating))
-    except ValueError:
-        raise ApiError(
-            status_code=400,
-            code=ErrorCodes.INVALID_QUERY_PARAM,
-            message="min_rating, max_rating 은 정수여야 합니다.",
-        )
+    query = Review.query.filter(*build_review_filters(request.args))
 
     reviews, meta = apply_pagination_and_sort(
         query=query,
@@ -91,17 +87,7 @@ def list_reviews():
         default_sort_dir="DESC",
     )
 
-    result = []
-    for r in reviews:
-        result.append({
-            "id": r.id,
-            "book_id": r.book_id,
-            "user_id": r.user_id,
-            "rating": r.rating,
-            "title": r.title,
-            "content": r.content,
-            "created_at": r.created_at.isoformat()
-        })
+    result = [review_to_dict(r) for r in reviews]
 
     response = {
         "content": result,
@@ -111,6 +97,7 @@ def list_reviews():
 
 
 @bp.route("/<int:review_id>", methods=["GET"])
+@replica_read
 def get_review(review_id):
     review = Review.query.get(review_id)
     if not review or review.deleted_at is not None:
@@ -129,31 +116,29 @@ def get_review(review_id):
 
 
 @bp.route("/<int:review_id>", methods=["PUT"])
-def update_review(review_id):
+@jwt_required()
+@use_body(REVIEW_UPDATE)
+def update_review(review_id, body):
     review = Review.query.get(review_id)
     if not review or review.deleted_at is not None:
         return jsonify({"message": "리뷰를 찾을 수 없습니다."}), 404
+    require_owner_or_admin(review.user_id, "본인 리뷰만 수정할 수 있습니다.")
 
-    data = request.get_json() or {}
-
-    if "rating" in data:
-        rating = int(data["rating"])
-        if not (1 <= rating <= 5):
-            return jsonify({"message": "rating 은 1~5 사이의 정수여야 합니다."}), 400
-        review.rating = rating
-
-    review.title = data.get("title", review.title)
-    review.content = data.get("content", review.content)
+    review.rating = body.get("rating", review.rating)
+    review.title = body.get("title", review.title)
+    review.content = body.get("content", review.content)
 
     db.session.commit()
     return jsonify({"message": "리뷰가 수정되었습니다."}), 200
 
 
 @bp.route("/<int:review_id>", methods=["DELETE"])
+@jwt_required()
 def delete_review(review_id):
     review = Review.query.get(review_id)
     if not review or review.deleted_at is not None:
         return jsonify({"message": "리뷰를 찾을 수 없습니다."}), 404
+    require_owner_or_admin(review.user_id, "본인 리뷰만 삭제할 수 있습니다.")
 
     review.deleted_at = datetime.utcnow()
     db.session.commit()
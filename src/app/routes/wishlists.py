@@ -1,50 +1,50 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, jsonify
+from sqlalchemy import DateTime, literal, select
 from ..extensions import db
-from ..models import Wishlist, User, Book
+from ..models import Book, Wishlist
+from ..auth_utils import jwt_required
+from ..db_utils import insert_ignore_from_select
+from ..schemas import WISHLIST_ADD
+from ..validation import use_body
 
 bp = Blueprint("wishlists", __name__)
 
 
 @bp.route("", methods=["POST"])
-def add_to_wishlist():
-    data = request.get_json() or {}
-
-    user_id = data.get("user_id")
-    book_id = data.get("book_id")
-
-    if not user_id or not book_id:
-        return jsonify({"message": "user_id, book_id 는 필수입니다."}), 400
-
-    if not User.query.get(user_id):
-        return jsonify({"message": "사용자를 찾을 수 없습니다."}), 404
-    if not Book.query.get(book_id):
-        return jsonify({"message": "도서를 찾을 수 없습니다."}), 404
-
-    # 이미 찜한 항목인지 확인(soft delete 안 된 것만)
-    existing = Wishlist.query.filter(
-        Wishlist.user_id == user_id,
-        Wishlist.book_id == book_id,
-        Wishlist.deleted_at.is_(None),
-    ).first()
-    if existing:
+@jwt_required()
+@use_body(WISHLIST_ADD)
+def add_to_wishlist(body):
+    user_id = g.current_user.id
+    book_id = body["book_id"]
+    now = datetime.utcnow()
+
+    # 중복 확인 후 INSERT 하던 것을 한 문장으로: 이미 찜한 도서는 유니크 키가 걸러낸다.
+    result = insert_ignore_from_select(
+        Wishlist,
+        ["user_id", "book_id", "created_at"],
+        select(literal(user_id), Book.id, literal(now, DateTime)).where(Book.id == book_id),
+    )
+    if not result.rowcount:
+        db.session.rollback()
+        if db.session.get(Book, book_id) is None:
+            return jsonify({"message": "도서를 찾을 수 없습니다."}), 404
         return jsonify({"message": "이미 위시리스트에 존재하는 도서입니다."}), 409
-
-    wishlist = Wishlist(user_id=user_id, book_id=book_id)
-    db.session.add(wishlist)
+    wishlist_id = result.lastrowid
     db.session.commit()
 
     return jsonify({
-        "id": wishlist.id,
-        "user_id": wishlist.user_id,
-        "book_id": wishlist.book_id,
-        "created_at": wishlist.created_at.isoformat()
+        "id": wishlist_id,
+        "user_id": user_id,
+        "book_id": book_id,
+        "created_at": now.isoformat()
     }), 201
 
 
 @bp.route("", methods=["GET"])
+@jwt_required(role="ADMIN")
 def list_all_wishlists():
-    """간단 전체 조회 (관리자용 느낌, 나중에 ADMIN 권한으로 제한 가능)"""
+    """전체 위시리스트 조회 (ADMIN 전용)"""
     wishlists = Wishlist.query.filter(Wishlist.deleted_at.is_(None)).all()
     result = [
         {
@@ -59,14 +59,11 @@ def list_all_wishlists():
 
 
 @bp.route("/me", methods=["GET"])
+@jwt_required()
 def list_my_wishlist():
-    """user_id 기준 사용자 위시리스트 조회 (나중에 JWT로 교체)"""
-    user_id = request.args.get("user_id")
-    if not user_id:
-        return jsonify({"message": "user_id 쿼리 파라미터는 필수입니다."}), 400
-
+    """로그인한 사용자의 위시리스트 조회"""
     wishlists = Wishlist.query.filter(
-        Wishlist.user_id == user_id,
+        Wishlist.user_id == g.current_user.id,
         Wishlist.deleted_at.is_(None)
     ).all()
 
@@ -83,9 +80,14 @@ def list_my_wishlist():
 
 
 @bp.route("/<int:wishlist_id>", methods=["DELETE"])
+@jwt_required()
 def delete_wishlist_item(wishlist_id):
-    wishlist = Wishlist.query.get(wishlist_id)
-    if not wishlist or wishlist.deleted_at is not None:
+    wishlist = Wishlist.query.filter(
+        Wishlist.id == wishlist_id,
+        Wishlist.user_id == g.current_user.id,
+        Wishlist.deleted_at.is_(None),
+    ).first()
+    if not wishlist:
         return jsonify({"message": "위시리스트 항목을 찾을 수 없습니다."}), 404
 
     wishlist.deleted_at = datetime.utcnow()
@@ -0,0 +1,156 @@
+"""
+Request schemas, one instance per endpoint built at import time.
+
+Query schemas list only the filter parameters; page/size/sort stay with
+pagination.parse_pagination_args (which clamps instead of rejecting).
+"""
+from marshmallow import fields, validate
+from webargs.fields import DelimitedList
+
+from .order_status import ORDER_STATUSES
+from .rankings import RANKING_SCOPES
+from .validation import RequestSchema
+
+ORDER_BATCH_MAX_IDS = 100
+ORDER_BULK_MAX_IDS = 5000
+SUGGEST_MAX_QUERY_LENGTH = 100
+
+
+def _positive_int(**kwargs):
+    """ids and quantities: integers >= 1 ("3" is accepted, like int() was)."""
+    return fields.Integer(validate=validate.Range(min=1), **kwargs)
+
+
+# ---- books ---------------------------------------------------------------------
+class BookSchema(RequestSchema):
+    title = fields.String(required=True, validate=validate.Length(min=1, max=255))
+    description = fields.String(allow_none=True)
+    price = fields.Decimal(required=True, validate=validate.Range(min=0))
+    isbn13 = fields.String(allow_none=True, validate=validate.Length(max=13))
+    published_at = fields.Date(allow_none=True)
+    stock_cnt = fields.Integer(load_default=0, validate=validate.Range(min=0))
+    status = fields.String(load_default="ACTIVE", validate=validate.Length(min=1, max=20))
+    category_id = _positive_int(required=True)
+    author_id = _positive_int(required=True)
+    category_ids = fields.List(_positive_int())
+
+
+class BookListQuery(RequestSchema):
+    keyword = fields.String()
+    status = fields.String()
+    min_price = fields.Decimal()
+    max_price = fields.Decimal()
+    category_id = fields.Integer()
+    author_id = fields.Integer()
+
+
+class LimitQuery(RequestSchema):
+    limit = fields.Integer(validate=validate.Range(min=1))
+
+
+class RankingQuery(LimitQuery):
+    scope = fields.String(load_default="all", validate=validate.OneOf(list(RANKING_SCOPES)))
+    category_id = fields.Integer()
+
+
+class SuggestQuery(LimitQuery):
+    q = fields.String(required=True, validate=validate.Length(min=1, max=SUGGEST_MAX_QUERY_LENGTH))
+
+
+BOOK_CREATE = BookSchema()
+BOOK_UPDATE = BookSchema(partial=True)
+BOOK_LIST_QUERY = BookListQuery()
+LIMIT_QUERY = LimitQuery()
+RANKING_QUERY = RankingQuery()
+SUGGEST_QUERY = SuggestQuery()
+
+
+# ---- cart ----------------------------------------------------------------------
+class CartAddSchema(RequestSchema):
+    book_id = _positive_int(required=True)
+    quantity = _positive_int(load_default=1)
+
+
+class CartUpdateSchema(RequestSchema):
+    quantity = _positive_int(required=True)
+
+
+CART_ADD = CartAddSchema()
+CART_UPDATE = CartUpdateSchema()
+
+
+# ---- reviews -------------------------------------------------------------------
+class ReviewSchema(RequestSchema):
+    book_id = _positive_int(required=True)
+    rating = fields.Integer(required=True, validate=validate.Range(min=1, max=5))
+    title = fields.String(allow_none=True, validate=validate.Length(max=255))
+    content = fields.String(allow_none=True)
+
+
+class ReviewListQuery(RequestSchema):
+    book_id = fields.Integer()
+    user_id = fields.Integer()
+    min_rating = fields.Integer()
+    max_rating = fields.Integer()
+
+
+REVIEW_CREATE = ReviewSchema()
+REVIEW_UPDATE = ReviewSchema(partial=True, only=("rating", "title", "content"))
+REVIEW_LIST_QUERY = ReviewListQuery()
+
+
+# ---- comments / wishlists ------------------------------------------------------
+class CommentSchema(RequestSchema):
+    content = fields.String(required=True, validate=validate.Length(min=1))
+    parent_id = _positive_int(allow_none=True)
+
+
+class WishlistAddSchema(RequestSchema):
+    book_id = _positive_int(required=True)
+
+
+COMMENT_CREATE = CommentSchema()
+COMMENT_UPDATE = CommentSchema(only=("content",))
+WISHLIST_ADD = WishlistAddSchema()
+
+
+# ---- orders --------------------------------------------------------------------
+class OrderItemSchema(RequestSchema):
+    book_id = _positive_int(required=True)
+    quantity = _positive_int(load_default=1)
+
+
+class OrderCreateSchema(RequestSchema):
+    user_id = _positive_int(required=True)
+    items = fields.List(fields.Nested(OrderItemSchema), required=True, validate=validate.Length(min=1))
+
+
+def _order_status(**kwargs):
+    return fields.String(required=True, validate=validate.OneOf(sorted(ORDER_STATUSES)), **kwargs)
+
+
+class OrderStatusSchema(RequestSchema):
+    status = _order_status()
+
+
+class OrderBulkStatusSchema(RequestSchema):
+    order_ids = fields.List(_positive_int(), required=True, validate=validate.Length(min=1, max=ORDER_BULK_MAX_IDS))
+    from_status = _order_status(data_key="from")
+    to_status = _order_status(data_key="to")
+
+
+class OrderBatchQuery(RequestSchema):
+    ids = DelimitedList(fields.Integer(), required=True, validate=validate.Length(min=1, max=ORDER_BATCH_MAX_IDS))
+    expand = fields.String()
+
+
+class OrderSummaryQuery(RequestSchema):
+    user_id = fields.Integer()
+    scope = fields.String()
+
+
+ORDER_CREATE = OrderCreateSchema()
+ORDER_STATUS = OrderStatusSchema()
+ORDER_BULK_STATUS = OrderBulkStatusSchema()
+ORDER_BATCH_QUERY = OrderBatchQuery()
+ORDER_SUMMARY_QUERY = OrderSummaryQuery()
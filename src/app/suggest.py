@@ -0,0 +1,224 @@
+"""
+Typeahead suggestions for `GET /books/suggest?q=`.
+
+Normalized keys (the title and its word suffixes, the author name and its
+word suffixes, the ISBN digits) are kept in one sorted list, so a prefix is
+a `bisect` range instead of an `ILIKE '%q%'` scan. Matches are ranked by
+all-time sales (book_sales_rankings, scope "all").
+
+Normalization is NFKD + casefold with combining marks dropped, so accents
+are ignored and Hangul is compared jamo by jamo: "ㅍ", "파" and "파ㅇ" are
+all prefixes of "파이썬", and a final consonant still being typed ("한")
+also matches as the next syllable's initial ("하나").
+"""
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from flask import current_app
+from sqlalchemy import select
+
+from .book_index import BookIndex, track_book_changes
+from .extensions import db
+from .models import Author, Book, BookSalesRanking
+
+MAX_WORD_KEYS = 4  # 제목/저자명에서 단어 시작 위치별로 넣는 키 수 (메모리 상한)
+DENSE_RANGE = 2000  # 접두어 범위가 이보다 크면 인기순 목록을 앞에서부터 훑는다
+KEY_END = "\U0010ffff"
+
+JONGSEONG = "HANGUL JONGSEONG "
+CHOSEONG = "HANGUL CHOSEONG "
+
+
+def normalize(text: str | None) -> str:
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text).casefold()
+    chars = [
+        ch if ch.isalnum() else " "
+        for ch in decomposed
+        if unicodedata.category(ch) != "Mn"
+    ]
+    return " ".join("".join(chars).split())
+
+
+def _as_initial(jamo: str) -> str | None:
+    """Final consonant → the same consonant as the next syllable's initial (ᆪ → ᆨ + ᄉ)."""
+    name = unicodedata.name(jamo, "")
+    if not name.startswith(JONGSEONG):
+        return None
+    parts = name[len(JONGSEONG):].split("-")
+    try:
+        if len(parts) == 1:
+            return unicodedata.lookup(CHOSEONG + parts[0])
+        return unicodedata.lookup(JONGSEONG + parts[0]) + unicodedata.lookup(CHOSEONG + parts[1])
+    except KeyError:
+        return None
+
+
+def query_prefixes(q: str) -> list[str]:
+    prefix = normalize(q)
+    if not prefix:
+        return []
+    prefixes = [prefix]
+    initial = _as_initial(prefix[-1])
+    if initial is not None:
+        prefixes.append(prefix[:-1] + initial)
+    digits = prefix.replace(" ", "")
+    if digits.isdigit() and digits != prefix:
+        prefixes.append(digits)  # "978-89 ..." 처럼 구분자가 섞인 ISBN
+    return prefixes
+
+
+def _word_keys(text: str) -> list[str]:
+    words = text.split()
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_KEYS))]
+
+
+def book_keys(title: str | None, author_name: str | None, isbn13: str | None) -> set[str]:
+    keys = set(_word_keys(normalize(title)))
+    keys.update(_word_keys(normalize(author_name)))
+    if isbn13:
+        keys.add("".join(ch for ch in isbn13 if ch.isdigit()))
+    keys.discard("")
+    return keys
+
+
+SUGGEST_COLUMNS = (Book.id, Book.title, Book.isbn13, Author.name, Book.updated_at)
+
+
+class SuggestIndex(BookIndex):
+    def __init__(self, refresh_seconds: float = 30.0):
+        super().__init__(refresh_seconds)
+        self._keys: list[str] = []
+        self._ids = array("q")
+        self._book_keys: dict[int, set[str]] = {}
+        self._display: dict[int, tuple] = {}
+        self._popularity: dict[int, int] = {}
+        self._ranked: list[int] = []
+
+    # ---- storage -------------------------------------------------------------
+    def _insert(self, key: str, book_id: int):
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._ids.insert(position, book_id)
+
+    def _delete(self, key: str, book_id: int):
+        position = bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position] == key:
+            if self._ids[position] == book_id:
+                del self._keys[position]
+                del self._ids[position]
+                return
+            position += 1
+
+    def _put(self, row):
+        book_id, title, isbn13, author_name, updated_at = row
+        keys = book_keys(title, author_name, isbn13)
+        old = self._book_keys.get(book_id, set())
+        for key in old - keys:
+            self._delete(key, book_id)
+        for key in keys - old:
+            self._insert(key, book_id)
+        if book_id not in self._book_keys:
+            self._ranked.append(book_id)  # 다음 인기도 갱신 전까지는 맨 뒤
+        self._book_keys[book_id] = keys
+        self._display[book_id] = (title, author_name, isbn13)
+        self._advance(updated_at)
+
+    def _remove(self, book_id: int):
+        for key in self._book_keys.pop(book_id, ()):
+            self._delete(key, book_id)
+        self._display.pop(book_id, None)
+
+    # ---- refresh -------------------------------------------------------------
+    def _load(self, conn):
+        pairs, self._book_keys, self._display = [], {}, {}
+        for row in conn.execute(
+            select(*SUGGEST_COLUMNS).join(Author, Author.id == Book.author_id).execution_options(yield_per=10_000)
+        ):
+            book_id, title, isbn13, author_name, updated_at = row
+            keys = book_keys(title, author_name, isbn13)
+            pairs.extend((key, book_id) for key in keys)
+            self._book_keys[book_id] = keys
+            self._display[book_id] = (title, author_name, isbn13)
+            self._advance(updated_at)
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids = array("q", (book_id for _, book_id in pairs))
+        self._rank()
+
+    def _reload(self, conn, book_ids: list[int]):
+        rows = {
+            row[0]: tuple(row) for row in conn.execute(
+                select(*SUGGEST_COLUMNS).join(Author, Author.id == Book.author_id).where(Book.id.in_(book_ids))
+            )
+        }
+        with self._lock:
+            for book_id in book_ids:
+                if book_id in rows:
+                    self._put(rows[book_id])
+                else:
+                    self._remove(book_id)
+
+    def _after_poll(self, conn):
+        popularity = dict(conn.execute(
+            select(BookSalesRanking.book_id, BookSalesRanking.quantity).where(BookSalesRanking.scope == "all")
+        ).all())
+        with self._lock:
+            self._popularity = popularity
+            self._rank()
+
+    def _rank(self):
+        self._ranked = sorted(self._book_keys, key=lambda book_id: (-self._popularity.get(book_id, 0), book_id))
+
+    def book_count(self) -> int:
+        with self._lock:
+            return len(self._book_keys)
+
+    # ---- query ---------------------------------------------------------------
+    def suggest(self, q: str, limit: int = 10) -> list[dict]:
+        prefixes = query_prefixes(q)
+        if not prefixes:
+            return []
+        with self._lock:
+            ranges = [
+                (bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + KEY_END))
+                for prefix in prefixes
+            ]
+            if sum(hi - lo for lo, hi in ranges) <= DENSE_RANGE:
+                matched = {self._ids[i] for lo, hi in ranges for i in range(lo, hi)}
+                ids = sorted(matched, key=lambda book_id: (-self._popularity.get(book_id, 0), book_id))[:limit]
+            else:
+                # 짧은 접두어: 일치하는 도서가 많으므로 인기순으로 훑으면 금방 limit 개가 찬다.
+                ids = []
+                for book_id in self._ranked:
+                    keys = self._book_keys.get(book_id)
+                    if keys and any(key.startswith(prefix) for key in keys for prefix in prefixes):
+                        ids.append(book_id)
+                        if len(ids) == limit:
+                            break
+            return [
+                {"id": book_id, "title": title, "author_name": author_name, "isbn13": isbn13}
+                for book_id in ids
+                for title, author_name, isbn13 in (self._display[book_id],)
+            ]
+
+
+def get_suggest_index(app=None) -> SuggestIndex:
+    app = app or current_app._get_current_object()
+    index = app.extensions.get("book_suggest")
+    if index is None:
+        index = app.extensions.setdefault("book_suggest", SuggestIndex(
+            refresh_seconds=float(app.config.get("SUGGEST_REFRESH_SECONDS", 30)),
+        ))
+    return index
+
+
+def suggest_books(q: str, limit: int) -> list[dict]:
+    index = get_suggest_index()
+    index.ensure_fresh(db.engine)
+    return index.suggest(q, limit)
+
+
+track_book_changes("book_suggest")
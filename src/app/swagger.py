@@ -1,9 +1,12 @@
+import hashlib
 import json
 from pathlib import Path
 
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, Response, current_app, jsonify, request
 from flask_swagger_ui import get_swaggerui_blueprint
 
+from .compression import CODECS, STATIC_LEVELS, compress, negotiate_encoding
+
 
 swagger_spec_bp = Blueprint("swagger_spec", __name__)
 
@@ -13,21 +16,50 @@ def _default_spec_path() -> Path:
     return root / "docs" / "swagger.json"
 
 
+class PrecompressedSpec:
+    """swagger.json serialized once, plus one copy per available encoding at the highest level."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open(encoding="utf-8") as fp:
+            self.body = json.dumps(json.load(fp), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(self.body).hexdigest()[:16]
+        self.encoded = {encoding: compress(self.body, encoding, STATIC_LEVELS[encoding]) for encoding in CODECS}
+
+
+def _load_spec(app, path: Path) -> PrecompressedSpec | None:
+    spec = app.extensions.get("swagger_spec")
+    if spec is None or spec.path != path:
+        if not path.exists():
+            return None
+        spec = app.extensions["swagger_spec"] = PrecompressedSpec(path)
+    return spec
+
+
 @swagger_spec_bp.route("/swagger.json")
 def swagger_json():
     spec_path = Path(current_app.config.get("SWAGGER_SPEC_PATH", _default_spec_path()))
 
-    if not spec_path.exists():
+    spec = _load_spec(current_app, spec_path)
+    if spec is None:
         return jsonify({"error": "Swagger spec not found.", "path": str(spec_path)}), 404
 
-    with spec_path.open(encoding="utf-8") as fp:
-        data = json.load(fp)
-    return jsonify(data)
+    headers = {"Vary": "Accept-Encoding", "ETag": f'W/"{spec.etag}"', "Cache-Control": "public, max-age=300"}
+    if request.if_none_match.contains_weak(spec.etag):
+        return Response(status=304, headers=headers)
+    encoding = None
+    if current_app.config.get("COMPRESSION_ENABLED", True):
+        encoding = negotiate_encoding(encodings=spec.encoded)
+    if encoding is None:
+        return Response(spec.body, mimetype="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(spec.encoded[encoding], mimetype="application/json", headers=headers)
 
 
 def register_swagger(app):
     """
     Mounts swagger.json and Swagger UI (/docs by default) onto the Flask app.
+    The spec is read and precompressed once here instead of on every request.
     """
 
     swagger_url = app.config.get("SWAGGER_UI_URL", "/docs")
@@ -41,3 +73,4 @@ def register_swagger(app):
 
     app.register_blueprint(swagger_spec_bp)
     app.register_blueprint(swaggerui_bp, url_prefix=swagger_url)
+    _load_spec(app, Path(app.config.get("SWAGGER_SPEC_PATH", _default_spec_path())))
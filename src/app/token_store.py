@@ -0,0 +1,277 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from time import monotonic
+
+from flask import current_app
+
+from .extensions import db
+from .error_handlers import ApiError
+from .error_codes import ErrorCodes
+from .jwt_utils import create_token, new_jti
+from .metrics import record_cache_access
+from .models import RefreshToken
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (bytearray bitset, blake2b-derived hashes)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: str):
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class TokenStore:
+    """
+    Refresh-token rotation with family revocation.
+
+    Revoked family ids are mirrored into a bloom filter, so the common case
+    (token not revoked) is answered in memory without touching the database.
+    Bloom hits are confirmed through a bounded LRU and, on miss, one indexed
+    query. Other workers' revocations are pulled every `sync_seconds`.
+
+    `revoked_at` is stamped before the revoking transaction commits, so each
+    sync re-reads `sync_seconds + sync_margin_seconds` before the previous
+    one: a revocation committed late (or by a worker with a skewed clock)
+    is still picked up. Re-adding a family to the bloom filter is harmless.
+    """
+
+    def __init__(self, bloom_capacity: int = 100_000, lru_size: int = 10_000, sync_seconds: float = 5.0,
+                 sync_margin_seconds: float = 60.0):
+        self.bloom_capacity = bloom_capacity
+        self.lru_size = lru_size
+        self.sync_seconds = sync_seconds
+        self.sync_margin_seconds = sync_margin_seconds
+
+        self._lock = threading.Lock()
+        self._bloom: BloomFilter | None = None
+        self._lru: OrderedDict[str, bool] = OrderedDict()
+        self._synced_at: datetime | None = None
+        self._synced_mono = 0.0
+
+    # ---- revocation cache -------------------------------------------------
+    def _rebuild(self):
+        bloom = BloomFilter(self.bloom_capacity)
+        now = datetime.utcnow()
+        rows = (
+            db.session.query(RefreshToken.family_id)
+            .filter(RefreshToken.revoked_at.isnot(None), RefreshToken.expires_at > now)
+            .distinct()
+        )
+        for (family_id,) in rows:
+            bloom.add(family_id)
+        with self._lock:
+            self._bloom = bloom
+            self._lru.clear()
+            self._synced_at = now
+            self._synced_mono = monotonic()
+
+    def _sync(self):
+        if self._bloom is None:
+            self._rebuild()
+            return
+        if monotonic() - self._synced_mono < self.sync_seconds:
+            return
+
+        now = datetime.utcnow()
+        since = self._synced_at - timedelta(seconds=self.sync_seconds + self.sync_margin_seconds)
+        rows = (
+            db.session.query(RefreshToken.family_id)
+            .filter(RefreshToken.revoked_at >= since)
+            .distinct()
+        )
+        with self._lock:
+            for (family_id,) in rows:
+                self._bloom.add(family_id)
+                self._lru.pop(family_id, None)
+            self._synced_at = now
+            self._synced_mono = monotonic()
+
+    def _remember(self, family_id: str, revoked: bool):
+        with self._lock:
+            self._lru[family_id] = revoked
+            self._lru.move_to_end(family_id)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def is_revoked(self, family_id: str | None) -> bool:
+        if not family_id:
+            return False
+        self._sync()
+        if family_id not in self._bloom:
+            return False
+
+        with self._lock:
+            cached = self._lru.get(family_id)
+        record_cache_access("token_revocation", cached is not None)
+        if cached is not None:
+            return cached
+
+        revoked = db.session.query(
+            RefreshToken.query.filter(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.isnot(None),
+            ).exists()
+        ).scalar()
+        self._remember(family_id, bool(revoked))
+        return bool(revoked)
+
+    # ---- issuing / rotation -----------------------------------------------
+    def _store_refresh(self, user, family_id: str) -> tuple[str, str]:
+        jti = new_jti()
+        token = create_token(user.id, user.role, "refresh", jti=jti, family_id=family_id)
+        db.session.add(RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user.id,
+            expires_at=datetime.utcnow() + timedelta(days=current_app.config["JWT_REFRESH_EXPIRES_DAYS"]),
+        ))
+        return jti, token
+
+    def issue(self, user) -> dict:
+        """Start a new token family (login)."""
+        family_id = new_jti()
+        _, refresh_token = self._store_refresh(user, family_id)
+        db.session.commit()
+        return {
+            "access_token": create_token(user.id, user.role, "access", family_id=family_id),
+            "refresh_token": refresh_token,
+        }
+
+    def rotate(self, payload: dict, user) -> dict:
+        """
+        Exchange a refresh token for a new pair. Presenting a token that was
+        already rotated means it leaked: the whole family is revoked.
+        """
+        row = RefreshToken.query.filter_by(jti=payload.get("jti")).first()
+        if row is None or row.user_id != user.id:
+            raise ApiError(
+                status_code=401,
+                code=ErrorCodes.UNAUTHORIZED,
+                message="유효하지 않은 Refresh 토큰입니다.",
+            )
+
+        if row.revoked_at is not None:
+            raise ApiError(
+                status_code=401,
+                code=ErrorCodes.UNAUTHORIZED,
+                message="폐기된 Refresh 토큰입니다. 다시 로그인해주세요.",
+            )
+
+        if row.replaced_by is not None:
+            self.revoke_family(row.family_id)
+            raise ApiError(
+                status_code=401,
+                code=ErrorCodes.UNAUTHORIZED,
+                message="이미 사용된 Refresh 토큰입니다. 보안을 위해 세션을 종료했습니다.",
+            )
+
+        new_jti_value, refresh_token = self._store_refresh(user, row.family_id)
+        # 조건부 UPDATE 로 동시 회전 경쟁에서 하나만 성공하게 한다.
+        updated = RefreshToken.query.filter(
+            RefreshToken.id == row.id,
+            RefreshToken.replaced_by.is_(None),
+        ).update({"replaced_by": new_jti_value}, synchronize_session=False)
+        if not updated:
+            db.session.rollback()
+            self.revoke_family(row.family_id)
+            raise ApiError(
+                status_code=401,
+                code=ErrorCodes.UNAUTHORIZED,
+                message="이미 사용된 Refresh 토큰입니다. 보안을 위해 세션을 종료했습니다.",
+            )
+        db.session.commit()
+
+        return {
+            "access_token": create_token(user.id, user.role, "access", family_id=row.family_id),
+            "refresh_token": refresh_token,
+        }
+
+    def revoke_family(self, family_id: str):
+        RefreshToken.query.filter(
+            RefreshToken.family_id == family_id,
+            RefreshToken.revoked_at.is_(None),
+        ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+        if self._bloom is None:
+            self._rebuild()
+        with self._lock:
+            self._bloom.add(family_id)
+        self._remember(family_id, True)
+
+    # ---- maintenance ------------------------------------------------------
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete expired rows in small batches; returns the number of rows removed."""
+        removed = 0
+        while True:
+            ids = [
+                row_id for (row_id,) in db.session.query(RefreshToken.id)
+                .filter(RefreshToken.expires_at < datetime.utcnow())
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+            RefreshToken.query.filter(RefreshToken.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            removed += len(ids)
+        if removed:
+            # 블룸 필터는 삭제를 지원하지 않으므로 만료분을 정리한 뒤 다시 만든다.
+            self._rebuild()
+        return removed
+
+
+def get_token_store() -> TokenStore:
+    return current_app.extensions["token_store"]
+
+
+def _start_purge_thread(app, store: TokenStore, interval: float, batch_size: int):
+    stop = threading.Event()
+
+    def _run():
+        while not stop.wait(interval):
+            try:
+                with app.app_context():
+                    removed = store.purge_expired(batch_size=batch_size)
+                    if removed:
+                        app.logger.info("purged %d expired refresh tokens", removed)
+            except Exception:  # noqa: BLE001 - 백그라운드 스레드는 죽지 않도록
+                app.logger.exception("refresh token purge failed")
+
+    thread = threading.Thread(target=_run, name="refresh-token-purge", daemon=True)
+    thread.start()
+    return stop
+
+
+def register_token_store(app):
+    store = TokenStore(
+        bloom_capacity=int(app.config.get("TOKEN_REVOCATION_BLOOM_CAPACITY", 100_000)),
+        lru_size=int(app.config.get("TOKEN_REVOCATION_LRU_SIZE", 10_000)),
+        sync_seconds=float(app.config.get("TOKEN_REVOCATION_SYNC_SECONDS", 5)),
+        sync_margin_seconds=float(app.config.get("TOKEN_REVOCATION_SYNC_MARGIN_SECONDS", 60)),
+    )
+    app.extensions["token_store"] = store
+
+    interval = float(app.config.get("TOKEN_PURGE_INTERVAL_SECONDS", 0) or 0)
+    if interval > 0:
+        app.extensions["token_purge_stop"] = _start_purge_thread(
+            app, store, interval, int(app.config.get("TOKEN_PURGE_BATCH_SIZE", 1000))
+        )
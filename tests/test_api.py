@@ -78,6 +78,20 @@ def user_creds(client):
     return cfg["user_email"], cfg["user_password"]
 
 
+def user_headers(client):
+    email, pwd = user_creds(client)
+    return {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+
+def drain_outbox(client):
+    """Run queued outbox events (what `flask outbox worker` does in production)."""
+    from src.app.outbox import process_batch
+
+    with client.application.app_context():
+        while process_batch():
+            pass
+
+
 def get_book_id(client):
     return client.application.config["SEED_IDS"]["book_id"]
 
@@ -214,8 +228,23 @@ def test_delete_book_success(client):
     assert delete_resp.status_code == 200
 
 
+def test_delete_category_or_author_with_books_conflicts(client):
+    cfg = client.application.config["SEED_IDS"]
+    assert client.delete(f"/categories/{cfg['category_id']}").status_code == 409
+    assert client.delete(f"/authors/{cfg['author_id']}").status_code == 409
+    # 롤백되어 카테고리/클로저와 도서가 그대로 남는다
+    assert client.get(f"/categories/{cfg['category_id']}").status_code == 200
+    resp = client.get("/books", query_string={"category_id": cfg["category_id"]})
+    assert cfg["book_id"] in [b["id"] for b in resp.get_json()["content"]]
+
+    empty = client.post("/categories", json={"name": "Empty", "slug": "empty"}).get_json()
+    assert client.delete(f"/categories/{empty['id']}").status_code == 200
+    author = client.post("/authors", json={"name": "No Books"}).get_json()
+    assert client.delete(f"/authors/{author['id']}").status_code == 200
+
+
 def test_create_review_missing_fields(client):
-    resp = client.post("/reviews", json={"book_id": get_book_id(client)})
+    resp = client.post("/reviews", headers=user_headers(client), json={"book_id": get_book_id(client)})
     assert resp.status_code == 400
 
 
@@ -223,17 +252,20 @@ def test_create_review_success(client):
     cfg = client.application.config["SEED_IDS"]
     resp = client.post(
         "/reviews",
-        json={"book_id": cfg["book_id"], "user_id": cfg["user_id"], "rating": 5, "content": "Great!"},
+        headers=user_headers(client),
+        json={"book_id": cfg["book_id"], "rating": 5, "content": "Great!"},
     )
     assert resp.status_code == 201
     assert resp.get_json()["rating"] == 5
+    assert resp.get_json()["user_id"] == cfg["user_id"]
 
 
 def test_get_reviews_filtered(client):
     cfg = client.application.config["SEED_IDS"]
     client.post(
         "/reviews",
-        json={"book_id": cfg["book_id"], "user_id": cfg["user_id"], "rating": 4, "content": "Nice"},
+        headers=user_headers(client),
+        json={"book_id": cfg["book_id"], "rating": 4, "content": "Nice"},
     )
     resp = client.get("/reviews", query_string={"book_id": cfg["book_id"], "min_rating": 4})
     assert resp.status_code == 200
@@ -242,35 +274,106 @@ def test_get_reviews_filtered(client):
 
 def test_add_wishlist_success(client):
     cfg = client.application.config["SEED_IDS"]
-    resp = client.post("/wishlists", json={"user_id": cfg["user_id"], "book_id": cfg["book_id"]})
+    resp = client.post("/wishlists", headers=user_headers(client), json={"book_id": cfg["book_id"]})
     assert resp.status_code == 201
 
 
 def test_add_wishlist_duplicate(client):
     cfg = client.application.config["SEED_IDS"]
-    client.post("/wishlists", json={"user_id": cfg["user_id"], "book_id": cfg["book_id"]})
-    resp = client.post("/wishlists", json={"user_id": cfg["user_id"], "book_id": cfg["book_id"]})
+    headers = user_headers(client)
+    client.post("/wishlists", headers=headers, json={"book_id": cfg["book_id"]})
+    resp = client.post("/wishlists", headers=headers, json={"book_id": cfg["book_id"]})
     assert resp.status_code == 409
 
 
 def test_add_cart_invalid_quantity(client):
     cfg = client.application.config["SEED_IDS"]
-    resp = client.post(
-        "/cart",
-        json={"user_id": cfg["user_id"], "book_id": cfg["book_id"], "quantity": 0},
-    )
+    resp = client.post("/cart", headers=user_headers(client), json={"book_id": cfg["book_id"], "quantity": 0})
     assert resp.status_code == 400
 
 
 def test_add_cart_success(client):
     cfg = client.application.config["SEED_IDS"]
-    resp = client.post(
-        "/cart",
-        json={"user_id": cfg["user_id"], "book_id": cfg["book_id"], "quantity": 2},
-    )
+    resp = client.post("/cart", headers=user_headers(client), json={"book_id": cfg["book_id"], "quantity": 2})
     assert resp.status_code == 201
 
 
+def test_user_writes_are_scoped_to_token_user(client):
+    cfg = client.application.config["SEED_IDS"]
+    user = user_headers(client)
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    # 인증 없이는 쓰기 불가, 본문의 user_id 는 무시되고 토큰 사용자로 기록된다
+    assert client.post("/cart", json={"book_id": cfg["book_id"]}).status_code == 401
+    resp = client.post("/cart", headers=admin, json={"user_id": cfg["user_id"], "book_id": cfg["book_id"]})
+    assert resp.status_code == 201 and resp.get_json()["user_id"] != cfg["user_id"]
+    admin_item = resp.get_json()["id"]
+    assert client.get("/cart", headers=user).get_json() == []
+    # 다른 사용자의 장바구니 항목은 없는 것으로 취급
+    assert client.put(f"/cart/{admin_item}", headers=user, json={"quantity": 3}).status_code == 404
+    assert client.delete(f"/cart/{admin_item}", headers=user).status_code == 404
+
+    # 존재하지 않는 도서: 사전 조회 대신 FK 제약 위반이 404 로 변환된다
+    resp = client.post("/reviews", headers=user, json={"book_id": 999999, "rating": 3})
+    assert resp.status_code == 404 and resp.get_json()["code"] == "RESOURCE_NOT_FOUND"
+    assert client.post("/wishlists", headers=user, json={"book_id": 999999}).status_code == 404
+
+    review_id = client.post("/reviews", headers=user, json={"book_id": cfg["book_id"], "rating": 4}).get_json()["id"]
+    assert client.put(f"/reviews/{review_id}", headers=admin, json={"rating": 1}).status_code == 200
+    comment = client.post(f"/reviews/{review_id}/comments", headers=admin, json={"content": "관리자 답글"})
+    assert comment.status_code == 201
+    comment_id = comment.get_json()["id"]
+    assert client.put(f"/comments/{comment_id}", headers=user, json={"content": "x"}).status_code == 403
+    assert client.post(f"/reviews/{review_id}/like", headers=user).status_code == 201
+    assert client.delete(f"/reviews/{review_id}/like", headers=user).status_code == 200
+
+    # 리뷰/장바구니가 참조하는 도서는 삭제할 수 없다 (FK)
+    resp = client.delete(f"/books/{cfg['book_id']}", headers=admin)
+    assert resp.status_code == 409 and resp.get_json()["code"] == "STATE_CONFLICT"
+
+
+def test_concurrent_taps_do_not_duplicate_rows(client):
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+
+    from src.app.models import Cart, ReviewLike, Wishlist
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    headers = user_headers(client)
+    review_id = client.post("/reviews", headers=headers, json={"book_id": cfg["book_id"], "rating": 5}).get_json()["id"]
+    threads = 8
+    barrier = Barrier(threads)
+
+    def hammer(method, path, body=None, repeat=1):
+        barrier.wait()
+        with app.test_client() as thread_client:
+            return [thread_client.open(path, method=method, headers=headers, json=body).status_code
+                    for _ in range(repeat)]
+
+    def run(*args, **kwargs):
+        with ThreadPoolExecutor(threads) as pool:
+            futures = [pool.submit(hammer, *args, **kwargs) for _ in range(threads)]
+            return sorted(code for future in futures for code in future.result())
+
+    assert run("POST", "/wishlists", {"book_id": cfg["book_id"]}) == [201] + [409] * (threads - 1)
+    assert run("POST", f"/reviews/{review_id}/like") == [201] + [409] * (threads - 1)
+    cart_codes = run("POST", "/cart", {"book_id": cfg["book_id"], "quantity": 1}, repeat=3)
+    assert cart_codes.count(201) == 1 and cart_codes.count(200) == threads * 3 - 1
+
+    with app.app_context():
+        assert Wishlist.query.filter_by(user_id=cfg["user_id"]).count() == 1
+        assert ReviewLike.query.filter_by(review_id=review_id).count() == 1
+        items = Cart.query.filter_by(user_id=cfg["user_id"]).all()
+        assert [item.quantity for item in items] == [threads * 3]
+
+    # soft delete 된 항목은 유니크 키에서 빠지므로 다시 담을 수 있다
+    assert client.delete(f"/cart/{items[0].id}", headers=headers).status_code == 200
+    resp = client.post("/cart", headers=headers, json={"book_id": cfg["book_id"], "quantity": 2})
+    assert resp.status_code == 201 and resp.get_json()["quantity"] == 2
+
+
 def test_create_order_requires_auth(client):
     cfg = client.application.config["SEED_IDS"]
     resp = client.post("/orders", json={"user_id": cfg["user_id"], "items": [{"book_id": cfg["book_id"]}]})
@@ -306,3 +409,1113 @@ def test_list_orders_user_scope(client):
     resp = client.get("/orders", headers={"Authorization": f"Bearer {token}"})
     assert resp.status_code == 200
     assert resp.get_json()["totalElements"] >= 1
+
+
+def test_query_profiler_server_timing_header(client):
+    resp = client.get("/books")
+    assert resp.status_code == 200
+    assert resp.headers.get("Server-Timing", "").startswith("db;dur=")
+
+
+def test_slow_query_log_includes_route(client, caplog):
+    client.application.config["SLOW_QUERY_THRESHOLD_MS"] = 0.000001
+    with caplog.at_level("WARNING", logger="bookstore.slow_query"):
+        client.get("/books")
+    assert any("route=books.list_books" in r.getMessage() for r in caplog.records)
+
+
+def test_metrics_endpoint_exposes_request_histogram(client):
+    client.get("/books")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    body = resp.get_data(as_text=True)
+    assert 'http_requests_total{endpoint="/books",method="GET",status="200"} 1' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="/books",method="GET",le="+Inf"} 1' in body
+    assert "db_pool_checked_out" in body
+
+
+def test_metrics_multiproc_snapshots_are_summed(tmp_path):
+    from src.app.metrics import MetricsRegistry
+
+    worker_a = MetricsRegistry(multiproc_dir=str(tmp_path))
+    worker_a.inc("http_requests_total", (("endpoint", "/books"),), 2)
+    worker_a.observe("http_request_duration_seconds", (("endpoint", "/books"),), 0.02)
+    worker_a.flush()
+    # 다른 워커 스냅샷을 흉내낸다
+    (tmp_path / "metrics-1.json").write_text(
+        (tmp_path / f"metrics-{os.getpid()}.json").read_text(encoding="utf-8"), encoding="utf-8"
+    )
+
+    body = worker_a.render()
+    assert 'http_requests_total{endpoint="/books"} 4' in body
+    assert 'http_request_duration_seconds_count{endpoint="/books"} 2' in body
+
+
+def test_metrics_shards_of_finished_threads_are_retired():
+    import threading
+
+    from src.app.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    labels = (("endpoint", "/books"),)
+
+    def request_thread():  # 스레드 서버: 요청마다 새 스레드
+        registry.inc("http_requests_total", labels)
+        registry.observe("http_request_duration_seconds", labels, 0.02)
+
+    for _ in range(500):
+        thread = threading.Thread(target=request_thread)
+        thread.start()
+        thread.join()
+
+    assert len(registry._shards) < 64
+    body = registry.render()
+    assert 'http_requests_total{endpoint="/books"} 500' in body
+    assert 'http_request_duration_seconds_count{endpoint="/books"} 500' in body
+    assert len(registry._shards) == 0
+
+
+def test_login_rehashes_when_bcrypt_cost_changes(client):
+    email, pwd = user_creds(client)
+    client.application.config["BCRYPT_ROUNDS"] = 4
+    resp = client.post("/auth/login", json={"email": email, "password": pwd})
+    assert resp.status_code == 200
+    with client.application.app_context():
+        assert User.query.filter_by(email=email).first().password_hash.startswith("$2b$04$")
+    assert client.post("/auth/login", json={"email": email, "password": pwd}).status_code == 200
+
+
+def test_login_returns_503_when_hashing_queue_full(client):
+    email, pwd = user_creds(client)
+    client.application.config["PASSWORD_HASH_MAX_PENDING"] = 0
+    resp = client.post("/auth/login", json={"email": email, "password": pwd})
+    assert resp.status_code == 503
+    assert resp.get_json()["code"] == "SERVICE_UNAVAILABLE"
+
+
+def test_login_throttle_locks_account_before_hashing(client):
+    email, pwd = user_creds(client)
+    client.application.config["LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS"] = 2
+    for _ in range(3):
+        assert client.post("/auth/login", json={"email": email, "password": "wrong"}).status_code == 401
+
+    resp = client.post("/auth/login", json={"email": email, "password": pwd})
+    assert resp.status_code == 429
+    assert resp.get_json()["details"]["retry_after_seconds"] >= 1
+
+
+def test_login_unknown_email_counts_as_failure(client):
+    client.application.config["LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS"] = 0
+    resp = client.post("/auth/login", json={"email": "ghost@example.com", "password": "x"})
+    assert resp.status_code == 401
+    resp = client.post("/auth/login", json={"email": "ghost@example.com", "password": "x"})
+    assert resp.status_code == 429
+
+
+def test_login_unknown_email_does_not_hash_on_request_thread(client, monkeypatch):
+    import bcrypt
+    from src.app import password_hashing
+
+    def _no_hashing(*args):
+        raise AssertionError("dummy check must not compute a bcrypt hash")
+
+    monkeypatch.setattr(password_hashing, "_hashpw", _no_hashing)
+    client.application.config["BCRYPT_ROUNDS"] = 5
+    assert client.post("/auth/login", json={"email": "nobody@example.com", "password": "x"}).status_code == 401
+
+    dummy = password_hashing._dummy_hash(5)
+    assert password_hashing.hash_rounds(dummy.decode("utf-8")) == 5
+    assert bcrypt.checkpw(b"dummy-password", dummy) is False
+
+    client.application.config["PASSWORD_HASH_MAX_PENDING"] = 0
+    assert client.post("/auth/login", json={"email": "nobody@example.com", "password": "x"}).status_code == 503
+
+
+def test_login_throttle_memory_store_is_bounded():
+    from src.app.login_throttle import MemoryThrottleStore
+
+    store = MemoryThrottleStore(max_entries=2)
+    for i in range(5):
+        store.add_failure(f"ip:{i}", 0.0, 3600, lambda failures: 0)
+    assert store.get("ip:0") is None
+    assert store.get("ip:4") == (1, 0.0, 0.0)
+
+
+def test_login_throttle_database_store_counts_parallel_failures(client):
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+
+    from src.app.login_throttle import DatabaseThrottleStore
+
+    app = client.application
+    store = DatabaseThrottleStore(retention_seconds=3600)
+    threads, attempts = 8, 5
+    barrier = Barrier(threads)
+
+    def attempt(_):
+        barrier.wait()
+        with app.app_context():
+            # 첫 실패가 동시에 들어와도 INSERT 충돌(500) 없이 모두 집계돼야 한다
+            return [store.add_failure("acct:victim@example.com", 1000.0, 3600, lambda n: 60 if n > 5 else 0)
+                    for _ in range(attempts)]
+
+    with ThreadPoolExecutor(threads) as pool:
+        counts = sorted(n for result in pool.map(attempt, range(threads)) for n in result)
+    assert counts == list(range(1, threads * attempts + 1))
+    with app.app_context():
+        assert store.get("acct:victim@example.com") == (threads * attempts, 1060.0, 1000.0)
+
+
+def test_refresh_rotation_detects_reuse(client):
+    email, pwd = user_creds(client)
+    tokens = login(client, email, pwd)
+
+    first = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert first.status_code == 200
+    rotated = first.get_json()
+
+    # 이미 회전된 토큰 재사용 -> 패밀리 전체 폐기
+    reuse = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reuse.status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+    resp = client.get("/orders", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert resp.status_code == 401
+
+
+def test_logout_revokes_access_token(client):
+    email, pwd = user_creds(client)
+    tokens = login(client, email, pwd)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/orders", headers=headers).status_code == 200
+
+    resp = client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200
+    assert client.get("/orders", headers=headers).status_code == 401
+
+
+def test_revocation_committed_after_another_worker_synced(client):
+    from datetime import timedelta
+
+    from src.app.models import RefreshToken
+    from src.app.token_store import TokenStore
+
+    email, pwd = user_creds(client)
+    login(client, email, pwd)
+    with client.application.app_context():
+        other_worker = TokenStore(sync_seconds=0)
+        family_id = RefreshToken.query.first().family_id
+        assert other_worker.is_revoked(family_id) is False
+
+        # revoke_family 가 revoked_at 을 찍은 뒤, 다른 워커가 동기화하고 나서야 커밋된 경우
+        RefreshToken.query.update({"revoked_at": other_worker._synced_at - timedelta(seconds=1)})
+        db.session.commit()
+        assert other_worker.is_revoked(family_id) is True
+
+
+def test_revocation_bloom_filter_has_no_false_negatives():
+    from src.app.token_store import BloomFilter
+
+    bloom = BloomFilter(capacity=1000)
+    values = [f"family-{i}" for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    assert sum(f"other-{i}" in bloom for i in range(1000)) < 50
+
+
+def test_rs256_tokens_verify_with_published_jwks(client, tmp_path):
+    import jwt as pyjwt
+    from src.app.jwt_keys import generate_private_key_pem
+
+    (tmp_path / "2026-01.pem").write_bytes(generate_private_key_pem("RS256"))
+    (tmp_path / "2026-02.pem").write_bytes(generate_private_key_pem("RS256"))
+    client.application.config.update({"JWT_ALGORITHM": "RS256", "JWT_KEYS_DIR": str(tmp_path)})
+
+    email, pwd = user_creds(client)
+    token = login(client, email, pwd)["access_token"]
+    header = pyjwt.get_unverified_header(token)
+    assert header["alg"] == "RS256" and header["kid"] == "2026-02"
+
+    resp = client.get("/.well-known/jwks.json")
+    assert resp.status_code == 200
+    assert "max-age" in resp.headers["Cache-Control"]
+    jwks = resp.get_json()
+    assert {k["kid"] for k in jwks["keys"]} == {"2026-01", "2026-02"}
+
+    # 엣지 서비스처럼 JWKS 만으로 검증
+    jwk = next(k for k in jwks["keys"] if k["kid"] == header["kid"])
+    public_key = pyjwt.PyJWK(jwk).key
+    assert pyjwt.decode(token, public_key, algorithms=["RS256"])["sub"] == str(get_user_id(client))
+
+    assert client.get("/.well-known/jwks.json", headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+    assert client.get("/orders", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+
+def test_mixed_key_types_rotate_rs256_to_eddsa(client, tmp_path):
+    import jwt as pyjwt
+    from src.app.jwt_keys import generate_private_key_pem
+
+    app = client.application
+    email, pwd = user_creds(client)
+    hs256_token = login(client, email, pwd)["access_token"]  # 전환 전 HS256 으로 발급된 토큰
+
+    (tmp_path / "2026-01.pem").write_bytes(generate_private_key_pem("RS256"))
+    (tmp_path / "2026-02.pem").write_bytes(generate_private_key_pem("EdDSA"))
+    app.config.update({"JWT_ALGORITHM": "EdDSA", "JWT_KEYS_DIR": str(tmp_path), "JWT_HS256_VERIFY": True})
+    app.extensions.pop("jwt_keyring", None)
+
+    token = login(client, email, pwd)["access_token"]
+    assert pyjwt.get_unverified_header(token) == {"alg": "EdDSA", "kid": "2026-02", "typ": "JWT"}
+    jwks = {k["kid"]: k for k in client.get("/.well-known/jwks.json").get_json()["keys"]}
+    assert {kid: k["alg"] for kid, k in jwks.items()} == {"2026-01": "RS256", "2026-02": "EdDSA"}
+
+    with app.app_context():
+        from src.app.jwt_keys import get_keyring
+
+        old = get_keyring().keys["2026-01"]
+        payload = pyjwt.decode(token, options={"verify_signature": False})
+        rs256_token = pyjwt.encode(payload, old.signing_key, algorithm="RS256", headers={"kid": old.kid})
+    for accepted in (token, rs256_token, hs256_token):
+        assert client.get("/orders", headers={"Authorization": f"Bearer {accepted}"}).status_code == 200
+
+    # 전환 기간이 끝나면 HS256 토큰은 거부
+    app.config["JWT_HS256_VERIFY"] = False
+    app.extensions.pop("jwt_keyring", None)
+    assert client.get("/orders", headers={"Authorization": f"Bearer {hs256_token}"}).status_code == 401
+
+
+def asgi_get(path, query_string=b""):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query_string, "headers": [], "client": ("127.0.0.1", 5000), "server": ("testserver", 80),
+    }
+    return scope, receive, send, messages
+
+
+def test_asgi_catalog_routes_match_wsgi_responses(client):
+    import asyncio
+    import json
+    from src.app.asgi import create_asgi_app
+
+    asgi_app = create_asgi_app(flask_app=client.application)
+    book_id = get_book_id(client)
+
+    async def fetch(path, query_string=b""):
+        scope, receive, send, messages = asgi_get(path, query_string)
+        await asgi_app(scope, receive, send)
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        return messages[0]["status"], json.loads(body)
+
+    async def run():
+        try:
+            return (
+                await fetch("/books", b"keyword=Seed"),
+                await fetch("/books", b"keyword=Seed&facets=true"),
+                await fetch(f"/books/{book_id}"),
+                await fetch("/books/99999"),
+                await fetch("/health"),
+            )
+        finally:
+            await asgi_app.aclose()
+
+    listed, faceted, detail, missing, health = asyncio.run(run())
+
+    assert listed == (200, client.get("/books", query_string={"keyword": "Seed"}).get_json())
+    assert faceted == (200, client.get("/books", query_string={"keyword": "Seed", "facets": "true"}).get_json())
+    assert detail == (200, client.get(f"/books/{book_id}").get_json())
+    assert missing[0] == 404 and missing[1]["code"] == "RESOURCE_NOT_FOUND"
+    # 비동기 라우트가 아닌 경로는 WSGI 앱으로 위임
+    assert health == (200, client.get("/health").get_json())
+
+
+def test_asgi_catalog_routes_share_index_replicas_and_profiler(client, tmp_path):
+    import asyncio
+    import json
+    import shutil
+    from src.app.asgi import create_asgi_app
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    async def fetch(asgi_app, path, query_string=b""):
+        scope, receive, send, messages = asgi_get(path, query_string)
+        await asgi_app(scope, receive, send)
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        return dict(messages[0]["headers"]), json.loads(body)
+
+    def run(*requests):
+        asgi_app = create_asgi_app(flask_app=app)
+
+        async def go():
+            try:
+                return [await fetch(asgi_app, *request) for request in requests]
+            finally:
+                await asgi_app.aclose()
+        return asyncio.run(go())
+
+    # 카탈로그 인덱스 + SQL 프로파일러(Server-Timing)
+    app.config["CATALOG_INDEX_ENABLED"] = True
+    [(headers, indexed)] = run(("/books", b"sort=price,ASC"))
+    assert "catalog_index" in app.extensions
+    assert indexed == client.get("/books", query_string={"sort": "price,ASC"}).get_json()
+    assert headers[b"server-timing"].startswith(b"db;dur=")
+    app.config["CATALOG_INDEX_ENABLED"] = False
+
+    # 읽기 복제본: 복제 후 primary 에만 쓴 도서는 비동기 라우트에서도 보이지 않는다
+    with app.app_context():
+        primary_path = db.engine.url.database
+        db.engine.dispose()
+    shutil.copy(primary_path, tmp_path / "replica.db")
+    app.config["SQLALCHEMY_REPLICA_URIS"] = f"sqlite:///{tmp_path / 'replica.db'}"
+    app.extensions.pop("db_replicas", None)
+    book = {"title": "Primary Only", "price": 1000, "category_id": cfg["category_id"], "author_id": cfg["author_id"]}
+    book_id = client.post("/books", headers=admin, json=book).get_json()["id"]
+
+    (_, listed), (_, detail) = run(("/books", b"keyword=Primary+Only"), (f"/books/{book_id}",))
+    assert listed["totalElements"] == 0
+    assert detail["code"] == "RESOURCE_NOT_FOUND"
+
+
+def test_read_replica_routing_with_sqlite_files(client, tmp_path):
+    import shutil
+
+    app = client.application
+    with app.app_context():
+        primary_path = db.engine.url.database
+        db.engine.dispose()
+    shutil.copy(primary_path, tmp_path / "replica.db")
+    # 두 번째 복제본은 열 수 없는 경로 → 헬스 체크 실패로 건너뛰어야 한다.
+    app.config["SQLALCHEMY_REPLICA_URIS"] = (
+        f"sqlite:///{tmp_path / 'replica.db'},sqlite:///{tmp_path / 'missing' / 'down.db'}"
+    )
+
+    email, pwd = admin_creds(client)
+    headers = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    cfg = app.config["SEED_IDS"]
+    created = client.post("/books", headers=headers, json={
+        "title": "Primary Only", "price": 1000, "stock_cnt": 3,
+        "category_id": cfg["category_id"], "author_id": cfg["author_id"],
+    })
+    assert created.status_code == 201
+    assert created.get_json()["title"] == "Primary Only"
+
+    # GET 은 복제 지연 중인 복제본에서 읽으므로 아직 보이지 않는다.
+    for _ in range(4):
+        resp = client.get("/books", query_string={"keyword": "Primary Only"})
+        assert resp.status_code == 200
+        assert resp.get_json()["totalElements"] == 0
+    assert client.get(f"/books/{created.get_json()['id']}").status_code == 404
+    assert app.extensions["db_replicas"].healthy_flags() == [True, False]
+
+    # 쓰기 요청의 응답(read-after-write)은 primary 에서 읽는다.
+    email, pwd = user_creds(client)
+    token = login(client, email, pwd)["access_token"]
+    order = client.post(
+        "/orders",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"user_id": cfg["user_id"], "items": [{"book_id": created.get_json()["id"], "quantity": 1}]},
+    )
+    assert order.status_code == 201
+
+
+def test_book_rankings_count_paid_orders_once(client):
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    token = login(client, email, pwd)["access_token"]
+    order = client.post(
+        "/orders",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"user_id": cfg["user_id"], "items": [{"book_id": cfg["book_id"], "quantity": 2}]},
+    ).get_json()
+
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    assert client.get("/books/rankings").get_json()["content"] == []
+
+    for status in ("PAID", "SHIPPED", "COMPLETED"):
+        resp = client.patch(f"/orders/{order['order_id']}/status", headers=admin, json={"status": status})
+        assert resp.status_code == 200
+    drain_outbox(client)
+
+    for scope in ("all", "7d", "30d"):
+        content = client.get("/books/rankings", query_string={"scope": scope}).get_json()["content"]
+        assert [(row["rank"], row["book_id"], row["quantity"]) for row in content] == [(1, cfg["book_id"], 2)]
+
+    by_category = client.get("/books/rankings", query_string={"category_id": cfg["category_id"] + 1000})
+    assert by_category.get_json()["content"] == []
+    assert client.get("/books/rankings", query_string={"scope": "1y"}).status_code == 400
+
+
+def test_book_rankings_read_does_not_roll_windows(client):
+    from datetime import datetime, timedelta
+
+    from src.app.extensions import db
+    from src.app.models import RankingWindow
+
+    app = client.application
+    today = datetime.utcnow().date()
+    yesterday = today - timedelta(days=1)
+    with app.app_context():
+        db.session.merge(RankingWindow(scope="7d", as_of=yesterday))
+        db.session.commit()
+
+    assert client.get("/books/rankings", query_string={"scope": "7d"}).status_code == 200
+    with app.app_context():
+        assert db.session.get(RankingWindow, "7d").as_of == yesterday
+        assert db.session.get(RankingWindow, "30d") is None
+
+    runner = app.test_cli_runner()
+    assert "rolling windows rebuilt" in runner.invoke(args=["rankings", "refresh"]).output
+    assert "already current" in runner.invoke(args=["rankings", "refresh"]).output
+    with app.app_context():
+        assert {w.scope: w.as_of for w in RankingWindow.query} == {"7d": today, "30d": today}
+
+
+def test_co_purchase_recommendations(client):
+    from src.app.models import Order, OrderItem
+    from src.app.recommendations import rebuild_recommendations
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    with app.app_context():
+        books = [db.session.get(Book, cfg["book_id"])]
+        for title in ("Second", "Third"):
+            books.append(Book(title=title, price=Decimal("1000"), stock_cnt=5, status="ACTIVE",
+                              author_id=cfg["author_id"], category_id=cfg["category_id"]))
+        db.session.add_all(books[1:])
+        db.session.flush()
+        ids = [b.id for b in books]
+
+        for basket in ([0, 1], [0, 1, 1], [0, 2], [0, 2], [1], [1, 2]):
+            order = Order(user_id=cfg["user_id"], status="PAID", total_amount=0)
+            db.session.add(order)
+            db.session.flush()
+            db.session.add_all(OrderItem(order_id=order.id, book_id=ids[i], quantity=1, unit_price=0) for i in basket)
+        cancelled = Order(user_id=cfg["user_id"], status="CANCELLED", total_amount=0)
+        db.session.add(cancelled)
+        db.session.flush()
+        db.session.add_all(OrderItem(order_id=cancelled.id, book_id=ids[i], quantity=1, unit_price=0) for i in (1, 2))
+        db.session.commit()
+
+        app.config.update({"RECOMMENDATIONS_MIN_SUPPORT": 2, "RECOMMENDATIONS_CHUNK_ORDERS": 2})
+        assert rebuild_recommendations() == 4
+
+    # book0 은 book1, book2 와 각각 2회 → 코사인 점수는 주문 수가 적은 book2(3건) 가 book1(4건) 보다 높다.
+    resp = client.get(f"/books/{ids[0]}/recommendations")
+    assert resp.status_code == 200
+    content = resp.get_json()["content"]
+    assert [row["book_id"] for row in content] == [ids[2], ids[1]]
+    assert content[0]["score"] > content[1]["score"]
+
+    assert client.get(f"/books/{ids[0]}/recommendations", query_string={"limit": 1}).get_json()["content"] \
+        == content[:1]
+    assert client.get("/books/99999/recommendations").status_code == 404
+
+
+def test_delete_book_evicts_cached_recommendations(client):
+    from src.app.models import BookRecommendation
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    with app.app_context():
+        kept, doomed = (
+            Book(title=title, price=Decimal("1000"), stock_cnt=5, status="ACTIVE",
+                 author_id=cfg["author_id"], category_id=cfg["category_id"])
+            for title in ("Kept", "Doomed")
+        )
+        db.session.add_all([kept, doomed])
+        db.session.flush()
+        kept_id, doomed_id = kept.id, doomed.id
+        db.session.add_all([
+            BookRecommendation(book_id=kept_id, rank=1, related_book_id=doomed_id, score=0.9),
+            BookRecommendation(book_id=doomed_id, rank=1, related_book_id=kept_id, score=0.9),
+            BookRecommendation(book_id=cfg["book_id"], rank=1, related_book_id=kept_id, score=0.5),
+        ])
+        db.session.commit()
+
+    def related(book_id):
+        return [row["book_id"] for row in client.get(f"/books/{book_id}/recommendations").get_json()["content"]]
+
+    # 캐시를 채운 뒤 삭제
+    assert related(kept_id) == [doomed_id]
+    assert related(doomed_id) == [kept_id]
+    assert related(cfg["book_id"]) == [kept_id]
+    assert client.delete(f"/books/{doomed_id}", headers=admin).status_code == 200
+
+    assert related(kept_id) == []
+    assert client.get(f"/books/{doomed_id}/recommendations").status_code == 404
+    # 삭제된 도서를 담지 않은 목록은 캐시에 그대로 남는다
+    cache = app.extensions["recommendation_cache"]
+    assert cache.get(cfg["book_id"])[0] is True
+
+
+def test_order_summary_tracks_status_transitions(client):
+    from src.app.order_summary import rebuild_order_summaries
+
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    user = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    order_ids = []
+    for quantity in (1, 2):
+        items = [{"book_id": cfg["book_id"], "quantity": quantity}]
+        resp = client.post("/orders", headers=user, json={"user_id": cfg["user_id"], "items": items})
+        order_ids.append(resp.get_json()["order_id"])
+    client.patch(f"/orders/{order_ids[1]}/status", headers=admin, json={"status": "PAID"})
+    drain_outbox(client)
+
+    summary = client.get("/orders/summary", headers=user).get_json()
+    assert summary["order_count"] == 2
+    assert summary["total_amount"] == "45000.00"
+    assert summary["by_status"] == {
+        "PAID": {"order_count": 1, "total_amount": "30000.00"},
+        "PENDING": {"order_count": 1, "total_amount": "15000.00"},
+    }
+    assert summary["by_month"][0]["order_count"] == 2
+
+    assert client.get("/orders/summary", headers=user, query_string={"scope": "global"}).status_code == 403
+    global_summary = client.get("/orders/summary", headers=admin, query_string={"scope": "global"}).get_json()
+    assert global_summary["by_status"] == summary["by_status"]
+
+    # 백필 명령으로 다시 계산해도 같은 결과
+    with client.application.app_context():
+        rebuild_order_summaries()
+    assert client.get("/orders/summary", headers=user).get_json()["by_status"] == summary["by_status"]
+
+
+def test_order_detail_expand_and_admin_batch(client):
+    import re
+
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    user = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    order_ids = []
+    for _ in range(3):
+        items = [{"book_id": cfg["book_id"], "quantity": 1}]
+        resp = client.post("/orders", headers=user, json={"user_id": cfg["user_id"], "items": items})
+        order_ids.append(resp.get_json()["order_id"])
+
+    detail = client.get(f"/orders/{order_ids[0]}", headers=user, query_string={"expand": "items.book"})
+    assert detail.status_code == 200
+    assert detail.get_json()["items"][0]["book"]["title"] == "Seed Book"
+    assert "book" not in client.get(f"/orders/{order_ids[0]}", headers=user).get_json()["items"][0]
+    assert client.get(f"/orders/{order_ids[0]}", headers=user, query_string={"expand": "user"}).status_code == 400
+
+    def batch(ids):
+        resp = client.get("/orders/batch", headers=admin,
+                          query_string={"ids": ",".join(map(str, ids)), "expand": "items.book"})
+        queries = int(re.search(r'desc="(\d+) queries"', resp.headers["Server-Timing"]).group(1))
+        return resp, queries
+
+    resp, many_queries = batch(order_ids + [99999])
+    body = resp.get_json()
+    assert [o["id"] for o in body["content"]] == order_ids
+    assert body["missing"] == [99999]
+    assert all(o["items"][0]["book"]["id"] == cfg["book_id"] for o in body["content"])
+    # 주문 수와 관계없이 쿼리 수가 일정 (selectinload)
+    assert batch(order_ids[:1])[1] == many_queries
+
+    assert client.get("/orders/batch", headers=user, query_string={"ids": "1"}).status_code == 403
+
+
+def test_bulk_order_status_transitions(client):
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    user = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    def stock():
+        return client.get(f"/books/{cfg['book_id']}").get_json()["stock_cnt"]
+
+    initial_stock = stock()
+    order_ids = []
+    for _ in range(3):
+        items = [{"book_id": cfg["book_id"], "quantity": 2}]
+        resp = client.post("/orders", headers=user, json={"user_id": cfg["user_id"], "items": items})
+        order_ids.append(resp.get_json()["order_id"])
+    assert stock() == initial_stock - 6
+
+    paid = client.patch("/orders/status", headers=admin,
+                        json={"order_ids": order_ids[:2], "from": "PENDING", "to": "PAID"})
+    assert paid.get_json()["updated"] == order_ids[:2]
+
+    resp = client.patch("/orders/status", headers=admin,
+                        json={"order_ids": order_ids + [99999], "from": "PAID", "to": "SHIPPED"})
+    assert resp.status_code == 200
+    assert resp.get_json()["results"] == [
+        {"id": order_ids[0], "result": "updated", "status": "SHIPPED"},
+        {"id": order_ids[1], "result": "updated", "status": "SHIPPED"},
+        {"id": order_ids[2], "result": "conflict", "status": "PENDING"},
+        {"id": 99999, "result": "not_found", "status": None},
+    ]
+
+    illegal = client.patch("/orders/status", headers=admin,
+                           json={"order_ids": order_ids, "from": "SHIPPED", "to": "PENDING"})
+    assert illegal.status_code == 409
+    assert illegal.get_json()["details"]["allowed"] == ["COMPLETED"]
+    assert client.patch(f"/orders/{order_ids[0]}/status", headers=admin,
+                        json={"status": "CANCELLED"}).status_code == 409
+
+    # 상태 값은 스키마에서 검증 (허용 목록 밖이거나 누락되면 400)
+    for body in ({"order_ids": order_ids, "from": "PAID", "to": "LOST"}, {"order_ids": order_ids, "to": "PAID"}):
+        invalid = client.patch("/orders/status", headers=admin, json=body)
+        assert invalid.status_code == 400 and invalid.get_json()["code"] == "VALIDATION_FAILED"
+    for body in ({"status": "paid"}, {}):
+        invalid = client.patch(f"/orders/{order_ids[0]}/status", headers=admin, json=body)
+        assert invalid.status_code == 400 and "status" in invalid.get_json()["details"]
+
+    # 취소 시 재고 복원
+    assert client.patch(f"/orders/{order_ids[2]}/status", headers=admin,
+                        json={"status": "CANCELLED"}).status_code == 200
+    assert stock() == initial_stock - 4
+
+    drain_outbox(client)
+    rankings = client.get("/books/rankings").get_json()["content"]
+    assert [(row["book_id"], row["quantity"]) for row in rankings] == [(cfg["book_id"], 4)]
+    by_status = client.get("/orders/summary", headers=user).get_json()["by_status"]
+    assert {status: row["order_count"] for status, row in by_status.items()} == {"SHIPPED": 2, "CANCELLED": 1}
+
+
+def test_outbox_defers_side_effects_and_retries(client):
+    from datetime import datetime, timedelta
+    from src.app import outbox
+    from src.app.models import OutboxEvent
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    user = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    items = [{"book_id": cfg["book_id"], "quantity": 1}]
+    assert client.post("/orders", headers=user, json={"user_id": cfg["user_id"], "items": items}).status_code == 201
+    # 요약 갱신은 주문과 같은 커밋의 아웃박스 이벤트로만 남아 있다.
+    assert client.get("/orders/summary", headers=user).get_json()["order_count"] == 0
+    with app.app_context():
+        assert [e.event_type for e in OutboxEvent.query.filter_by(status="PENDING")] == ["order.created"]
+
+        worker = outbox.OutboxWorker(app, concurrency=2)
+        try:
+            assert worker.run_once() == 1
+        finally:
+            worker.close()
+    assert client.get("/orders/summary", headers=user).get_json()["order_count"] == 1
+
+    calls = []
+
+    @outbox.handler("test.flaky")
+    def _flaky(payload):
+        calls.append(payload["n"])
+        raise RuntimeError("boom")
+
+    app.config.update({"OUTBOX_MAX_ATTEMPTS": 2, "OUTBOX_RETRY_BASE_SECONDS": 30})
+    with app.app_context():
+        outbox.enqueue("test.flaky", {"n": 1})
+        db.session.commit()
+
+        assert outbox.process_batch() == 1
+        event = OutboxEvent.query.filter_by(event_type="test.flaky").one()
+        assert (event.status, event.attempts) == ("PENDING", 1)
+        assert event.available_at > datetime.utcnow() + timedelta(seconds=20)
+        # 백오프 중에는 다시 가져가지 않는다.
+        assert outbox.process_batch() == 0
+
+        event.available_at = datetime.utcnow()
+        db.session.commit()
+        assert outbox.process_batch() == 1
+        event = OutboxEvent.query.filter_by(event_type="test.flaky").one()
+        assert (event.status, event.attempts) == ("FAILED", 2)
+        assert "boom" in event.last_error
+    assert calls == [1, 1]
+
+
+def test_outbox_discards_run_that_lost_its_lease(client):
+    from datetime import datetime
+    from src.app import outbox
+    from src.app.models import OutboxEvent
+
+    app = client.application
+    reclaimed = []
+
+    @outbox.handler("test.slow")
+    def _slow(payload):
+        if not reclaimed:
+            # 핸들러가 임대 시간을 넘기는 동안 다른 워커가 이벤트를 다시 가져간다
+            with app.app_context():
+                OutboxEvent.query.filter_by(event_type="test.slow").update({"available_at": datetime.utcnow()})
+                db.session.commit()
+                reclaimed.append(outbox.claim_batch(10, 60))
+        db.session.add(Author(name=payload["name"]))
+
+    with app.app_context():
+        outbox.enqueue("test.slow", {"name": "Lease Test"})
+        db.session.commit()
+
+        token, ids = outbox.claim_batch(10, 60)
+        assert outbox.run_event(ids[0], token) is False
+        assert Author.query.filter_by(name="Lease Test").count() == 0
+
+        second_token, second_ids = reclaimed[0]
+        assert second_ids == ids
+        event = db.session.get(OutboxEvent, ids[0])
+        assert (event.status, event.locked_by, event.attempts) == ("PENDING", second_token, 2)
+
+        assert outbox.run_event(ids[0], second_token) is True
+        assert Author.query.filter_by(name="Lease Test").count() == 1
+        assert db.session.get(OutboxEvent, ids[0]).status == "DONE"
+
+
+def test_archive_soft_deleted_rows(client):
+    from datetime import datetime, timedelta
+    from src.app.archival import run_archival
+    from src.app.models import (
+        Cart, Comment, Order, OrderItem, Review, ReviewLike,
+        comments_archive, order_items_archive, orders_archive, reviews_archive,
+    )
+
+    app = client.application
+    cfg = app.config["SEED_IDS"]
+    old = datetime.utcnow() - timedelta(days=40)
+    recent = datetime.utcnow() - timedelta(days=1)
+    with app.app_context():
+        review = Review(book_id=cfg["book_id"], user_id=cfg["user_id"], rating=5, deleted_at=old)
+        live_review = Review(book_id=cfg["book_id"], user_id=cfg["user_id"], rating=4)
+        db.session.add_all([review, live_review])
+        db.session.flush()
+        parent = Comment(review_id=review.id, user_id=cfg["user_id"], content="parent")
+        db.session.add(parent)
+        db.session.flush()
+        db.session.add_all([
+            Comment(review_id=review.id, user_id=cfg["user_id"], content="reply", parent_id=parent.id),
+            ReviewLike(review_id=review.id, user_id=cfg["user_id"]),
+        ])
+        thread = Comment(review_id=live_review.id, user_id=cfg["user_id"], content="deleted", deleted_at=old)
+        db.session.add(thread)
+        db.session.flush()
+        db.session.add(Comment(review_id=live_review.id, user_id=cfg["user_id"], content="live", parent_id=thread.id))
+
+        order = Order(user_id=cfg["user_id"], status="CANCELLED", total_amount=0, deleted_at=old)
+        db.session.add(order)
+        db.session.flush()
+        db.session.add(OrderItem(order_id=order.id, book_id=cfg["book_id"], quantity=1, unit_price=0))
+        db.session.add_all([
+            Cart(user_id=cfg["user_id"], book_id=cfg["book_id"], unit_price=0, deleted_at=old),
+            Cart(user_id=cfg["user_id"], book_id=cfg["book_id"], unit_price=0, deleted_at=recent),
+        ])
+        db.session.commit()
+        parent_id, thread_id = parent.id, thread.id
+
+        assert run_archival(dry_run=True) == {"cart": 1, "wishlists": 0, "reviews": 1, "comments": 0, "orders": 1}
+        progress = []
+        totals = run_archival(batch_size=1, pause_seconds=0, progress=lambda *args: progress.append(args[:2]))
+        assert totals == {"cart": 1, "wishlists": 0, "reviews": 1, "comments": 0, "orders": 1}
+        assert ("reviews", 1) in progress
+
+        def count(table):
+            return db.session.execute(db.select(db.func.count()).select_from(table)).scalar()
+
+        assert (count(reviews_archive), count(comments_archive)) == (1, 2)
+        assert (count(orders_archive), count(order_items_archive)) == (1, 1)
+        assert Review.query.count() == 1 and ReviewLike.query.count() == 0
+        assert Cart.query.count() == 1
+        # 답글이 남아 있는 삭제 댓글은 유지
+        assert db.session.get(Comment, thread_id) is not None
+        assert db.session.execute(
+            db.select(comments_archive.c.parent_id).where(comments_archive.c.content == "reply")
+        ).scalar() == parent_id
+
+
+def test_category_tree_browsing_includes_descendants(client):
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    it = client.post("/categories", json={"name": "IT", "slug": "it"}).get_json()
+    python = client.post("/categories", json={"name": "Python", "slug": "python", "parent_id": it["id"]}).get_json()
+    web = client.post("/categories", json={"name": "Web", "slug": "web", "parent_id": python["id"]}).get_json()
+    assert [c["name"] for c in client.get(f"/categories/{web['id']}").get_json()["path"]] == ["IT", "Python", "Web"]
+
+    def create_book(title, category_id, **extra):
+        body = {"title": title, "price": 10000, "category_id": category_id, "author_id": cfg["author_id"], **extra}
+        return client.post("/books", headers=admin, json=body).get_json()["id"]
+
+    web_book = create_book("Flask Web", web["id"])
+    # 주 카테고리는 Tech, book_categories 로 Python 에도 분류
+    tagged_book = create_book("Tagged", cfg["category_id"], category_ids=[python["id"]])
+
+    def browse(category_id):
+        resp = client.get("/books", query_string={"category_id": category_id, "size": 50})
+        return sorted(b["id"] for b in resp.get_json()["content"])
+
+    assert browse(it["id"]) == sorted([web_book, tagged_book])
+    assert browse(web["id"]) == [web_book]
+    assert browse(cfg["category_id"]) == sorted([cfg["book_id"], tagged_book])
+
+    assert client.delete(f"/categories/{it['id']}").status_code == 409
+    assert client.put(f"/categories/{it['id']}", json={"parent_id": web["id"]}).status_code == 409
+
+    # Python 서브트리를 Tech 아래로 이동
+    assert client.put(f"/categories/{python['id']}", json={"parent_id": cfg["category_id"]}).status_code == 200
+    assert browse(it["id"]) == []
+    assert browse(cfg["category_id"]) == sorted([cfg["book_id"], web_book, tagged_book])
+    assert [c["id"] for c in client.get(f"/categories/{web['id']}").get_json()["path"]] == \
+        [cfg["category_id"], python["id"], web["id"]]
+
+    with client.application.app_context():
+        from src.app.category_tree import rebuild_closure, subtree_ids
+
+        before = sorted(subtree_ids(cfg["category_id"]))
+        rebuild_closure()
+        assert sorted(subtree_ids(cfg["category_id"])) == before
+
+
+def test_list_books_facets_in_one_query(client):
+    import re
+
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    for title, price, status in (("Facet A", 8000, "ACTIVE"), ("Facet B", 25000, "ACTIVE"),
+                                 ("Facet C", 60000, "SOLD_OUT")):
+        body = {"title": title, "price": price, "status": status,
+                "category_id": cfg["category_id"], "author_id": cfg["author_id"]}
+        assert client.post("/books", headers=admin, json=body).status_code == 201
+
+    def fetch(**params):
+        resp = client.get("/books", query_string={"keyword": "Facet", "size": 1, **params})
+        queries = int(re.search(r'desc="(\d+) queries"', resp.headers["Server-Timing"]).group(1))
+        return resp.get_json(), queries
+
+    plain, plain_queries = fetch()
+    body, queries = fetch(facets="true")
+    assert "facets" not in plain and queries == plain_queries + 1
+    assert body["totalElements"] == 3 and len(body["content"]) == 1
+
+    facets = body["facets"]
+    assert facets["category"] == [{"id": cfg["category_id"], "name": "Tech", "count": 3}]
+    assert facets["author"] == [{"id": cfg["author_id"], "name": "Seed Author", "count": 3}]
+    assert [band["count"] for band in facets["price"]] == [1, 0, 1, 0, 1]
+    assert facets["price"][0] == {"min": None, "max": "10000", "count": 1}
+    assert facets["status"] == [{"value": "ACTIVE", "count": 2}, {"value": "SOLD_OUT", "count": 1}]
+
+    # 현재 필터 기준으로 계산
+    filtered, _ = fetch(facets="true", status="ACTIVE")
+    assert filtered["facets"]["status"] == [{"value": "ACTIVE", "count": 2}]
+
+
+def test_catalog_index_matches_sql_path(client):
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    sub = client.post("/categories", json={"name": "Sub", "slug": "sub", "parent_id": cfg["category_id"]}).get_json()
+
+    ids = []
+    rows = ((15000, "2024-01-02", "ACTIVE"), (9900.5, None, "ACTIVE"),
+            (15000, "2023-05-01", "SOLD_OUT"), (42000, "2024-03-01", "ACTIVE"))
+    for i, (price, published, status) in enumerate(rows):
+        body = {"title": f"Indexed {i}", "price": price, "published_at": published, "status": status,
+                "stock_cnt": i * 3, "category_id": sub["id"] if i % 2 else cfg["category_id"],
+                "author_id": cfg["author_id"]}
+        resp = client.post("/books", headers=admin, json=body)
+        assert resp.status_code == 201
+        ids.append(resp.get_json()["id"])
+
+    queries = (
+        {"sort": "price,ASC"},
+        {"sort": "published_at,DESC", "size": 2, "page": 2},
+        {"sort": "published_at,ASC", "min_price": "9900.5", "max_price": "15000"},
+        {"category_id": cfg["category_id"], "sort": "stock_cnt,DESC"},
+        {"status": "ACTIVE", "author_id": cfg["author_id"], "sort": "id,ASC", "size": 2},
+        {"status": "MISSING"},
+    )
+
+    def fetch(params, enabled):
+        client.application.config["CATALOG_INDEX_ENABLED"] = enabled
+        body = client.get("/books", query_string=params).get_json()
+        # 정렬 키가 같은 행의 순서는 SQL 에서 정해지지 않으므로 정렬 키 값으로 비교
+        field = params.get("sort", "created_at,DESC").split(",")[0]
+        return body["totalElements"], [book.get(field, book["id"]) for book in body["content"]]
+
+    for params in queries:
+        assert fetch(params, True) == fetch(params, False), params
+
+    # 커밋된 변경(수정/삭제)이 다음 조회에 반영된다
+    assert client.put(f"/books/{ids[0]}", headers=admin, json={"price": 1}).status_code == 200
+    assert client.delete(f"/books/{ids[3]}", headers=admin).status_code == 200
+    client.application.config["CATALOG_INDEX_ENABLED"] = True
+    cheapest = client.get("/books", query_string={"sort": "price,ASC", "size": 1}).get_json()
+    assert cheapest["content"][0]["id"] == ids[0]
+    assert client.get("/books", query_string={"min_price": 40000}).get_json()["totalElements"] == 0
+
+
+def test_catalog_index_sees_stock_restored_by_cancellation(client):
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = user_creds(client)
+    user = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    with client.application.app_context():
+        initial = db.session.get(Book, cfg["book_id"]).stock_cnt
+    client.application.config["CATALOG_INDEX_ENABLED"] = True
+
+    def order_by_stock(*book_ids):
+        # 응답의 재고 값은 DB 에서 읽으므로, 인덱스가 정한 순서로 비교
+        body = client.get("/books", query_string={"sort": "stock_cnt,DESC", "size": 50}).get_json()
+        return [book["id"] for book in body["content"] if book["id"] in book_ids]
+
+    items = [{"book_id": cfg["book_id"], "quantity": 3}]
+    order = client.post("/orders", headers=user, json={"user_id": cfg["user_id"], "items": items}).get_json()
+    # 나중에 만든 도서가 인덱스의 updated_at 워터마크를 주문 시점보다 앞으로 민다
+    rival = {"title": "Rival", "price": 1000, "stock_cnt": initial - 1,
+             "category_id": cfg["category_id"], "author_id": cfg["author_id"]}
+    rival_id = client.post("/books", headers=admin, json=rival).get_json()["id"]
+    assert order_by_stock(cfg["book_id"], rival_id) == [rival_id, cfg["book_id"]]
+
+    assert client.patch(f"/orders/{order['order_id']}/status", headers=admin,
+                        json={"status": "CANCELLED"}).status_code == 200
+    assert order_by_stock(cfg["book_id"], rival_id) == [cfg["book_id"], rival_id]
+
+
+def test_book_suggest_prefix_index(client):
+    from src.app.models import BookSalesRanking
+
+    cfg = client.application.config["SEED_IDS"]
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+
+    def create_book(title, isbn13=None):
+        body = {"title": title, "price": 10000, "isbn13": isbn13,
+                "category_id": cfg["category_id"], "author_id": cfg["author_id"]}
+        return client.post("/books", headers=admin, json=body).get_json()["id"]
+
+    intro = create_book("파이썬 입문", "9788966262281")
+    advanced = create_book("파이썬 심화")
+    cafe = create_book("Café Society")
+    hana = create_book("하나의 책")
+    with client.application.app_context():
+        db.session.add(BookSalesRanking(scope="all", book_id=advanced, category_id=cfg["category_id"], quantity=5))
+        db.session.commit()
+
+    def suggest(q):
+        resp = client.get("/books/suggest", query_string={"q": q})
+        assert resp.status_code == 200
+        return [row["id"] for row in resp.get_json()["content"]]
+
+    # 자모 단위 접두어 + 판매량 순
+    assert suggest("ㅍ") == [advanced, intro]
+    assert suggest("한") == [hana]  # 입력 중인 받침 ㄴ 을 다음 글자 초성으로도 비교 ("하나")
+    assert suggest("파이썬 ㅇ") == [intro]
+    assert suggest("입문") == [intro]
+    assert suggest("CAFE") == [cafe] and suggest("soc") == [cafe]
+    assert suggest("978-8966") == [intro]
+    assert set(suggest("seed auth")) >= {intro, advanced, cafe}
+    assert suggest("  ") == []
+    assert client.get("/books/suggest").status_code == 400
+    assert client.get("/books/suggest", query_string={"q": "x" * 101}).get_json()["code"] == "INVALID_QUERY_PARAM"
+
+    # 수정/삭제가 다음 조회에 반영된다
+    assert client.put(f"/books/{intro}", headers=admin, json={"title": "자바 입문"}).status_code == 200
+    assert client.delete(f"/books/{advanced}", headers=admin).status_code == 200
+    assert suggest("파이") == []
+    assert suggest("ㅈ") == [intro]
+
+
+def test_response_compression(client):
+    import gzip
+    import json
+    import zlib
+    from flask import Response
+
+    app = client.application
+    # 스트리밍 응답 (내보내기 형태) 은 청크 단위로 압축된다
+    app.add_url_rule("/_stream", "stream_rows", lambda: Response(
+        (f"row-{i}," * 50 + "\n" for i in range(20)), mimetype="text/csv"))
+
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    cfg = app.config["SEED_IDS"]
+    for i in range(30):
+        body = {"title": f"Compressed {i}", "price": 1000, "description": "long description " * 20,
+                "category_id": cfg["category_id"], "author_id": cfg["author_id"]}
+        assert client.post("/books", headers=admin, json=body).status_code == 201
+
+    plain = client.get("/books", query_string={"size": 100})
+    assert "Content-Encoding" not in plain.headers and "Accept-Encoding" in plain.headers["Vary"]
+
+    resp = client.get("/books", query_string={"size": 100}, headers={"Accept-Encoding": "br;q=0, gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert len(resp.data) < len(plain.data) // 3
+    assert json.loads(gzip.decompress(resp.data))["totalElements"] == plain.get_json()["totalElements"]
+
+    # 최소 크기 미만 / 거부된 인코딩은 그대로
+    assert "Content-Encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/books", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+    streamed = client.get("/_stream", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["Content-Encoding"] == "gzip" and "Content-Length" not in streamed.headers
+    assert zlib.decompress(streamed.data, 31).decode().count("\n") == 20
+
+    # swagger.json 은 시작 시 미리 압축해 둔 본문을 그대로 보낸다
+    spec = client.get("/swagger.json", headers={"Accept-Encoding": "gzip"})
+    assert spec.headers["Content-Encoding"] == "gzip"
+    with open(app.config["SWAGGER_SPEC_PATH"], encoding="utf-8") as fp:
+        assert json.loads(gzip.decompress(spec.data)) == json.load(fp)
+    revalidated = client.get("/swagger.json", headers={"If-None-Match": spec.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_request_validation_errors_use_api_error_payload(client):
+    email, pwd = admin_creds(client)
+    admin = {"Authorization": f"Bearer {login(client, email, pwd)['access_token']}"}
+    cfg = client.application.config["SEED_IDS"]
+
+    # 예전에는 int("abc") 가 처리되지 않아 500 이 났다
+    resp = client.post("/reviews", headers=admin, json={"book_id": cfg["book_id"], "rating": "abc"})
+    body = resp.get_json()
+    assert resp.status_code == 400 and body["code"] == "VALIDATION_FAILED"
+    assert list(body["details"]) == ["rating"]
+
+    resp = client.post("/cart", headers=admin, json={"book_id": cfg["book_id"], "quantity": 0})
+    assert resp.status_code == 400 and "quantity" in resp.get_json()["details"]
+    resp = client.put(f"/books/{cfg['book_id']}", headers=admin, json={"stock_cnt": -1, "published_at": "2024-13-01"})
+    assert resp.status_code == 400 and set(resp.get_json()["details"]) == {"stock_cnt", "published_at"}
+    resp = client.post("/orders", headers=admin, json={"user_id": cfg["user_id"], "items": [{"quantity": 2}]})
+    assert resp.status_code == 400 and resp.get_json()["details"] == {"items": {"0": {"book_id": [
+        "Missing data for required field."]}}}
+
+    resp = client.get("/books", query_string={"min_price": "abc"})
+    assert resp.status_code == 400 and resp.get_json()["code"] == "INVALID_QUERY_PARAM"
+    # 빈 값은 미지정으로 취급
+    assert client.get("/books", query_string={"category_id": "", "min_rating": ""}).status_code == 200
+    assert client.get("/reviews", query_string={"max_rating": "5"}).status_code == 200
+
+
+def test_load_test_percentile_is_nearest_rank():
+    from benchmarks.load_test import percentile
+
+    values = [float(v) for v in range(1, 11)]
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 90) == 9.0
+    assert percentile(values, 95) == 10.0
+    assert percentile(values, 99) == 10.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([3.0], 50) == 3.0
+    assert percentile([], 50) == 0.0